@@ -0,0 +1,116 @@
+"""
+activity_log.py
+Activity log module for Football Manager Simulator
+Keeps a bounded in-memory log for the GUI and streams full history to disk
+"""
+
+import logging
+import queue
+from collections import deque
+from datetime import datetime
+from itertools import count
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+# Messages are written to the log file through a child of this logger per
+# ActivityLog, so two logs open at once never write each other's lines
+logger = logging.getLogger(__name__)
+logger.propagate = False
+logger.setLevel(logging.INFO)
+_instances = count(1)
+
+
+class ActivityLog:
+    """
+    Bounded activity log with batched delivery and a background file writer
+
+    Messages added since the last drain() are kept (at most max_lines of
+    them) and handed out together so the GUI can insert them in one batch.
+    Every message is also queued to a background thread that appends it to
+    a rotating log file.
+
+    Attributes:
+        max_lines (int): Most messages kept for display
+    """
+
+    def __init__(self, max_lines=500, filename='football_manager.log',
+                 max_bytes=1000000, backup_count=3):
+        """
+        Initialize the log and start the background file writer
+
+        Args:
+            max_lines (int): Most messages kept for display
+            filename (str): Log file path (None to disable the file)
+            max_bytes (int): Size at which the log file is rotated
+            backup_count (int): Rotated files kept
+        """
+        self.max_lines = max_lines
+        self._pending = deque(maxlen=max_lines)
+        self._listener = None
+        self._handler = None
+        self._logger = logger.getChild(str(next(_instances)))
+        self._logger.propagate = False
+        if filename:
+            self._start_writer(filename, max_bytes, backup_count)
+
+    def _start_writer(self, filename, max_bytes, backup_count):
+        """
+        Start the background thread that writes messages to disk
+
+        Args:
+            filename (str): Log file path
+            max_bytes (int): Size at which the log file is rotated
+            backup_count (int): Rotated files kept
+        """
+        try:
+            handler = RotatingFileHandler(
+                filename, maxBytes=max_bytes, backupCount=backup_count,
+                encoding='utf-8', delay=True
+            )
+        except OSError as e:
+            print(f"Log file error: {str(e)}")
+            return
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        records = queue.SimpleQueue()
+        self._listener = QueueListener(records, handler)
+        self._listener.start()
+        self._handler = QueueHandler(records)
+        self._logger.addHandler(self._handler)
+
+    def add(self, message):
+        """
+        Add a message with a timestamp
+
+        Args:
+            message (str): Message text
+
+        Returns:
+            bool: True if this is the first message since the last drain
+                (the caller should schedule a flush)
+        """
+        line = f"[{datetime.now().strftime('%H:%M:%S')}] {message}"
+        self._pending.append(line)
+        if self._handler:
+            self._logger.info(line)
+        return len(self._pending) == 1
+
+    def drain(self):
+        """
+        Take the messages added since the last drain
+
+        Returns:
+            list: Formatted messages, oldest first
+        """
+        batch = list(self._pending)
+        self._pending.clear()
+        return batch
+
+    def close(self):
+        """Stop the background writer after it has written every queued message"""
+        if self._listener:
+            self._logger.removeHandler(self._handler)
+            self._handler = None
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
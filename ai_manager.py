@@ -0,0 +1,354 @@
+"""
+ai_manager.py
+AI club manager for Football Manager Simulator
+Runs every AI club's weekly decisions in parallel and merges them deterministically
+
+Each club's policy (train, rest, pick a lineup, post transfer orders) only
+reads its own squad, so clubs are decided independently on a process pool.
+Workers get each club's state as plain tuples (only the attributes the
+policy reads) and a seed derived from the club's name and week, and return
+plain decisions; the main process applies them in club
+order and clears the transfer orders. The outcome for a given seed does not
+depend on the number of workers. Time a generated world with:
+    python ai_manager.py --clubs 100 --weeks 5 --workers 0,1,2,4
+"""
+
+import argparse
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from player import Player
+from team import Team, STARTERS
+from transfer_engine import Bid, Ask, club_orders, clear_orders
+from valuation import default_valuation
+
+
+# Rest a player below this stamina; train one at or above TRAIN_STAMINA
+REST_STAMINA = 50
+TRAIN_STAMINA = 80
+
+# Player attributes the policy reads (rating, training, valuation, squad needs)
+POLICY_FIELDS = (
+    'player_id', 'position', 'overall', 'age', 'salary', 'stamina',
+    'morale', 'form', 'goals', 'assists', 'matches_played'
+)
+
+# One club's decisions for the week (players are referred to by id)
+ClubDecision = namedtuple('ClubDecision', [
+    'club',      # Club name
+    'trained',   # Ids of players trained
+    'rested',    # Ids of players rested
+    'lineup',    # Ids of the starting 11, in order
+    'players',   # (player_id, overall, stamina, morale) after training and rest
+    'bids',      # (position, max_price, min_overall) per bid
+    'asks',      # (price, player_id) per player listed
+])
+
+# Result of one AI week
+AIWeek = namedtuple('AIWeek', ['decisions', 'trades'])
+
+
+def pick_lineup(players):
+    """
+    Best starting 11 by match rating: the best goalkeeper and ten outfielders
+
+    Args:
+        players (list): Squad players
+
+    Returns:
+        list: Starters, goalkeeper first (the whole squad if under 11)
+    """
+    ranked = sorted(players, key=lambda p: (-p.get_match_rating(), p.player_id))
+    keepers = [p for p in ranked if p.position == 'GK']
+    lineup = keepers[:1]
+    lineup += [p for p in ranked if p not in lineup][:STARTERS - len(lineup)]
+    return lineup
+
+
+def decide_club(club, seed):
+    """
+    Run one club's weekly policy on a copy of the club
+
+    Tired players rest, fresh players train (with Player.train and
+    Player.rest, so the usual random improvement applies), then the best 11
+    is picked and transfer orders are drawn up with club_orders. The global
+    random state is seeded for the club and restored afterwards.
+
+    Args:
+        club (Team): Working copy of the club (changed in place)
+        seed (str): Seed for this club and week
+
+    Returns:
+        ClubDecision: The club's decisions
+    """
+    state = random.getstate()
+    try:
+        random.seed(seed)
+        trained, rested = [], []
+        for player in club.players:
+            if player.stamina < REST_STAMINA:
+                player.rest()
+                rested.append(player.player_id)
+            elif player.stamina >= TRAIN_STAMINA:
+                player.train()
+                trained.append(player.player_id)
+        lineup = pick_lineup(club.players)
+        bids, asks = club_orders(club, random)
+    finally:
+        random.setstate(state)
+    return ClubDecision(
+        club.name,
+        trained,
+        rested,
+        [p.player_id for p in lineup],
+        [(p.player_id, p.overall, p.stamina, p.morale) for p in club.players],
+        [(b.position, b.max_price, b.min_overall) for b in bids],
+        [(a.price, a.player.player_id) for a in asks],
+    )
+
+
+def decide_clubs(states, seeds):
+    """
+    Worker task: decide a chunk of clubs
+
+    Args:
+        states (list): Club states from club_state
+        seeds (list): Seed per club
+
+    Returns:
+        list: ClubDecision per club, in the same order
+    """
+    return [decide_club(working_club(state), seed) for state, seed in zip(states, seeds)]
+
+
+def club_state(club):
+    """
+    The parts of a club the policy reads, as plain tuples
+
+    Much smaller to send to a worker than the club itself, and a copy, so
+    the policy can never change the real club.
+
+    Args:
+        club (Team): Club
+
+    Returns:
+        tuple: (name, budget, reputation, week, player rows in POLICY_FIELDS order)
+    """
+    rows = [tuple(getattr(p, field) for field in POLICY_FIELDS) for p in club.players]
+    return club.name, club.budget, club.reputation, club.week, rows
+
+
+def working_club(state):
+    """
+    Rebuild a club from club_state for the policy to work on
+
+    Players skip __init__, so no ids are handed out and no random form is drawn.
+
+    Args:
+        state (tuple): Result of club_state
+
+    Returns:
+        Team: Working club (player names are left blank)
+    """
+    name, budget, reputation, week, rows = state
+    club = Team(name, budget)
+    club.reputation = reputation
+    club.week = week
+    for row in rows:
+        player = Player.__new__(Player)
+        player.__dict__.update(zip(POLICY_FIELDS, row))
+        player.name = ''
+        club.players.append(player)
+    return club
+
+
+def apply_decision(club, decision):
+    """
+    Apply a club's decisions to the real club
+
+    Args:
+        club (Team): The club the decision was made for
+        decision (ClubDecision): Decisions from decide_club
+
+    Returns:
+        tuple: (bids: list of Bid, asks: list of Ask) for clear_orders
+    """
+    by_id = {p.player_id: p for p in club.players}
+    for player_id, overall, stamina, morale in decision.players:
+        player = by_id[player_id]
+        player.overall = overall
+        player.stamina = stamina
+        player.morale = morale
+    club.set_starting_lineup([by_id[i] for i in decision.lineup])
+    bids = [Bid(club, pos, max_price, floor) for pos, max_price, floor in decision.bids]
+    asks = [Ask(price, by_id[player_id], club) for price, player_id in decision.asks]
+    return bids, asks
+
+
+class AIManager:
+    """
+    Weekly decision-making for every AI club
+
+    The worker pool is started on first use and kept for later weeks, so
+    a week only pays for shipping the clubs, not for starting processes.
+    Use as a context manager (or call close()) to shut the pool down.
+
+    Attributes:
+        workers (int): Worker processes (None for one per CPU, 0 for none)
+        chunk_size (int): Clubs per worker task (None to split evenly)
+    """
+
+    def __init__(self, workers=None, chunk_size=None):
+        """
+        Initialize the manager
+
+        Args:
+            workers (int): Worker processes (None for one per CPU, 0 for none)
+            chunk_size (int): Clubs per worker task (None to split evenly)
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    def decide(self, clubs, seed=0):
+        """
+        Decide every club's week without changing the clubs
+
+        Args:
+            clubs (list): AI clubs (names must be unique)
+            seed (int): World seed; each club's seed is derived from it,
+                the club's week and its name
+
+        Returns:
+            list: ClubDecision per club, in the order given
+        """
+        names = [club.name for club in clubs]
+        if len(set(names)) != len(names):
+            raise ValueError("AI club names must be unique")
+        states = [club_state(club) for club in clubs]
+        seeds = [f"{seed}:{club.week}:{club.name}" for club in clubs]
+        if self.workers == 0 or not clubs:
+            return decide_clubs(states, seeds)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        size = self.chunk_size or -(-len(clubs) // (self.workers or os.cpu_count() or 1))
+        chunks = [(states[i:i + size], seeds[i:i + size]) for i in range(0, len(clubs), size)]
+        decisions = []
+        for chunk in self._pool.map(decide_clubs, *zip(*chunks)):
+            decisions.extend(chunk)
+        return decisions
+
+    def run_week(self, clubs, market=None, seed=0, registry=None):
+        """
+        Decide and apply every AI club's week, then clear the transfer orders
+
+        Decisions are applied in the order the clubs are given, and
+        free-market players are listed at their valuation, as in
+        transfer_engine.ai_orders.
+
+        Args:
+            clubs (list): AI clubs
+            market (list): Free-market players (sold players are removed)
+            seed (int): World seed
+            registry (PlayerRegistry): Registry to record transfers in (optional)
+
+        Returns:
+            AIWeek: Decisions and completed trades
+        """
+        decisions = self.decide(clubs, seed)
+        market = market if market is not None else []
+        bids = []
+        asks = [Ask(fee, p, None) for p, fee in zip(market, default_valuation.value_many(market))]
+        for club, decision in zip(clubs, decisions):
+            club_bids, club_asks = apply_decision(club, decision)
+            bids.extend(club_bids)
+            asks.extend(club_asks)
+        trades = clear_orders(bids, asks, market)
+        if registry is not None:
+            for trade in trades:
+                registry.move(trade.player.player_id, trade.buyer.name)
+        return AIWeek(decisions, trades)
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _world(clubs, market_size, seed):
+    """Generate AI clubs and a free market"""
+    from session import create_team
+    from utils import generate_transfer_market
+
+    random.seed(seed)
+    teams = [create_team(f"AI Club {i + 1}") for i in range(clubs)]
+    return teams, generate_transfer_market(max(1, market_size // 4))
+
+
+def _state(clubs, trades):
+    """Comparable state of every club and the trades made (ids differ between generated worlds)"""
+    return (
+        [(club.name, club.budget, [(p.name, p.overall, p.stamina, p.morale) for p in club.players])
+         for club in clubs],
+        trades,
+    )
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Time AI club decision-making per week")
+    parser.add_argument('--clubs', type=int, default=100)
+    parser.add_argument('--market', type=int, default=200, help="free-market players")
+    parser.add_argument('--weeks', type=int, default=5)
+    parser.add_argument('--workers', default='0,1,2,4', help="comma-separated worker counts (0 = in-process)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    try:
+        worker_counts = [int(w) for w in args.workers.split(',') if w.strip()]
+    except ValueError:
+        parser.error(f"--workers: expected comma-separated integers, got {args.workers!r}")
+    if not worker_counts or min(worker_counts) < 0:
+        parser.error("--workers: give at least one worker count, each 0 or more")
+
+    reference = None
+    differs = False
+    for workers in worker_counts:
+        clubs, market = _world(args.clubs, args.market, args.seed)
+        times = []
+        trades = []
+        with AIManager(workers=workers) as manager:
+            for week_number in range(args.weeks):
+                start = time.perf_counter()
+                week = manager.run_week(clubs, market, args.seed)
+                times.append(time.perf_counter() - start)
+                trades.extend(
+                    (week_number, t.buyer.name, t.seller.name if t.seller else None, t.player.name, t.price)
+                    for t in week.trades
+                )
+                for club in clubs:
+                    club.week += 1
+        state = _state(clubs, trades)
+        reference = reference or state
+        differs = differs or state != reference
+        # The first week includes starting the pool, so report the best week
+        print(f"workers={workers}: best week {min(times) * 1000:.1f} ms, "
+              f"mean {sum(times) / len(times) * 1000:.1f} ms, {len(trades)} trades, "
+              f"{'same result' if state == reference else 'RESULT DIFFERS'}")
+    if not reference[1]:
+        print("No trades were made, so the comparison only covers training and rest")
+    raise SystemExit(1 if differs else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+calibration.py
+Match model calibration for Football Manager Simulator
+Fits the goal model constants in match.py to target scoreline statistics
+
+Fit to goals per game and result rates from the command line with:
+    python calibration.py --goals 2.7 --home-win 0.46 --draw 0.26
+or to the scorelines recorded in a match history database:
+    python calibration.py --db football_manager_history.db
+"""
+
+import argparse
+import random
+import sqlite3
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import match
+from match import chance_distribution
+
+
+# The goal model constants of match.py
+MatchParams = namedtuple('MatchParams', [
+    'home_advantage', 'strength_scale', 'chance_conversion',
+    'min_chances', 'max_chances', 'goal_cap',
+])
+
+# Statistics a model can be fitted to
+STAT_NAMES = ('goals_per_game', 'home_win', 'draw', 'away_win')
+
+# Default search grid. strength_scale and chance_conversion only act through
+# their ratio, so only the conversion is searched.
+DEFAULT_GRID = {
+    'home_advantage': [1.0, 1.05, 1.1, 1.15, 1.2, 1.25, 1.3],
+    'chance_conversion': [round(0.02 + 0.01 * i, 2) for i in range(15)],
+    'min_chances': [2, 3, 4],
+    'max_chances': [6, 8, 10],
+}
+
+
+def current_params():
+    """
+    Get the constants match.py is using now
+
+    Returns:
+        MatchParams: Current constants
+    """
+    return MatchParams(match.HOME_ADVANTAGE, match.STRENGTH_SCALE, match.CHANCE_CONVERSION,
+                       match.MIN_CHANCES, match.MAX_CHANCES, match.GOAL_CAP)
+
+
+def apply_params(params):
+    """
+    Make match.py use the given constants
+
+    Results cached elsewhere from the old constants (e.g.
+    cup.tie_win_probability) are not cleared.
+
+    Args:
+        params (MatchParams): Constants to use
+    """
+    match.HOME_ADVANTAGE = params.home_advantage
+    match.STRENGTH_SCALE = params.strength_scale
+    match.CHANCE_CONVERSION = params.chance_conversion
+    match.MIN_CHANCES = params.min_chances
+    match.MAX_CHANCES = params.max_chances
+    match.GOAL_CAP = params.goal_cap
+
+
+def sample_matchups(count=50, seed=0):
+    """
+    Strengths of generated clubs, paired up as (home, away) matchups
+
+    The global random state is restored afterwards.
+
+    Args:
+        count (int): Number of matchups
+        seed (int): Random seed for the generated squads
+
+    Returns:
+        list: (home_strength, away_strength) pairs
+    """
+    from session import create_team
+
+    state = random.getstate()
+    try:
+        random.seed(seed)
+        strengths = [create_team("Sample").get_team_strength() for _ in range(count * 2)]
+    finally:
+        random.setstate(state)
+    return list(zip(strengths[0::2], strengths[1::2]))
+
+
+def model_stats(params, matchups):
+    """
+    Exact expected statistics of the goal model over a set of matchups
+
+    Args:
+        params (MatchParams): Goal model constants
+        matchups (list): (home_strength, away_strength) pairs
+
+    Returns:
+        dict: 'goals_per_game', 'home_win', 'draw' and 'away_win'
+    """
+    goals = home_win = draw = 0.0
+    shape = (params.min_chances, params.max_chances, params.goal_cap)
+    per_point = params.chance_conversion / params.strength_scale
+    for home_strength, away_strength in matchups:
+        home = chance_distribution(home_strength * params.home_advantage * per_point, *shape)
+        away = chance_distribution(away_strength * per_point, *shape)
+        away_cdf = []
+        running = 0.0
+        for pa in away:
+            running += pa
+            away_cdf.append(running)
+        for h, ph in enumerate(home):
+            goals += h * ph
+            if h:
+                home_win += ph * away_cdf[h - 1]
+            draw += ph * away[h]
+        goals += sum(a * pa for a, pa in enumerate(away))
+    n = len(matchups)
+    home_win /= n
+    draw /= n
+    return {
+        'goals_per_game': goals / n,
+        'home_win': home_win,
+        'draw': draw,
+        'away_win': max(0.0, 1.0 - home_win - draw),
+    }
+
+
+def targets_from_scorelines(scorelines):
+    """
+    Target statistics from observed scorelines
+
+    Args:
+        scorelines (iterable): (home_goals, away_goals) pairs
+
+    Returns:
+        dict: 'goals_per_game', 'home_win', 'draw' and 'away_win'
+    """
+    games = goals = home_wins = draws = 0
+    for home, away in scorelines:
+        games += 1
+        goals += home + away
+        home_wins += home > away
+        draws += home == away
+    if games == 0:
+        raise ValueError("No scorelines to calibrate against")
+    return {
+        'goals_per_game': goals / games,
+        'home_win': home_wins / games,
+        'draw': draws / games,
+        'away_win': (games - home_wins - draws) / games,
+    }
+
+
+def scorelines_from_history(path):
+    """
+    Read every recorded scoreline from a match history database
+
+    Args:
+        path (str): Database file (see history.MatchHistory)
+
+    Yields:
+        tuple: (home_score, away_score)
+    """
+    conn = sqlite3.connect(path)
+    try:
+        yield from conn.execute("SELECT home_score, away_score FROM fixtures")
+    finally:
+        conn.close()
+
+
+def loss(stats, targets):
+    """
+    Relative squared error of model statistics against targets
+
+    Args:
+        stats (dict): Model statistics
+        targets (dict): Target statistics (any subset of STAT_NAMES)
+
+    Returns:
+        float: Sum of squared relative errors
+    """
+    return sum(((stats[name] - target) / max(target, 0.01)) ** 2 for name, target in targets.items())
+
+
+def evaluate_candidates(candidates, targets, matchups):
+    """
+    Worker task: score a chunk of candidate constants
+
+    Args:
+        candidates (list): MatchParams to try
+        targets (dict): Target statistics
+        matchups (list): (home_strength, away_strength) pairs
+
+    Returns:
+        list: (loss, params, stats) per candidate
+    """
+    results = []
+    for params in candidates:
+        if params.min_chances > params.max_chances:
+            continue
+        stats = model_stats(params, matchups)
+        results.append((loss(stats, targets), params, stats))
+    return results
+
+
+def grid_candidates(grid, base=None):
+    """
+    Every combination of the grid values, other constants taken from base
+
+    Args:
+        grid (dict): Constant name -> values to try
+        base (MatchParams): Values for constants not in the grid (current if None)
+
+    Returns:
+        list: MatchParams candidates
+    """
+    base = base or current_params()
+    names = list(grid)
+    return [base._replace(**dict(zip(names, values))) for values in product(*(grid[n] for n in names))]
+
+
+def calibrate(targets, grid=None, matchups=None, workers=None, chunk_size=64, top=5):
+    """
+    Search a grid of constants for the best fit to the targets
+
+    Each candidate is scored with the exact goal distribution, so there is
+    no sampling noise; chunks of candidates run on a process pool.
+
+    Args:
+        targets (dict): Target statistics (any subset of STAT_NAMES)
+        grid (dict): Constant name -> values to try (DEFAULT_GRID if None)
+        matchups (list): (home_strength, away_strength) pairs (sampled if None)
+        workers (int): Worker processes (None for one per CPU, 0 for none)
+        chunk_size (int): Candidates per worker task
+        top (int): Number of results to return
+
+    Returns:
+        list: Best (loss, params, stats), best first
+    """
+    unknown = set(targets) - set(STAT_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown target statistics: {', '.join(sorted(unknown))}")
+    candidates = grid_candidates(grid or DEFAULT_GRID)
+    matchups = matchups if matchups is not None else sample_matchups()
+    chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+
+    if workers == 0:
+        scored = [evaluate_candidates(chunk, targets, matchups) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scored = list(pool.map(
+                evaluate_candidates, chunks, [targets] * len(chunks), [matchups] * len(chunks)
+            ))
+    results = [result for chunk in scored for result in chunk]
+    # Ties are broken by the candidate itself so the answer never depends on scheduling
+    results.sort(key=lambda r: (r[0], r[1]))
+    return results[:top]
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Fit the match model constants")
+    parser.add_argument('--db', help="match history database to take target scorelines from")
+    parser.add_argument('--goals', type=float, help="target goals per game")
+    parser.add_argument('--home-win', type=float, help="target home win rate")
+    parser.add_argument('--draw', type=float, help="target draw rate")
+    parser.add_argument('--away-win', type=float, help="target away win rate")
+    parser.add_argument('--matchups', type=int, default=50, help="sampled club matchups")
+    parser.add_argument('--workers', type=int, default=None, help="0 runs in this process")
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.db:
+        targets = targets_from_scorelines(scorelines_from_history(args.db))
+    else:
+        targets = {
+            name: value for name, value in (
+                ('goals_per_game', args.goals), ('home_win', args.home_win),
+                ('draw', args.draw), ('away_win', args.away_win),
+            ) if value is not None
+        }
+    if not targets:
+        parser.error("Give --db or at least one target statistic")
+
+    matchups = sample_matchups(args.matchups)
+    current = model_stats(current_params(), matchups)
+    print("Targets: " + ", ".join(f"{k} {v:.3f}" for k, v in targets.items()))
+    print("Current: " + ", ".join(f"{k} {current[k]:.3f}" for k in STAT_NAMES)
+          + f" (loss {loss(current, targets):.4f})")
+
+    results = calibrate(targets, matchups=matchups, workers=args.workers, top=args.top)
+    for i, (score, params, stats) in enumerate(results, 1):
+        print(f"\n#{i} loss {score:.4f}: " + ", ".join(f"{k} {stats[k]:.3f}" for k in STAT_NAMES))
+        print("    " + ", ".join(f"{k}={v}" for k, v in params._asdict().items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+crest.py
+Club crest rendering module for Football Manager Simulator
+Draws a shield crest with a football and the club name, cached per club and size
+"""
+
+from functools import lru_cache
+
+
+# Bold TrueType fonts tried in order for the ribbon text
+CREST_FONT_FILES = ('DejaVuSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf', 'Helvetica.ttc')
+
+# Crest colours
+SHIELD_EDGE = '#0B1F4B'
+SHIELD_OUTER = '#1E3A8A'
+SHIELD_INNER = '#3B82F6'
+RIBBON = '#F8FAFF'
+
+# Drawing at a larger scale and shrinking gives smooth edges
+SUPERSAMPLE = 3
+
+
+class CrestRenderer:
+    """
+    Renders club crests to PhotoImages and memoizes them
+
+    Images are cached per (club name, size) and the ribbon font size is
+    measured once per (club name, width) with the same Pillow font that
+    draws it, so redrawing or resizing to a size seen before costs a
+    dictionary lookup.
+
+    Attributes:
+        root: Tkinter root window (owner of the images)
+    """
+
+    def __init__(self, root):
+        """
+        Initialize the renderer
+
+        Args:
+            root: Tkinter root window
+        """
+        self.root = root
+        self._images = {}
+        self._font_sizes = {}
+
+    def get(self, club_name, size):
+        """
+        Get the crest image for a club, rendering it on first use
+
+        Args:
+            club_name (str): Club name shown on the ribbon
+            size (int): Width and height in pixels
+
+        Returns:
+            PhotoImage: Crest image, or None if Pillow is not installed
+        """
+        club_name = (club_name or '').strip() or "My Club"
+        key = (club_name, size)
+        if key not in self._images:
+            self._images[key] = self._render(club_name, size)
+        return self._images[key]
+
+    def fit_font_size(self, text, max_width, max_size=16, min_size=9):
+        """
+        Largest bold font size (in pixels) at which text fits within max_width
+
+        Args:
+            text (str): Text to fit
+            max_width (float): Available width in pixels
+            max_size (int): Largest size to try
+            min_size (int): Smallest size allowed
+
+        Returns:
+            int: Font size in pixels
+        """
+        key = (text, int(max_width), max_size, min_size)
+        if key not in self._font_sizes:
+            size = max_size
+            while size > min_size and self._measure(text, size) > max_width:
+                size -= 1
+            self._font_sizes[key] = size
+        return self._font_sizes[key]
+
+    def _measure(self, text, size):
+        """
+        Measure text width with the font _render draws it in
+
+        The text is drawn at SUPERSAMPLE times the size and shrunk with the
+        image, so it is measured the same way.
+
+        Args:
+            text (str): Text to measure
+            size (int): Font size in pixels
+
+        Returns:
+            float: Width in pixels
+        """
+        font = _pil_font(size * SUPERSAMPLE)
+        if hasattr(font, 'getlength'):
+            return font.getlength(text) / SUPERSAMPLE
+        return font.getsize(text)[0] / SUPERSAMPLE
+
+    def _render(self, club_name, size):
+        """
+        Draw a crest into a new PhotoImage
+
+        Args:
+            club_name (str): Club name shown on the ribbon
+            size (int): Width and height in pixels
+
+        Returns:
+            PhotoImage: Crest image, or None if Pillow is not installed
+        """
+        try:
+            from PIL import Image, ImageDraw, ImageTk
+        except ImportError:
+            return None
+
+        text = club_name.upper()
+        font_px = self.fit_font_size(text, size * 0.60, max_size=max(9, size // 8))
+
+        s = SUPERSAMPLE
+        W = H = size * s
+        img = Image.new('RGBA', (W, H), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+
+        # Shield
+        shield = [
+            (W * 0.50, H * 0.05),
+            (W * 0.90, H * 0.22),
+            (W * 0.85, H * 0.65),
+            (W * 0.50, H * 0.95),
+            (W * 0.15, H * 0.65),
+            (W * 0.10, H * 0.22),
+        ]
+        draw.polygon(shield, fill=SHIELD_OUTER, outline=SHIELD_EDGE, width=3 * s)
+        draw.polygon([(x, y + 2 * s) for x, y in shield], fill=SHIELD_INNER)
+
+        # Football
+        cx, cy, r = W * 0.50, H * 0.38, W * 0.20
+        draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill='white', outline='black', width=3 * s)
+        draw.polygon([
+            (cx, cy - r * 0.55),
+            (cx + r * 0.43, cy - r * 0.18),
+            (cx + r * 0.27, cy + r * 0.50),
+            (cx - r * 0.27, cy + r * 0.50),
+            (cx - r * 0.43, cy - r * 0.18),
+        ], fill='black')
+        for side in (1, -1):
+            draw.line([(cx + side * r * 0.43, cy - r * 0.18), (cx + side * r * 0.85, cy - r * 0.30)],
+                      fill='black', width=2 * s)
+            draw.line([(cx + side * r * 0.27, cy + r * 0.50), (cx + side * r * 0.50, cy + r * 0.80)],
+                      fill='black', width=2 * s)
+        draw.line([(cx, cy - r * 0.55), (cx, cy - r * 0.95)], fill='black', width=2 * s)
+
+        # Ribbon with the club name
+        band_top, band_h = H * 0.62, H * 0.20
+        draw.pieslice((W * 0.12, band_top - 2 * s, W * 0.30, band_top + band_h + 2 * s), 90, 270,
+                      fill=RIBBON, outline=SHIELD_EDGE, width=2 * s)
+        draw.pieslice((W * 0.70, band_top - 2 * s, W * 0.88, band_top + band_h + 2 * s), 270, 450,
+                      fill=RIBBON, outline=SHIELD_EDGE, width=2 * s)
+        draw.rectangle((W * 0.16, band_top, W * 0.84, band_top + band_h),
+                       fill=RIBBON, outline=SHIELD_EDGE, width=2 * s)
+        font = _pil_font(font_px * s)
+        draw.text((W * 0.50, band_top + band_h / 2), text, font=font, fill=SHIELD_EDGE, anchor='mm')
+
+        img = img.resize((size, size), Image.LANCZOS)
+        return ImageTk.PhotoImage(img, master=self.root)
+
+
+@lru_cache(maxsize=None)
+def _pil_font(pixels):
+    """
+    Load a bold TrueType font for Pillow, falling back to the default font
+
+    Args:
+        pixels (int): Font size in pixels
+
+    Returns:
+        ImageFont: Font object
+    """
+    from PIL import ImageFont
+    for name in CREST_FONT_FILES:
+        try:
+            return ImageFont.truetype(name, pixels)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(pixels)
+    except TypeError:
+        return ImageFont.load_default()
@@ -0,0 +1,321 @@
+"""
+cup.py
+Knockout cup module for Football Manager Simulator
+Single-elimination brackets with extra time, penalties and exact bracket odds
+"""
+
+import random
+from collections import namedtuple
+from functools import lru_cache
+
+from match import Match, roll_goals, goal_distribution, attack_strength
+
+
+# Chance of scoring a penalty in a shootout
+PENALTY_CONVERSION = 0.75
+
+# Extra time is a third of a match, so each side gets a third of its attack
+EXTRA_TIME_FACTOR = 1 / 3
+
+# Outcome of one cup tie
+TieResult = namedtuple('TieResult', [
+    'home', 'away',          # Teams
+    'home_score', 'away_score',  # Score after extra time
+    'extra_time',            # True if the tie went to extra time
+    'penalties',             # (home, away) shootout score, or None
+    'winner',                # Team that goes through
+])
+
+# One club's chance of reaching each round
+CupOdds = namedtuple('CupOdds', ['name', 'rounds'])
+
+
+def _scoreline_odds(home_dist, away_dist):
+    """
+    Win and draw probabilities from two goal distributions
+
+    Args:
+        home_dist (tuple): Home goal probabilities
+        away_dist (tuple): Away goal probabilities
+
+    Returns:
+        tuple: (win: float, draw: float) for the home side
+    """
+    win = draw = 0.0
+    for h, ph in enumerate(home_dist):
+        for a, pa in enumerate(away_dist):
+            if h > a:
+                win += ph * pa
+            elif h == a:
+                draw += ph * pa
+    return win, draw
+
+
+@lru_cache(maxsize=65536)
+def tie_win_probability(home_strength, away_strength):
+    """
+    Exact chance that the home side wins a cup tie
+
+    Covers 90 minutes, extra time and penalties, using the same goal model
+    as play_tie. Both sides convert penalties equally often, so shootouts
+    are even.
+
+    Args:
+        home_strength (float): Home team strength (before home advantage)
+        away_strength (float): Away team strength
+
+    Returns:
+        float: Probability the home side goes through
+    """
+    home_attack = attack_strength(home_strength, home=True)
+    away_attack = attack_strength(away_strength)
+    win, draw = _scoreline_odds(goal_distribution(home_attack), goal_distribution(away_attack))
+    et_win, et_draw = _scoreline_odds(
+        goal_distribution(home_attack * EXTRA_TIME_FACTOR),
+        goal_distribution(away_attack * EXTRA_TIME_FACTOR)
+    )
+    return win + draw * (et_win + et_draw * 0.5)
+
+
+def penalty_shootout(rng=random):
+    """
+    Simulate a shootout: five kicks each, then sudden death
+
+    The shootout stops as soon as one side cannot be caught.
+
+    Args:
+        rng: Random source
+
+    Returns:
+        tuple: (home_goals, away_goals)
+    """
+    home = away = 0
+    for kick in range(5):
+        home += rng.random() < PENALTY_CONVERSION
+        if home > away + (5 - kick) or away > home + (4 - kick):
+            break
+        away += rng.random() < PENALTY_CONVERSION
+        if home > away + (4 - kick) or away > home + (4 - kick):
+            break
+    while home == away:
+        home += rng.random() < PENALTY_CONVERSION
+        away += rng.random() < PENALTY_CONVERSION
+    return home, away
+
+
+def play_tie(home, away, rng=random):
+    """
+    Play a cup tie to a winner
+
+    The 90 minutes are a normal Match (so player stats and the home team's
+    record update as usual); a draw goes to extra time and then penalties.
+
+    Args:
+        home (Team): Home team
+        away (Team): Away team
+        rng: Random source for extra time and penalties
+
+    Returns:
+        TieResult: Outcome of the tie
+    """
+    result, home_score, away_score = Match(home, away).simulate()
+    extra_time = result == "Draw"
+    penalties = None
+    if extra_time:
+        home_attack = attack_strength(home.get_team_strength(), home=True)
+        away_attack = attack_strength(away.get_team_strength())
+        home_score += roll_goals(home_attack * EXTRA_TIME_FACTOR, rng)
+        away_score += roll_goals(away_attack * EXTRA_TIME_FACTOR, rng)
+        if home_score == away_score:
+            penalties = penalty_shootout(rng)
+    if penalties:
+        winner = home if penalties[0] > penalties[1] else away
+    else:
+        winner = home if home_score > away_score else away
+    return TieResult(home, away, home_score, away_score, extra_time, penalties, winner)
+
+
+def seed_order(size):
+    """
+    Standard bracket positions for seeds, so top seeds meet as late as possible
+
+    Args:
+        size (int): Bracket size (a power of two)
+
+    Returns:
+        list: Seed number (0 = top seed) at each bracket position
+    """
+    order = [0]
+    while len(order) < size:
+        span = len(order) * 2
+        order = [s for seed in order for s in (seed, span - 1 - seed)]
+    return order
+
+
+def make_bracket(teams, seeded=True, rng=random):
+    """
+    Lay teams out in a bracket padded with byes to a power of two
+
+    Args:
+        teams (list): Entrants
+        seeded (bool): Seed by team strength (top seeds get the byes);
+            otherwise the draw is random
+        rng: Random source for an unseeded draw
+
+    Returns:
+        list: Team (or None for a bye) at each bracket position
+    """
+    entrants = list(teams)
+    if seeded:
+        entrants.sort(key=lambda t: t.get_team_strength(), reverse=True)
+    else:
+        rng.shuffle(entrants)
+    size = 1
+    while size < len(entrants):
+        size *= 2
+    return [entrants[s] if s < len(entrants) else None for s in seed_order(size)]
+
+
+def round_name(teams_left):
+    """
+    Name of the round played by this many teams
+
+    Args:
+        teams_left (int): Bracket places left (a power of two)
+
+    Returns:
+        str: Round name
+    """
+    return {2: "Final", 4: "Semi-finals", 8: "Quarter-finals"}.get(teams_left, f"Round of {teams_left}")
+
+
+def bracket_odds(bracket):
+    """
+    Exact odds of each team reaching each round of a bracket
+
+    Works round by round: a team reaches the next round if it reached this
+    one and beats whoever comes out of the neighbouring section. The upper
+    side of each pairing is at home, as in Cup.play_round. Costs about
+    n^2 tie lookups, so a 128-team bracket takes a fraction of a second.
+
+    Args:
+        bracket (list): Team or None (bye) per position, as make_bracket
+
+    Returns:
+        list: CupOdds for each team, in bracket order. rounds[0] is 1.0 (in
+            the first round) and rounds[-1] is the chance of winning the cup.
+    """
+    strengths = [t.get_team_strength() if t is not None else None for t in bracket]
+    reach = [1.0 if t is not None else 0.0 for t in bracket]
+    history = [[r] for r in reach]
+    block = 1
+    while block < len(bracket):
+        nxt = [0.0] * len(bracket)
+        for start in range(0, len(bracket), 2 * block):
+            upper = range(start, start + block)
+            lower = range(start + block, start + 2 * block)
+            for side, others, at_home in ((upper, lower, True), (lower, upper, False)):
+                live = [j for j in others if reach[j] > 0]
+                for i in side:
+                    if reach[i] == 0:
+                        continue
+                    if not live:
+                        nxt[i] = reach[i]
+                        continue
+                    total = 0.0
+                    for j in live:
+                        if at_home:
+                            total += reach[j] * tie_win_probability(strengths[i], strengths[j])
+                        else:
+                            total += reach[j] * (1 - tie_win_probability(strengths[j], strengths[i]))
+                    nxt[i] = reach[i] * total
+        reach = nxt
+        for i, r in enumerate(reach):
+            history[i].append(r)
+        block *= 2
+    return [CupOdds(t.name, rounds) for t, rounds in zip(bracket, history) if t is not None]
+
+
+class Cup:
+    """
+    A single-elimination cup competition
+
+    Attributes:
+        name (str): Cup name
+        bracket (list): Team or None (bye) per position, as drawn
+        remaining (list): Bracket of teams still in the cup
+        rounds (list): TieResult list for each round played
+        winner (Team): Cup winner once the final is played
+    """
+
+    def __init__(self, teams, name="Cup", seeded=True, rng=random):
+        """
+        Draw the cup
+
+        Args:
+            teams (list): Entrants (at least two)
+            name (str): Cup name
+            seeded (bool): Seed by strength instead of a random draw
+            rng: Random source for the draw, extra time and penalties
+        """
+        self.name = name
+        self.rng = rng
+        self.bracket = make_bracket(teams, seeded, rng)
+        self.remaining = list(self.bracket)
+        self.rounds = []
+        self.winner = None
+
+    def current_round(self):
+        """
+        Name of the next round to be played
+
+        Returns:
+            str: Round name, or None once the cup is won
+        """
+        if self.winner is not None:
+            return None
+        return round_name(len(self.remaining))
+
+    def play_round(self):
+        """
+        Play every tie of the next round (byes go straight through)
+
+        Returns:
+            list: TieResult for each tie played
+        """
+        if self.winner is not None:
+            return []
+        ties = []
+        advancing = []
+        for home, away in zip(self.remaining[0::2], self.remaining[1::2]):
+            if home is None or away is None:
+                advancing.append(home or away)
+                continue
+            tie = play_tie(home, away, self.rng)
+            ties.append(tie)
+            advancing.append(tie.winner)
+        self.remaining = advancing
+        self.rounds.append(ties)
+        if len(self.remaining) == 1:
+            self.winner = self.remaining[0]
+        return ties
+
+    def play(self):
+        """
+        Play every remaining round
+
+        Returns:
+            Team: Cup winner
+        """
+        while self.winner is None:
+            self.play_round()
+        return self.winner
+
+    def odds(self):
+        """
+        Exact odds for the teams still in the cup from the current round on
+
+        Returns:
+            list: CupOdds per team still in, in bracket order
+        """
+        return bracket_odds(self.remaining)
@@ -0,0 +1,149 @@
+"""
+finance.py
+Club finance module for Football Manager Simulator
+Week-by-week cash-flow projection and the odds of running out of money
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from match import outcome_probabilities
+from session import VICTORY_PRIZE, DRAW_PRIZE
+
+
+# Average strength of a create_opponent() side: starters rated 70-85 with
+# mean form 72.5, full stamina and morale 75
+OPPONENT_STRENGTH = 82.0
+
+# A transfer agreed for a future week: fee paid then (negative for a sale)
+# and the change to the weekly wage bill from that week on
+PendingTransfer = namedtuple('PendingTransfer', ['week', 'fee', 'salary'])
+
+# Projection for one week
+WeekProjection = namedtuple('WeekProjection', [
+    'week',              # Week number
+    'wages',             # Wage bill paid at the end of the week
+    'transfers',         # Net transfer fees paid this week
+    'expected_prize',    # Prize money expected from this week's match
+    'expected_budget',   # Expected budget after wages (ignoring insolvency)
+    'insolvent_by',      # Chance the club has failed to pay wages by now
+])
+
+# Projection for the season
+CashFlowProjection = namedtuple('CashFlowProjection', [
+    'weeks',        # WeekProjection per week
+    'insolvency',   # Chance of first missing wages in each week
+    'survival',     # Chance of paying wages every week
+])
+
+
+@lru_cache(maxsize=256)
+def insolvency_curve(budget, wages, fees, p_win, p_draw, victory=VICTORY_PRIZE, draw=DRAW_PRIZE):
+    """
+    Exact distribution of the week wages are first missed
+
+    Each week the club plays one match (a win or draw pays prize money),
+    pays any transfer fees due, then pays wages, as play_match and
+    advance_week do. The budget depends only on how many wins and draws
+    there have been, so the state is the (wins, draws) count and each week
+    costs O(weeks^2) at most.
+
+    Args:
+        budget (int): Budget now
+        wages (tuple): Wage bill for each week
+        fees (tuple): Net transfer fees due in each week
+        p_win (float): Chance of winning each match
+        p_draw (float): Chance of drawing each match
+        victory (int): Prize for a win
+        draw (int): Prize for a draw
+
+    Returns:
+        tuple: Chance of first missing wages in each week
+    """
+    p_loss = max(0.0, 1.0 - p_win - p_draw)
+    states = {(0, 0): 1.0}
+    spent = 0
+    curve = []
+    for week_wages, week_fees in zip(wages, fees):
+        nxt = {}
+        for (w, d), p in states.items():
+            for key, q in (((w + 1, d), p_win), ((w, d + 1), p_draw), ((w, d), p_loss)):
+                if q:
+                    nxt[key] = nxt.get(key, 0.0) + p * q
+        spent += week_fees
+        failed = 0.0
+        states = {}
+        for (w, d), p in nxt.items():
+            available = budget - spent + w * victory + d * draw
+            if available < week_wages:
+                failed += p
+            else:
+                states[(w, d)] = p
+        spent += week_wages
+        curve.append(failed)
+    return tuple(curve)
+
+
+def project_cash_flow(team, weeks=38, pending=(), opponent_strength=OPPONENT_STRENGTH):
+    """
+    Project a club's budget week by week
+
+    Wages are the current squad's plus any pending signings from their
+    week on. Prize money is weighted by the result odds of the club's
+    current strength against an average opponent.
+
+    Args:
+        team (Team): The club
+        weeks (int): Weeks to project (starting with the current week)
+        pending (list): PendingTransfer entries
+        opponent_strength (float): Opponent strength to assume
+
+    Returns:
+        CashFlowProjection: Weekly projection and insolvency odds
+    """
+    base_wages = sum(p.salary for p in team.players)
+    week_numbers = range(team.week, team.week + weeks)
+    wages = []
+    fees = []
+    for week in week_numbers:
+        wages.append(base_wages + sum(t.salary for t in pending if t.week <= week))
+        fees.append(sum(t.fee for t in pending if t.week == week))
+
+    p_win, p_draw, _ = outcome_probabilities(team.get_team_strength(), opponent_strength)
+    curve = insolvency_curve(team.budget, tuple(wages), tuple(fees), p_win, p_draw)
+    expected_prize = p_win * VICTORY_PRIZE + p_draw * DRAW_PRIZE
+
+    projection = []
+    budget = team.budget
+    insolvent = 0.0
+    for week, week_wages, week_fees, failed in zip(week_numbers, wages, fees, curve):
+        budget += expected_prize - week_fees - week_wages
+        insolvent += failed
+        projection.append(WeekProjection(
+            week, week_wages, week_fees, expected_prize, budget, min(1.0, insolvent)
+        ))
+    return CashFlowProjection(projection, list(curve), max(0.0, 1.0 - insolvent))
+
+
+def weeks_to_insolvency(projection):
+    """
+    Summarize when the money is expected to run out
+
+    Args:
+        projection (CashFlowProjection): Result of project_cash_flow
+
+    Returns:
+        dict: 'median' week by which wages have been missed with at least
+            even odds (None if the club is more likely than not to last),
+            'expected' weeks until missing wages counting the full season
+            for survivors, and 'survival' odds
+    """
+    median = None
+    for entry in projection.weeks:
+        if entry.insolvent_by >= 0.5:
+            median = entry.week
+            break
+    horizon = len(projection.weeks)
+    expected = sum((i + 1) * p for i, p in enumerate(projection.insolvency))
+    expected += horizon * projection.survival
+    return {'median': median, 'expected': expected, 'survival': projection.survival}
@@ -0,0 +1,297 @@
+"""
+forecaster.py
+Season forecaster for Football Manager Simulator
+Monte Carlo odds of each finishing position from the current table
+
+Forecast a generated league from the command line with:
+    python forecaster.py --clubs 20 --played 10 --runs 20000
+"""
+
+import argparse
+import math
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from match import Match, outcome_probabilities
+from session import create_team
+
+
+# Probability with a 95% confidence interval
+Odds = namedtuple('Odds', ['p', 'low', 'high'])
+
+# One club's forecast
+ClubOdds = namedtuple('ClubOdds', [
+    'name',
+    'positions',   # Odds of finishing in each position (1st first)
+    'title',       # Odds of finishing 1st
+    'top_four',    # Odds of finishing in the top four
+    'relegation',  # Odds of finishing in the relegation places
+])
+
+# Forecast after some number of simulated seasons
+Forecast = namedtuple('Forecast', ['runs', 'clubs'])
+
+
+def round_robin(names):
+    """
+    Double round-robin fixture list (every club hosts every other once)
+
+    Args:
+        names (list): Club names
+
+    Returns:
+        list: Rounds, each a list of (home, away) name pairs
+    """
+    clubs = list(names)
+    if len(clubs) % 2:
+        clubs.append(None)
+    half = len(clubs) // 2
+    rounds = []
+    for r in range(len(clubs) - 1):
+        pairs = []
+        for i in range(half):
+            home, away = clubs[i], clubs[-1 - i]
+            if home is not None and away is not None:
+                pairs.append((home, away) if r % 2 else (away, home))
+        rounds.append(pairs)
+        # Circle method: keep the first club fixed and rotate the others
+        clubs.insert(1, clubs.pop())
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+
+def wilson_interval(successes, runs, z=1.96):
+    """
+    Confidence interval for a probability estimated from runs
+
+    Args:
+        successes (int): Runs where the event happened
+        runs (int): Total runs
+        z (float): Normal quantile (1.96 for 95%)
+
+    Returns:
+        Odds: Estimate with its interval
+    """
+    if runs == 0:
+        return Odds(0.0, 0.0, 1.0)
+    p = successes / runs
+    denominator = 1 + z * z / runs
+    centre = (p + z * z / (2 * runs)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / runs + z * z / (4 * runs * runs)) / denominator
+    return Odds(p, max(0.0, centre - margin), min(1.0, centre + margin))
+
+
+def simulate_seasons(points, wins, fixtures, runs, seed=None):
+    """
+    Worker task: play out the remaining fixtures many times
+
+    Only the result of each match decides the table, so every fixture is
+    drawn from its exact (win, draw, loss) probabilities under the Match
+    goal model. Ties on points are broken by wins, then at random.
+
+    Args:
+        points (list): Current points per club
+        wins (list): Current wins per club
+        fixtures (list): (home, away, p_win, p_win_or_draw) with club indexes
+        runs (int): Seasons to simulate
+        seed (int): Random seed
+
+    Returns:
+        list: counts[club][position] of finishes over the runs
+    """
+    rng = random.Random(seed)
+    rand = rng.random
+    n = len(points)
+    counts = [[0] * n for _ in range(n)]
+    clubs = range(n)
+    for _ in range(runs):
+        pts = list(points)
+        won = list(wins)
+        for home, away, p_win, p_not_loss in fixtures:
+            r = rand()
+            if r < p_win:
+                pts[home] += 3
+                won[home] += 1
+            elif r < p_not_loss:
+                pts[home] += 1
+                pts[away] += 1
+            else:
+                pts[away] += 3
+                won[away] += 1
+        order = sorted(clubs, key=lambda c: (pts[c], won[c], rand()), reverse=True)
+        for position, club in enumerate(order):
+            counts[club][position] += 1
+    return counts
+
+
+class SeasonForecaster:
+    """
+    Forecasts the final table from the current standings
+
+    Team strengths are taken once, at the start, and held for the rest of
+    the season. Seasons are simulated in batches on a process pool and the
+    forecast is refined as each batch comes back.
+
+    Attributes:
+        teams (list): Clubs in the league (Team objects)
+        runs (int): Seasons to simulate in total
+        batch_size (int): Seasons per worker task
+        workers (int): Worker processes (0 runs everything in this process)
+        relegation_places (int): Clubs relegated from the bottom
+    """
+
+    def __init__(self, teams, fixtures, runs=10000, batch_size=2000, workers=None,
+                 relegation_places=3):
+        """
+        Initialize the forecaster
+
+        Args:
+            teams (list): Clubs in the league (Team objects)
+            fixtures (list): Remaining (home, away) fixtures as club names
+            runs (int): Seasons to simulate in total
+            batch_size (int): Seasons per worker task
+            workers (int): Worker processes (None for one per CPU, 0 for none)
+            relegation_places (int): Clubs relegated from the bottom
+        """
+        self.teams = list(teams)
+        self.runs = runs
+        self.batch_size = max(1, batch_size)
+        self.workers = workers
+        self.relegation_places = relegation_places
+
+        index = {team.name: i for i, team in enumerate(self.teams)}
+        strengths = [team.get_team_strength() for team in self.teams]
+        self._points = [3 * t.wins + t.draws for t in self.teams]
+        self._wins = [t.wins for t in self.teams]
+        self._fixtures = []
+        for home, away in fixtures:
+            h, a = index[home], index[away]
+            win, draw, _ = outcome_probabilities(strengths[h], strengths[a])
+            self._fixtures.append((h, a, win, win + draw))
+
+    def _batches(self, seed):
+        """Yield (runs, seed) for each worker task"""
+        rng = random.Random(seed)
+        remaining = self.runs
+        while remaining > 0:
+            runs = min(self.batch_size, remaining)
+            remaining -= runs
+            yield runs, rng.randrange(2 ** 32)
+
+    def stream(self, seed=None):
+        """
+        Simulate the season and yield a refined forecast after every batch
+
+        Batches are merged in the order they finish. The final forecast
+        covers all runs and, for a given seed, does not depend on the
+        number of workers.
+
+        Args:
+            seed (int): Random seed
+
+        Yields:
+            Forecast: Odds over the runs finished so far
+        """
+        n = len(self.teams)
+        totals = [[0] * n for _ in range(n)]
+        done = 0
+        args = (self._points, self._wins, self._fixtures)
+
+        if self.workers == 0:
+            for runs, batch_seed in self._batches(seed):
+                done += runs
+                self._merge(totals, simulate_seasons(*args, runs, batch_seed))
+                yield self._forecast(totals, done)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(simulate_seasons, *args, runs, batch_seed): runs
+                for runs, batch_seed in self._batches(seed)
+            }
+            for future in as_completed(futures):
+                done += futures[future]
+                self._merge(totals, future.result())
+                yield self._forecast(totals, done)
+
+    def run(self, seed=None):
+        """
+        Simulate the season and return the final forecast
+
+        Args:
+            seed (int): Random seed
+
+        Returns:
+            Forecast: Odds over all runs
+        """
+        forecast = Forecast(0, [])
+        for forecast in self.stream(seed):
+            pass
+        return forecast
+
+    @staticmethod
+    def _merge(totals, counts):
+        """Add a batch's finishing counts to the running totals"""
+        for row, batch_row in zip(totals, counts):
+            for position, count in enumerate(batch_row):
+                row[position] += count
+
+    def _forecast(self, totals, runs):
+        """Turn finishing counts into odds"""
+        n = len(self.teams)
+        relegated = max(0, n - self.relegation_places)
+        clubs = []
+        for team, row in zip(self.teams, totals):
+            clubs.append(ClubOdds(
+                name=team.name,
+                positions=[wilson_interval(count, runs) for count in row],
+                title=wilson_interval(row[0], runs),
+                top_four=wilson_interval(sum(row[:4]), runs),
+                relegation=wilson_interval(sum(row[relegated:]), runs),
+            ))
+        return Forecast(runs, clubs)
+
+
+def main():
+    """Command line entry point: forecast a generated league part-way through"""
+    parser = argparse.ArgumentParser(description="Football Manager season forecaster")
+    parser.add_argument('--clubs', type=int, default=20)
+    parser.add_argument('--played', type=int, default=10, help="rounds already played")
+    parser.add_argument('--runs', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=None, help="0 runs in this process")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    teams = {name: create_team(name) for name in (f"Club {i + 1}" for i in range(args.clubs))}
+    rounds = round_robin(teams)
+    for pairs in rounds[:args.played]:
+        for home, away in pairs:
+            result, _, _ = Match(teams[home], teams[away]).simulate()
+            # Match only records the home side; mirror it for the away club
+            if result == "Victory":
+                teams[away].losses += 1
+            elif result == "Defeat":
+                teams[away].wins += 1
+            else:
+                teams[away].draws += 1
+    remaining = [fixture for pairs in rounds[args.played:] for fixture in pairs]
+
+    forecaster = SeasonForecaster(list(teams.values()), remaining, runs=args.runs,
+                                  batch_size=args.batch, workers=args.workers)
+    for forecast in forecaster.stream(args.seed):
+        leader = max(forecast.clubs, key=lambda c: c.title.p)
+        print(f"{forecast.runs:>7} runs: favourite {leader.name} "
+              f"{leader.title.p:.1%} ({leader.title.low:.1%}-{leader.title.high:.1%})")
+
+    print(f"\n{'Club':<12} {'Pts':>4} {'Title':>7} {'Top 4':>7} {'Releg.':>7}")
+    table = sorted(zip(forecaster.teams, forecast.clubs),
+                   key=lambda tc: sum(i * odds.p for i, odds in enumerate(tc[1].positions)))
+    for team, odds in table:
+        print(f"{odds.name:<12} {3 * team.wins + team.draws:>4} {odds.title.p:>7.1%} "
+              f"{odds.top_four.p:>7.1%} {odds.relegation.p:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+game_calendar.py
+Game calendar module for Football Manager Simulator
+Future events (injury returns, contract expiries, fixtures...) in a priority queue by week
+"""
+
+import heapq
+import logging
+from collections import namedtuple
+from itertools import count
+
+
+# A scheduled event. data must be JSON-serializable for saving.
+Event = namedtuple('Event', ['week', 'kind', 'data', 'seq'])
+
+logger = logging.getLogger(__name__)
+
+
+class GameCalendar:
+    """
+    Discrete-event calendar keyed by week
+
+    Events sit in a heap ordered by (week, insertion order), so a tick only
+    touches the events that are due: the cost of a week grows with the
+    number of due events, not with the number of players or features.
+    Handlers are registered per event kind and may schedule new events
+    (e.g. the next occurrence of a recurring one). An event whose kind has
+    no handler stays scheduled and runs once a handler is registered.
+
+    Attributes:
+        week (int): Current week
+    """
+
+    def __init__(self, week=1):
+        """
+        Initialize an empty calendar
+
+        Args:
+            week (int): Current week
+        """
+        self.week = week
+        self._queue = []
+        self._seq = count()
+        # Sequence numbers of events still to run
+        self._live = set()
+        self._handlers = {}
+        # Sequence numbers of unhandled events already warned about
+        self._warned = set()
+
+    def on(self, kind, handler):
+        """
+        Register the handler for an event kind
+
+        Args:
+            kind (str): Event kind
+            handler (callable): handler(event, calendar), called when it is due
+        """
+        self._handlers[kind] = handler
+
+    def schedule(self, week, kind, **data):
+        """
+        Schedule an event
+
+        Args:
+            week (int): Week the event is due (past weeks run at the next tick)
+            kind (str): Event kind
+            **data: Event data (e.g. player_id=12)
+
+        Returns:
+            Event: The event, usable with cancel()
+        """
+        event = Event(week, kind, data, next(self._seq))
+        self._live.add(event.seq)
+        heapq.heappush(self._queue, (event.week, event.seq, event))
+        return event
+
+    def schedule_in(self, weeks, kind, **data):
+        """
+        Schedule an event a number of weeks from now
+
+        Args:
+            weeks (int): Weeks from the current week
+            kind (str): Event kind
+            **data: Event data
+
+        Returns:
+            Event: The event
+        """
+        return self.schedule(self.week + weeks, kind, **data)
+
+    def cancel(self, event):
+        """
+        Cancel a scheduled event (it is dropped when it comes due)
+
+        Args:
+            event (Event): Event returned by schedule()
+        """
+        self._live.discard(event.seq)
+        self._warned.discard(event.seq)
+
+    def tick(self):
+        """
+        Move to the next week and run every event now due
+
+        Returns:
+            list: Events that ran, in order
+        """
+        self.week += 1
+        return self.run_due()
+
+    def run_due(self):
+        """
+        Run every event due by the current week
+
+        Events scheduled by handlers for the current week run in the same
+        call. Events with no handler for their kind are kept (with a
+        warning the first time) and run at a later call once one is
+        registered.
+
+        Returns:
+            list: Events that ran, in order
+        """
+        ran = []
+        unhandled = []
+        while self._queue and self._queue[0][0] <= self.week:
+            entry = heapq.heappop(self._queue)
+            event = entry[2]
+            if event.seq not in self._live:
+                continue
+            handler = self._handlers.get(event.kind)
+            if handler is None:
+                if event.seq not in self._warned:
+                    self._warned.add(event.seq)
+                    logger.warning("No handler for calendar event %r due week %d; kept scheduled",
+                                   event.kind, event.week)
+                unhandled.append(entry)
+                continue
+            self._live.discard(event.seq)
+            self._warned.discard(event.seq)
+            handler(event, self)
+            ran.append(event)
+        for entry in unhandled:
+            heapq.heappush(self._queue, entry)
+        return ran
+
+    def upcoming(self, limit=10):
+        """
+        Get the next scheduled events without running them
+
+        Args:
+            limit (int): Most events to return
+
+        Returns:
+            list: Events in due order
+        """
+        live = (entry[2] for entry in self._queue if entry[2].seq in self._live)
+        return heapq.nsmallest(limit, live, key=lambda e: (e.week, e.seq))
+
+    def __len__(self):
+        return len(self._live)
+
+    def to_dict(self):
+        """
+        Convert the calendar to a dictionary for saving (handlers are not saved)
+
+        Returns:
+            dict: Calendar data
+        """
+        events = sorted(
+            (entry[2] for entry in self._queue if entry[2].seq in self._live),
+            key=lambda e: (e.week, e.seq)
+        )
+        return {
+            'week': self.week,
+            'events': [{'week': e.week, 'kind': e.kind, 'data': e.data} for e in events],
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """
+        Create a calendar from dictionary data
+
+        Register the handlers again with on() after loading.
+
+        Args:
+            data (dict): Calendar data
+
+        Returns:
+            GameCalendar: New calendar
+        """
+        calendar = GameCalendar(data['week'])
+        for entry in data['events']:
+            calendar.schedule(entry['week'], entry['kind'], **entry['data'])
+        return calendar
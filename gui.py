@@ -5,24 +5,40 @@ Handles all user interface and interactions
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, simpledialog
 import os
-from datetime import datetime
+import time
+from collections import deque
 
-from PIL import Image, ImageTk
-
-from team import Team
-from match import Match
+from history import MatchHistory
+from crest import CrestRenderer
+from activity_log import ActivityLog
+from registry import PlayerRegistry, MARKET
+from session import create_team, play_match, advance_week, buy_player
+from session_trace import TraceRecorder
+from game_calendar import GameCalendar
+from finance import PendingTransfer, project_cash_flow, weeks_to_insolvency
+from valuation import default_valuation
 from utils import (
-    generate_initial_squad,
     generate_transfer_market,
     calculate_transfer_fee,
-    save_game,
     load_game,
-    format_currency,
-    create_random_player
+    save_game_to_slot,
+    load_game_from_slot,
+    list_save_slots,
+    format_currency
 )
 
+# Target time from launch to the main window being drawn (seconds)
+STARTUP_PAINT_BUDGET = 0.5
+
+# Most messages kept in the on-screen game log
+LOG_MAX_LINES = 500
+
+# Width of the action panel not available to the crest: its padding (10px
+# each side) and the LabelFrame border
+BADGE_PANEL_MARGIN = 24
+
 
 class FootballManagerGUI:
     """
@@ -42,18 +58,80 @@ class FootballManagerGUI:
         self.root.resizable(True, True)
         self.root.minsize(1100, 720)
 
-        # Game data
-        self.team = None
-        self.available_players = generate_transfer_market()
+        self._start_time = time.perf_counter()
+        self.startup_timings = {}
         
-        # Create interface
+        # Game data (the transfer market is generated on first use)
+        self.team = None
+        self._available_players = None
+        # Scheduled future events, saved with the game
+        self.calendar = GameCalendar()
+        # Treeview rows are keyed by player id and resolved through the registry
+        self.registry = PlayerRegistry()
+        self.history = MatchHistory()
+        self.activity_log = ActivityLog(max_lines=LOG_MAX_LINES)
+        # Start mark of each message in the log widget, oldest first
+        self._log_marks = deque()
+        self._log_seq = 0
+        
+        # Session traces are recorded when FM_TRACE_DIR is set
+        trace_dir = os.environ.get('FM_TRACE_DIR')
+        self.recorder = None
+        if trace_dir:
+            self.recorder = TraceRecorder(trace_dir)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Create the main window; secondary panels follow once it is shown
+        self._panels_built = False
         self.create_widgets()
+        self._mark_startup('widgets')
+        self.root.after_idle(self._finish_startup)
+    
+    @property
+    def available_players(self):
+        """list: Transfer market players, generated on first use"""
+        if self._available_players is None:
+            self._available_players = generate_transfer_market()
+        return self._available_players
+    
+    @available_players.setter
+    def available_players(self, players):
+        self._available_players = players
+    
+    def _mark_startup(self, stage):
+        """
+        Record the time since launch for a startup stage
+        
+        Args:
+            stage (str): Stage name
+        """
+        self.startup_timings[stage] = time.perf_counter() - self._start_time
+    
+    def _finish_startup(self):
+        """Build the remaining panels after first paint, then offer to load a save"""
+        self.root.update_idletasks()
+        self._mark_startup('first_paint')
+        self.create_secondary_panels()
+        self._mark_startup('panels')
+        self.log(self.startup_report())
+        if self.startup_timings['first_paint'] > STARTUP_PAINT_BUDGET:
+            self.log(f"⚠️ Startup exceeded first-paint budget of {STARTUP_PAINT_BUDGET * 1000:.0f} ms")
         
         # Try to load existing save
         self.try_load_game()
     
+    def startup_report(self):
+        """
+        Format the startup stage timings
+        
+        Returns:
+            str: One-line report in milliseconds
+        """
+        stages = ", ".join(f"{stage} {t * 1000:.0f} ms" for stage, t in self.startup_timings.items())
+        return f"⏱️ Startup: {stages}"
+    
     def create_widgets(self):
-        """Create all GUI widgets"""
+        """Create the widgets needed for the first paint"""
         # Header
         self.create_header()
         
@@ -69,14 +147,20 @@ class FootballManagerGUI:
         self.main_frame.grid_rowconfigure(0, weight=1)
         self.main_frame.grid_columnconfigure(0, minsize=250)
         
-        # Three main panels
-        self.create_team_panel()
+        # Squad panel first; statistics and actions are built at idle time
         self.create_player_panel()
-        self.create_action_panel()
         
         # Bottom log
         self.create_log_panel()
     
+    def create_secondary_panels(self):
+        """Create the statistics and action panels (once)"""
+        if self._panels_built:
+            return
+        self._panels_built = True
+        self.create_team_panel()
+        self.create_action_panel()
+    
     def create_header(self):
         """Create top header bar"""
         header = ttk.Frame(self.root, relief='raised', borderwidth=2)
@@ -215,6 +299,8 @@ class FootballManagerGUI:
         # Club badge canvas
 
         try:
+            # Pillow is only needed for the logo, so load it here rather than at startup
+            from PIL import Image, ImageTk
             img = Image.open("club_logo.png")  # 你的图片名
             img = img.resize((130, 130), Image.LANCZOS)  # 调整大小，让它合适
             self.club_logo_img = ImageTk.PhotoImage(img)  # 必须存成属性，否则会被Python回收
@@ -225,6 +311,14 @@ class FootballManagerGUI:
         except Exception as e:
             logo_label = tk.Label(action_frame, text="[No Logo]", bg='#E6F2FF')
             logo_label.pack(pady=5)
+        
+        # Club crest with the club name
+        self.crest_renderer = CrestRenderer(self.root)
+        self._badge_size = 130
+        self.badge_label = tk.Label(action_frame, bg='#E6F2FF')
+        self.badge_label.pack(pady=5)
+        action_frame.bind('<Configure>', self._draw_badge)
+        self._draw_badge()
     
     def create_log_panel(self):
         """Create bottom log panel"""
@@ -241,93 +335,32 @@ class FootballManagerGUI:
         
         self.log("Welcome to Football Manager Simulator! Click 'New Game' to start.")
 
-    def _draw_badge(self):
-        """Draw a club crest with a football and dynamic club name."""
-        c = self.badge_canvas
-        c.delete('all')
-
-        # 读取俱乐部名字（未创建时给占位）
+    def _draw_badge(self, event=None):
+        """Show the club crest, sized to the action panel (cached per club and size)."""
+        if not hasattr(self, 'badge_label'):
+            return
         club_name = self.team.name if getattr(self, "team", None) else "My Club"
-        club_name = club_name.strip() or "My Club"
-
-        W, H = int(c['width']), int(c['height'])
-
-        # ---------- 盾牌外形 ----------
-        # 外轮廓（深色边）
-        shield_outer = [
-            (W * 0.5, H * 0.05),  # 顶点
-            (W * 0.90, H * 0.22),
-            (W * 0.85, H * 0.65),
-            (W * 0.50, H * 0.95),
-            (W * 0.15, H * 0.65),
-            (W * 0.10, H * 0.22),
-        ]
-        # 内层（浅色填充）
-        shield_inner = [(x, y + 2) for (x, y) in shield_outer]  # 稍微下移防止描边重合
-
-        def poly(points, **kw):
-            flat = [v for xy in points for v in xy]
-            return c.create_polygon(flat, **kw)
-
-        poly(shield_outer, fill='#1E3A8A', outline='#0B1F4B', width=3, smooth=True)
-        poly(shield_inner, fill='#3B82F6', outline='', smooth=True)
-
-        # ---------- 足球图案（居中偏上） ----------
-        cx, cy, r = W * 0.50, H * 0.38, min(W, H) * 0.20
-        c.create_oval(cx - r, cy - r, cx + r, cy + r, fill='white', outline='black', width=3)
-
-        # 中心五边形
-        pent = [
-            (cx, cy - r * 0.55),
-            (cx + r * 0.43, cy - r * 0.18),
-            (cx + r * 0.27, cy + r * 0.50),
-            (cx - r * 0.27, cy + r * 0.50),
-            (cx - r * 0.43, cy - r * 0.18),
-        ]
-        poly(pent, fill='black', outline='black')
-
-        # 邻接白色多边形（简单蜂窝效果）
-        patches = [
-            [(cx, cy - r * 0.55), (cx + r * 0.35, cy - r * 0.55), (cx + r * 0.60, cy - r * 0.10),
-             (cx + r * 0.43, cy - r * 0.18)],
-            [(cx + r * 0.43, cy - r * 0.18), (cx + r * 0.60, cy - r * 0.10), (cx + r * 0.45, cy + r * 0.55),
-             (cx + r * 0.27, cy + r * 0.50)],
-            [(cx - r * 0.27, cy + r * 0.50), (cx + r * 0.27, cy + r * 0.50), (cx, cy + r * 0.80),
-             (cx - r * 0.00, cy + r * 0.80)],
-            [(cx - r * 0.43, cy - r * 0.18), (cx - r * 0.60, cy - r * 0.10), (cx - r * 0.45, cy + r * 0.55),
-             (cx - r * 0.27, cy + r * 0.50)],
-            [(cx, cy - r * 0.55), (cx - r * 0.35, cy - r * 0.55), (cx - r * 0.60, cy - r * 0.10),
-             (cx - r * 0.43, cy - r * 0.18)],
-        ]
-        for p in patches:
-            poly(p, fill='white', outline='black', width=2)
-
-        # ---------- 丝带（放名字） ----------
-        band_top = H * 0.62
-        c.create_rectangle(W * 0.16, band_top, W * 0.84, band_top + 26, fill='#F8FAFF', outline='#0B1F4B', width=2)
-        c.create_arc(W * 0.12, band_top - 4, W * 0.30, band_top + 28, start=90, extent=180, style='pieslice',
-                     fill='#F8FAFF', outline='#0B1F4B', width=2)
-        c.create_arc(W * 0.70, band_top - 4, W * 0.88, band_top + 28, start=-90, extent=180, style='pieslice',
-                     fill='#F8FAFF', outline='#0B1F4B', width=2)
-
-        # ---------- 队名文字（根据长度自适应缩放） ----------
-        text_size = self._fit_font_for_badge(club_name, max_size=16, min_size=9, max_width=W * 0.60)
-        c.create_text(W * 0.50, band_top + 13, text=club_name.upper(), font=('Helvetica', text_size, 'bold'),
-                      fill='#0B1F4B')
-
-    def _fit_font_for_badge(self, text, max_size=16, min_size=9, max_width=110):
-        """Return a font size that makes 'text' fit within max_width on the badge."""
-
-        # 简单按字符数估算宽度（Tk不直接量字符串宽度，这里用经验系数）
-        # 你也可以改成用 tkinter.font.Font 测量精确宽度
-        def width_estimate(size):
-            # 粗略估计：英文大写约等宽，每个字符 ~0.6*size 像素
-            return len(text) * (0.60 * size)
-
-        size = max_size
-        while size > min_size and width_estimate(size) > max_width:
-            size -= 1
-        return max(size, min_size)
+        if event is not None:
+            # Fit the whole label (image plus its border) inside the panel's
+            # current width, so a new crest never widens the panel and sets
+            # off another <Configure>. Snap to 10px steps so small resizes
+            # reuse a cached crest, and skip redraws that change nothing.
+            # Tk 8.6 returns these options as Tcl_Obj screen distances
+            label = self.badge_label
+            border = 2 * sum(
+                label.winfo_pixels(label.cget(option))
+                for option in ('bd', 'highlightthickness', 'padx')
+            )
+            width = event.width - BADGE_PANEL_MARGIN - border
+            size = max(80, min(160, width // 10 * 10))
+            if size == self._badge_size and str(label.cget('image')):
+                return
+            self._badge_size = size
+        image = self.crest_renderer.get(club_name, self._badge_size)
+        if image is not None:
+            self.badge_label.config(image=image, text='')
+        else:
+            self.badge_label.config(image='', text=club_name)
 
     # ==================== Game Logic Methods ====================
     
@@ -352,11 +385,11 @@ class FootballManagerGUI:
         def create():
             name = name_entry.get().strip()
             if name:
-                self.team = Team(name, budget=50000000)  # £50 million
-                
-                # Generate squad
-                for player in generate_initial_squad():
-                    self.team.add_player(player)
+                self.team = create_team(name)
+                self.calendar = GameCalendar(self.team.week)
+                self.registry.clear()
+                self.registry.register_team(self.team)
+                self._start_trace()
                 
                 self.update_display()
                 self.log(f"✅ Created club: {name}! Starting budget: {format_currency(self.team.budget)}")
@@ -377,9 +410,9 @@ class FootballManagerGUI:
             messagebox.showwarning("Warning", "Please select a player!")
             return
         
-        index = self.player_tree.index(selected[0])
-        player = self.team.players[index]
+        player = self.registry.get(int(selected[0]))
         
+        self._trace('train', player_id=player.player_id)
         improvement = player.train()
         if improvement > 0:
             self.log(f"🏋️ {player.name} improved by +{improvement} OVR through training!")
@@ -398,8 +431,8 @@ class FootballManagerGUI:
             messagebox.showwarning("Warning", "Please select a player!")
             return
         
-        index = self.player_tree.index(selected[0])
-        player = self.team.players[index]
+        player = self.registry.get(int(selected[0]))
+        self._trace('rest', player_id=player.player_id)
         player.rest()
         
         self.log(f"😴 {player.name} rested and recovered stamina and morale.")
@@ -415,30 +448,14 @@ class FootballManagerGUI:
             messagebox.showwarning("Warning", "You need at least 11 players to play a match!")
             return
         
-        # Create opponent
-        opponent = Team("Opponent FC", 30000000)
-        positions = ['GK', 'DEF', 'DEF', 'DEF', 'DEF', 'MID', 'MID', 'MID', 'FWD', 'FWD', 'FWD']
-        for pos in positions:
-            opponent.add_player(create_random_player(pos, True))
-        
-        # Simulate match
-        match = Match(self.team, opponent)
-        result, home_score, away_score = match.simulate()
-        
-        # Prize money
-        if result == "Victory":
-            prize = 1000000
-            self.team.budget += prize
-            self.team.reputation = min(100, self.team.reputation + 2)
-            emoji = "🎉"
-        elif result == "Draw":
-            prize = 300000
-            self.team.budget += prize
-            emoji = "😐"
-        else:
-            prize = 0
-            self.team.reputation = max(1, self.team.reputation - 1)
-            emoji = "😢"
+        # Simulate match against a random opponent (prize money included)
+        self._trace('play_match')
+        match, result, prize = play_match(self.team)
+        opponent = match.away_team
+        home_score, away_score = match.home_score, match.away_score
+        self.history.record(match, self.team.week)
+        
+        emoji = {"Victory": "🎉", "Draw": "😐"}.get(result, "😢")
         
         self.log(f"{emoji} Match {result}! {self.team.name} {home_score} - {away_score} {opponent.name}")
         if prize > 0:
@@ -457,10 +474,9 @@ class FootballManagerGUI:
             messagebox.showwarning("Warning", "Please create a club first!")
             return
         
-        self.team.week += 1
-        
-        # Pay salaries
-        success, total = self.team.pay_salaries()
+        # Pay salaries, then recover players
+        self._trace('advance_week')
+        success, total = advance_week(self.team, calendar=self.calendar)
         if success:
             self.log(f"💸 Week {self.team.week}: Paid salaries {format_currency(total)}")
         else:
@@ -468,12 +484,6 @@ class FootballManagerGUI:
             messagebox.showwarning("Game Over", "Insufficient budget to pay salaries! Game Over!")
             return
         
-        # Recover players
-        import random
-        for player in self.team.players:
-            player.stamina = min(100, player.stamina + 10)
-            player.form = max(50, min(95, player.form + random.randint(-5, 5)))
-        
         self.update_display()
     
     def open_transfer_market(self):
@@ -493,6 +503,10 @@ class FootballManagerGUI:
             font=('Arial', 14, 'bold')
         ).pack(pady=10)
         
+        # Name search (typo-tolerant, filters as you type)
+        search_var = tk.StringVar()
+        ttk.Entry(market_window, textvariable=search_var, width=40).pack(pady=2)
+        
         # Player list
         columns = ('Name', 'Pos', 'OVR', 'Age', 'Transfer Fee', 'Salary')
         tree = ttk.Treeview(market_window, columns=columns, show='headings', height=15)
@@ -503,10 +517,11 @@ class FootballManagerGUI:
         
         tree.pack(fill='both', expand=True, padx=10, pady=5)
         
-        # Fill data
-        for player in self.available_players:
-            fee = calculate_transfer_fee(player)
-            tree.insert('', 'end', values=(
+        # Fill data (prices come from the shared valuation cache in one pass)
+        players = self.available_players
+        for player, fee in zip(players, default_valuation.value_many(players)):
+            self.registry.register(player)
+            tree.insert('', 'end', iid=str(player.player_id), values=(
                 player.name,
                 player.position,
                 player.overall,
@@ -515,33 +530,65 @@ class FootballManagerGUI:
                 format_currency(player.salary)
             ))
         
+        all_rows = list(tree.get_children())
+        
+        def filter_rows(*_):
+            query = search_var.get().strip()
+            tree.detach(*tree.get_children())
+            if not query:
+                rows = all_rows
+            else:
+                hits = self.registry.search(query, club=MARKET, limit=len(all_rows))
+                rows = [str(hit.player_id) for hit in hits if tree.exists(str(hit.player_id))]
+            for position, iid in enumerate(rows):
+                tree.move(iid, '', position)
+        
+        search_var.trace_add('write', filter_rows)
+        
+        # Season cash-flow outlook if the selected player were signed now
+        outlook_label = ttk.Label(market_window, text="", font=('Arial', 10))
+        outlook_label.pack(pady=2)
+        
+        def show_outlook(event=None):
+            selected = tree.selection()
+            if not selected:
+                outlook_label.config(text="")
+                return
+            player = self.registry.get(int(selected[0]))
+            signing = PendingTransfer(self.team.week, calculate_transfer_fee(player), player.salary)
+            outlook = weeks_to_insolvency(project_cash_flow(self.team, pending=[signing]))
+            if outlook['median'] is None:
+                text = f"📈 If signed: {outlook['survival']:.0%} chance of paying wages all season"
+            else:
+                text = f"⚠️ If signed: likely unable to pay wages by week {outlook['median']}"
+            outlook_label.config(text=text)
+        
+        tree.bind('<<TreeviewSelect>>', show_outlook)
+        
         def buy_player():
             selected = tree.selection()
             if not selected:
                 messagebox.showwarning("Warning", "Please select a player!")
                 return
             
-            index = tree.index(selected[0])
-            player = self.available_players[index]
-            fee = calculate_transfer_fee(player)
+            player = self.registry.get(int(selected[0]))
             
-            if self.team.budget < fee:
+            self._trace('buy', player_id=player.player_id)
+            success, reason, fee = buy_player(self.team, self.available_players, player, self.registry)
+            if reason == "budget":
                 messagebox.showwarning(
                     "Insufficient Budget",
                     f"Need {format_currency(fee)}, but you only have {format_currency(self.team.budget)}"
                 )
                 return
             
-            if len(self.team.players) >= 25:
+            if reason == "squad_full":
                 messagebox.showwarning("Squad Full", "Your squad already has 25 players!")
                 return
             
-            self.team.budget -= fee
-            self.team.add_player(player)
-            self.available_players.remove(player)
-            
             self.log(f"✅ Signed {player.name} for {format_currency(fee)}")
             self.update_display()
+            all_rows.remove(selected[0])
             tree.delete(selected[0])
             messagebox.showinfo("Success", f"Successfully signed {player.name}!")
         
@@ -552,35 +599,108 @@ class FootballManagerGUI:
         ).pack(pady=10)
     
     def save_game(self):
-        """Save current game"""
+        """Save current game to a named slot"""
         if not self.team:
             messagebox.showwarning("Warning", "No game to save!")
             return
         
-        if save_game(self.team, self.available_players):
-            self.log("💾 Game saved successfully!")
+        slot = simpledialog.askstring(
+            "Save Game",
+            "Save slot name:",
+            initialvalue=self.team.name,
+            parent=self.root
+        )
+        if not slot or not slot.strip():
+            return
+        slot = slot.strip()
+        
+        # Saving is a checkpoint for match history too (it is batched otherwise)
+        self.history.flush()
+        if save_game_to_slot(self.team, self.available_players, slot, calendar=self.calendar):
+            self.log(f"💾 Game saved to slot '{slot}'!")
             messagebox.showinfo("Success", "Game saved!")
         else:
             messagebox.showerror("Error", "Failed to save game!")
     
     def load_game(self):
-        """Load saved game"""
-        team, players, timestamp = load_game()
+        """Show the save slots and load the chosen one"""
+        slots = list_save_slots()
+        if not slots:
+            # Fall back to the single save file used by older versions
+            self._load_from(*load_game(with_calendar=True))
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("📂 Load Game")
+        dialog.geometry("700x350")
+        dialog.transient(self.root)
+        
+        columns = ('Slot', 'Club', 'Week', 'Record', 'Budget', 'Saved')
+        tree = ttk.Treeview(dialog, columns=columns, show='headings', height=10)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=110)
+        tree.pack(fill='both', expand=True, padx=10, pady=5)
         
+        # Only the slot index is read here; no save file is opened
+        for slot, meta in slots:
+            tree.insert('', 'end', iid=slot, values=(
+                slot,
+                meta.get('club', ''),
+                meta.get('week', ''),
+                meta.get('record', ''),
+                format_currency(meta.get('budget', 0)),
+                meta.get('timestamp', '')
+            ))
+        
+        def load_selected():
+            selected = tree.selection()
+            if not selected:
+                messagebox.showwarning("Warning", "Please select a save slot!")
+                return
+            dialog.destroy()
+            self._load_from(*load_game_from_slot(selected[0], lazy_market=True, with_calendar=True))
+        
+        ttk.Button(dialog, text="📂 Load Selected", command=load_selected).pack(pady=10)
+    
+    def _load_from(self, team, players, timestamp, calendar):
+        """
+        Switch to a loaded game
+        
+        Args:
+            team (Team): Loaded team (None if loading failed)
+            players (list): Loaded transfer market
+            timestamp (str): Time the game was saved
+            calendar (GameCalendar): Loaded calendar
+        """
         if team is None:
             messagebox.showinfo("Info", "No saved game found!")
             return
         
         self.team = team
         self.available_players = players
+        self.calendar = calendar
+        self.registry.clear()
+        self.registry.register_team(team)
+        self._start_trace()
         
         self.log(f"📂 Game loaded successfully! Last saved: {timestamp}")
         self.update_display()
         messagebox.showinfo("Success", "Game loaded!")
     
     def try_load_game(self):
-        """Try to load game on startup"""
-        if os.path.exists('football_manager_save.json'):
+        """Try to load the most recent save on startup"""
+        slots = list_save_slots()
+        if slots:
+            slot, meta = slots[0]
+            response = messagebox.askyesno(
+                "Save Found",
+                f"Continue {meta.get('club', slot)} (week {meta.get('week', '?')}) "
+                f"from slot '{slot}'?"
+            )
+            if response:
+                self._load_from(*load_game_from_slot(slot, lazy_market=True, with_calendar=True))
+        elif os.path.exists('football_manager_save.json'):
             response = messagebox.askyesno(
                 "Save Found",
                 "Found a saved game. Continue from save?"
@@ -594,9 +714,11 @@ class FootballManagerGUI:
         """Update all displays"""
         if not self.team:
             return
+        self.create_secondary_panels()
         
         # Update header
         self.club_label.config(text=f"🏆 {self.team.name}")
+        self._draw_badge()
         self.info_label.config(
             text=f"💰 Budget: {format_currency(self.team.budget)} | 📅 Week {self.team.week} | ⭐ Reputation: {self.team.reputation}"
         )
@@ -645,7 +767,7 @@ class FootballManagerGUI:
         # Update player list
         self.player_tree.delete(*self.player_tree.get_children())
         for player in self.team.players:
-            self.player_tree.insert('', 'end', values=(
+            self.player_tree.insert('', 'end', iid=str(player.player_id), values=(
                 player.name,
                 player.position,
                 player.overall,
@@ -656,10 +778,62 @@ class FootballManagerGUI:
             ))
     
     def log(self, message):
-        """Add message to log"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert('1.0', f"[{timestamp}] {message}\n", "log_spacing")
+        """Add message to log (shown at the next idle moment, in one batch)"""
+        if self.activity_log.add(message):
+            self.root.after_idle(self._flush_log)
+    
+    def _flush_log(self):
+        """Insert pending log messages, newest first, and trim to the log cap"""
+        batch = self.activity_log.drain()
+        if not batch:
+            return
+        text = "".join(f"{line}\n" for line in reversed(batch))
+        self.log_text.insert('1.0', text, "log_spacing")
+        
+        # Mark where each new message starts (newest is on top). Marks move
+        # with the text, so the log can be trimmed by message rather than by
+        # line, which matters for messages that span several lines.
+        row = 1
+        marks = []
+        for line in reversed(batch):
+            mark = f"log_message_{self._log_seq}"
+            self._log_seq += 1
+            self.log_text.mark_set(mark, f"{row}.0")
+            marks.append(mark)
+            row += line.count('\n') + 1
+        self._log_marks.extend(reversed(marks))
+        if len(self._log_marks) > self.activity_log.max_lines:
+            # _log_marks is oldest first; drop everything from the newest
+            # message that no longer fits down to the end
+            dropped = len(self._log_marks) - self.activity_log.max_lines
+            self.log_text.delete(self._log_marks[dropped - 1], tk.END)
+            for _ in range(dropped):
+                self.log_text.mark_unset(self._log_marks.popleft())
         self.log_text.see('1.0')
+    
+    def _start_trace(self):
+        """Start recording a session trace from the current game (if tracing is on)"""
+        if self.recorder:
+            self.recorder.start(self.team, self.available_players)
+    
+    def _trace(self, action, **args):
+        """
+        Record an action in the session trace (if tracing is on)
+        
+        Args:
+            action (str): Action name
+            **args: Action arguments
+        """
+        if self.recorder:
+            self.recorder.record(action, **args)
+    
+    def on_close(self):
+        """Write out pending history, log messages and trace, then close the window"""
+        if self.recorder and self.team:
+            self.recorder.finish(self.team, self.available_players)
+        self.history.close()
+        self.activity_log.close()
+        self.root.destroy()
 
 
 def main():
@@ -0,0 +1,315 @@
+"""
+gui_benchmark.py
+GUI latency benchmark for Football Manager Simulator
+Drives FootballManagerGUI without a user and reports callback latency percentiles
+
+Message boxes and dialogs are stubbed out and the game runs in a temporary
+directory, so nothing is written next to real saves. Without a display the
+benchmark starts a virtual X server (Xvfb) if one is installed:
+    python gui_benchmark.py --squad-sizes 18,25 --market-sizes 20,5000
+Exits with status 1 if any callback's p95 latency is over its budget or any
+Tk callback (including <Configure> handlers) raises.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import traceback
+import tkinter as tk
+from contextlib import contextmanager
+from tkinter import ttk, messagebox, simpledialog
+
+from gui import FootballManagerGUI
+from team import MAX_SQUAD_SIZE
+from utils import create_random_player, generate_transfer_market, percentile
+
+
+# p95 latency budgets per callback in milliseconds (including the repaint)
+DEFAULT_BUDGETS_MS = {
+    'new_game': 200,
+    'train_player': 50,
+    'rest_player': 50,
+    'play_match': 100,
+    'advance_week': 50,
+    'open_transfer_market': 500,
+    'resize': 100,
+    'update_display': 50,
+    '_draw_badge': 20,
+}
+
+# Methods timed whenever they run, including when other callbacks call them
+INNER_METHODS = ('update_display', '_draw_badge')
+
+# Window widths the resize step alternates between
+RESIZE_WIDTHS = (1300, 1600)
+
+
+@contextmanager
+def virtual_display(width=1600, height=1000):
+    """
+    Make sure Tk has a display, starting Xvfb if there is none
+
+    Args:
+        width (int): Virtual screen width
+        height (int): Virtual screen height
+
+    Yields:
+        str: The DISPLAY in use
+    """
+    if os.environ.get('DISPLAY'):
+        yield os.environ['DISPLAY']
+        return
+    if shutil.which('Xvfb') is None:
+        raise SystemExit("No DISPLAY and Xvfb is not installed; cannot run the GUI benchmark")
+    display = f":{90 + os.getpid() % 100}"
+    server = subprocess.Popen(
+        ['Xvfb', display, '-screen', '0', f"{width}x{height}x24", '-nolisten', 'tcp'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.environ['DISPLAY'] = display
+    try:
+        time.sleep(0.5)
+        if server.poll() is not None:
+            raise SystemExit(f"Xvfb failed to start on {display}")
+        yield display
+    finally:
+        del os.environ['DISPLAY']
+        server.terminate()
+        server.wait()
+
+
+def stub_dialogs():
+    """Replace blocking message boxes and prompts with instant answers"""
+    for name in ('showinfo', 'showwarning', 'showerror'):
+        setattr(messagebox, name, lambda *args, **kwargs: 'ok')
+    # Decline the "continue from save?" prompt and any other question
+    messagebox.askyesno = lambda *args, **kwargs: False
+    simpledialog.askstring = lambda *args, **kwargs: None
+
+
+class GuiBenchmark:
+    """
+    One benchmark scenario: a GUI with a given squad and market size
+
+    Attributes:
+        squad_size (int): Players in the manager's squad
+        market_size (int): Players on the transfer market
+        samples (dict): Callback name -> latencies in seconds
+        errors (list): Tracebacks of exceptions raised in Tk callbacks
+    """
+
+    def __init__(self, squad_size=18, market_size=20, seed=0):
+        """
+        Initialize the scenario
+
+        Args:
+            squad_size (int): Players in the squad (padded past the usual 18
+                if larger, up to MAX_SQUAD_SIZE)
+            market_size (int): Players on the transfer market
+            seed (int): Random seed for the game and the scripted choices
+        """
+        if squad_size > MAX_SQUAD_SIZE:
+            raise ValueError(f"Squads hold at most {MAX_SQUAD_SIZE} players")
+        self.squad_size = squad_size
+        self.market_size = market_size
+        self.seed = seed
+        self.samples = {}
+        self.errors = []
+
+    def _record(self, name, seconds):
+        """Store one latency sample"""
+        self.samples.setdefault(name, []).append(seconds)
+
+    def _instrument(self, app):
+        """Time the inner methods every time they run"""
+        for name in INNER_METHODS:
+            original = getattr(app, name)
+
+            def timed(*args, _original=original, _name=name, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return _original(*args, **kwargs)
+                finally:
+                    self._record(_name, time.perf_counter() - start)
+
+            setattr(app, name, timed)
+        # The crest's <Configure> binding was made before the wrapper existed
+        app.badge_label.master.bind('<Configure>', app._draw_badge)
+
+    def _report_callback_exception(self, exc, value, tb):
+        """Keep exceptions Tk would only print, so the run fails on them"""
+        self.errors.append(''.join(traceback.format_exception(exc, value, tb)))
+
+    def _measure(self, root, name, callback):
+        """Run a callback and the repaint it causes, and time both"""
+        start = time.perf_counter()
+        callback()
+        root.update()
+        self._record(name, time.perf_counter() - start)
+
+    @staticmethod
+    def _newest_toplevel(root):
+        """The most recently opened dialog window"""
+        windows = [w for w in root.winfo_children() if isinstance(w, tk.Toplevel)]
+        return windows[-1] if windows else None
+
+    def _create_club(self, app, root):
+        """Open the new game dialog and press Create"""
+        app.new_game()
+        dialog = self._newest_toplevel(root)
+        for widget in dialog.winfo_children():
+            if isinstance(widget, ttk.Button) and widget.cget('text') == "Create":
+                widget.invoke()
+                return
+        raise RuntimeError("Create button not found in the new game dialog")
+
+    def run(self, iterations=30):
+        """
+        Script a session and collect latencies
+
+        Args:
+            iterations (int): Rounds of resize / train / rest / match / week / market
+
+        Returns:
+            dict: Callback name -> latencies in seconds
+        """
+        random.seed(self.seed)
+        rng = random.Random(self.seed)
+        root = tk.Tk()
+        root.report_callback_exception = self._report_callback_exception
+        app = FootballManagerGUI(root)
+        self._instrument(app)
+        root.update()
+
+        self._measure(root, 'new_game', lambda: self._create_club(app, root))
+        app.team.budget = 10 ** 12
+        positions = ['GK', 'DEF', 'MID', 'FWD']
+        while len(app.team.players) < self.squad_size:
+            player = create_random_player(rng.choice(positions))
+            if not app.team.add_player(player):
+                break
+            app.registry.register(player, app.team.name)
+        app.available_players = generate_transfer_market(max(1, self.market_size // 4))
+        app.update_display()
+        root.update()
+
+        for iteration in range(iterations):
+            width = RESIZE_WIDTHS[iteration % len(RESIZE_WIDTHS)]
+            self._measure(root, 'resize', lambda: root.geometry(f"{width}x960"))
+            rows = app.player_tree.get_children()
+            app.player_tree.selection_set(rng.choice(rows))
+            self._measure(root, 'train_player', app.train_player)
+            app.player_tree.selection_set(rng.choice(rows))
+            self._measure(root, 'rest_player', app.rest_player)
+            self._measure(root, 'play_match', app.play_match)
+            self._measure(root, 'advance_week', app.advance_week)
+            self._measure(root, 'open_transfer_market', app.open_transfer_market)
+            self._newest_toplevel(root).destroy()
+
+        app.on_close()
+        return self.samples
+
+
+def summarize(samples):
+    """
+    Latency percentiles per callback
+
+    Args:
+        samples (dict): Callback name -> latencies in seconds
+
+    Returns:
+        dict: Callback name -> {'count', 'p50', 'p95', 'p99', 'max'} in milliseconds
+    """
+    summary = {}
+    for name, values in samples.items():
+        values = sorted(values)
+        summary[name] = {
+            'count': len(values),
+            'p50': percentile(values, 0.50) * 1000,
+            'p95': percentile(values, 0.95) * 1000,
+            'p99': percentile(values, 0.99) * 1000,
+            'max': values[-1] * 1000,
+        }
+    return summary
+
+
+def over_budget(summary, budgets):
+    """
+    Callbacks whose p95 latency is above budget
+
+    Args:
+        summary (dict): Result of summarize()
+        budgets (dict): Callback name -> p95 budget in milliseconds
+
+    Returns:
+        list: (name, p95, budget) for each callback over budget
+    """
+    return [
+        (name, stats['p95'], budgets[name])
+        for name, stats in summary.items()
+        if name in budgets and stats['p95'] > budgets[name]
+    ]
+
+
+def _sizes(text):
+    """Parse a comma-separated list of sizes"""
+    return [int(part) for part in text.split(',') if part.strip()]
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Football Manager GUI latency benchmark")
+    parser.add_argument('--squad-sizes', type=_sizes, default=[18, 25])
+    parser.add_argument('--market-sizes', type=_sizes, default=[20, 2000])
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--budget', action='append', default=[], metavar='CALLBACK=MS',
+                        help="override a p95 budget (repeatable)")
+    args = parser.parse_args()
+    if any(size > MAX_SQUAD_SIZE for size in args.squad_sizes):
+        parser.error(f"--squad-sizes: squads hold at most {MAX_SQUAD_SIZE} players")
+
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for item in args.budget:
+        name, _, value = item.partition('=')
+        budgets[name.strip()] = float(value)
+
+    stub_dialogs()
+    failures = []
+    original_dir = os.getcwd()
+    with virtual_display(), tempfile.TemporaryDirectory() as workdir:
+        os.environ.pop('FM_TRACE_DIR', None)
+        os.chdir(workdir)
+        try:
+            for squad_size in args.squad_sizes:
+                for market_size in args.market_sizes:
+                    bench = GuiBenchmark(squad_size, market_size, args.seed)
+                    summary = summarize(bench.run(args.iterations))
+                    for error in bench.errors:
+                        print(error)
+                        failures.append((squad_size, market_size, 'Tk callback error', None, None))
+                    print(f"\nSquad {squad_size}, market {market_size}:")
+                    print(f"  {'callback':<22} {'n':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+                    for name, stats in sorted(summary.items()):
+                        print(f"  {name:<22} {stats['count']:>4} {stats['p50']:>8.2f} "
+                              f"{stats['p95']:>8.2f} {stats['p99']:>8.2f} {stats['max']:>8.2f}")
+                    for name, p95, budget in over_budget(summary, budgets):
+                        failures.append((squad_size, market_size, name, p95, budget))
+        finally:
+            os.chdir(original_dir)
+
+    for squad_size, market_size, name, p95, budget in failures:
+        if p95 is None:
+            print(f"❌ {name} (squad {squad_size}, market {market_size})")
+        else:
+            print(f"❌ {name} p95 {p95:.2f} ms over budget of {budget:.0f} ms "
+                  f"(squad {squad_size}, market {market_size})")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+history.py
+Match history module for Football Manager Simulator
+Stores every fixture and every scorer/assister in an indexed SQLite database
+"""
+
+import sqlite3
+from datetime import datetime
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fixtures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    week INTEGER NOT NULL,
+    home TEXT NOT NULL,
+    away TEXT NOT NULL,
+    home_score INTEGER NOT NULL,
+    away_score INTEGER NOT NULL,
+    played_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS goal_events (
+    fixture_id INTEGER NOT NULL REFERENCES fixtures(id),
+    team TEXT NOT NULL,
+    player TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('goal', 'assist')),
+    player_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_fixtures_home ON fixtures(home, id);
+CREATE INDEX IF NOT EXISTS idx_fixtures_away ON fixtures(away, id);
+CREATE INDEX IF NOT EXISTS idx_goal_events_fixture ON goal_events(fixture_id);
+"""
+
+# Applied after SCHEMA, once databases from before player ids have been migrated
+INDEXES = """
+DROP INDEX IF EXISTS idx_goal_events_player;
+CREATE INDEX IF NOT EXISTS idx_goal_events_player_id ON goal_events(player_id, kind);
+"""
+
+
+class MatchHistory:
+    """
+    Persistent match history backed by SQLite in WAL mode
+
+    Matches are buffered by record() and written by flush() in a single
+    transaction, which happens automatically every batch_size matches.
+
+    Attributes:
+        path (str): Database file path
+        batch_size (int): Buffered matches that trigger an automatic flush
+    """
+
+    def __init__(self, path='football_manager_history.db', batch_size=100):
+        """
+        Initialize the history store (the database is opened on first use)
+
+        Args:
+            path (str): Database file path
+            batch_size (int): Buffered matches that trigger an automatic flush
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = None
+        self._buffer = []
+
+    @property
+    def conn(self):
+        """sqlite3.Connection: Open connection, created with the schema on first use"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(goal_events)")]
+            if 'player_id' not in columns:
+                # Events recorded before player ids keep a NULL id
+                self._conn.execute("ALTER TABLE goal_events ADD COLUMN player_id INTEGER")
+            self._conn.executescript(INDEXES)
+        return self._conn
+
+    def record(self, match, week=0):
+        """
+        Buffer a finished match
+
+        Args:
+            match (Match): Simulated match
+            week (int): Game week the match was played in
+        """
+        events = []
+        for team, scorer, assister in match.goal_events:
+            if scorer:
+                events.append((team.name, scorer.name, 'goal', scorer.player_id))
+            if assister:
+                events.append((team.name, assister.name, 'assist', assister.player_id))
+        self._buffer.append((
+            (week, match.home_team.name, match.away_team.name, match.home_score,
+             match.away_score, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            events
+        ))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all buffered matches in one transaction
+
+        Returns:
+            int: Number of matches written
+        """
+        if not self._buffer:
+            return 0
+        buffered, self._buffer = self._buffer, []
+        with self.conn:
+            for fixture, events in buffered:
+                cursor = self.conn.execute(
+                    "INSERT INTO fixtures (week, home, away, home_score, away_score, played_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    fixture
+                )
+                self.conn.executemany(
+                    "INSERT INTO goal_events (fixture_id, team, player, kind, player_id) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(cursor.lastrowid,) + event for event in events]
+                )
+        return len(buffered)
+
+    def recent_results(self, team_name, last=5):
+        """
+        Get a team's most recent results, newest first
+
+        Args:
+            team_name (str): Team name
+            last (int): Number of matches
+
+        Returns:
+            list: (opponent: str, goals_for: int, goals_against: int, result: str)
+                with result 'W', 'D' or 'L'
+        """
+        self.flush()
+        rows = self.conn.execute(
+            """
+            SELECT id, away, home_score, away_score FROM (
+                SELECT id, away, home_score, away_score FROM fixtures
+                WHERE home = ? ORDER BY id DESC LIMIT ?
+            )
+            UNION ALL
+            SELECT id, home, away_score, home_score FROM (
+                SELECT id, home, away_score, home_score FROM fixtures
+                WHERE away = ? ORDER BY id DESC LIMIT ?
+            )
+            ORDER BY id DESC LIMIT ?
+            """,
+            (team_name, last, team_name, last, last)
+        ).fetchall()
+        return [
+            (opponent, scored, conceded, 'W' if scored > conceded else 'L' if scored < conceded else 'D')
+            for _, opponent, scored, conceded in rows
+        ]
+
+    def form(self, team_name, last=5):
+        """
+        Get a team's form string over its last matches, oldest first
+
+        Args:
+            team_name (str): Team name
+            last (int): Number of matches
+
+        Returns:
+            str: Form such as "WWDLW"
+        """
+        return "".join(r[3] for r in reversed(self.recent_results(team_name, last)))
+
+    def head_to_head(self, team_name, opponent_name):
+        """
+        Get the head-to-head record between two teams
+
+        Args:
+            team_name (str): Team whose perspective is used
+            opponent_name (str): Opponent team name
+
+        Returns:
+            tuple: (wins: int, draws: int, losses: int)
+        """
+        self.flush()
+        wins = draws = losses = 0
+        rows = self.conn.execute(
+            "SELECT home_score, away_score FROM fixtures WHERE home = ? AND away = ? "
+            "UNION ALL "
+            "SELECT away_score, home_score FROM fixtures WHERE home = ? AND away = ?",
+            (team_name, opponent_name, opponent_name, team_name)
+        )
+        for scored, conceded in rows:
+            if scored > conceded:
+                wins += 1
+            elif scored < conceded:
+                losses += 1
+            else:
+                draws += 1
+        return wins, draws, losses
+
+    def player_totals(self, player_id):
+        """
+        Get a player's recorded goals and assists, for every club they played for
+
+        Players are matched by id, so namesakes are counted separately.
+
+        Args:
+            player_id (int): Player id
+
+        Returns:
+            tuple: (goals: int, assists: int)
+        """
+        self.flush()
+        counts = dict(self.conn.execute(
+            "SELECT kind, COUNT(*) FROM goal_events WHERE player_id = ? GROUP BY kind",
+            (player_id,)
+        ).fetchall())
+        return counts.get('goal', 0), counts.get('assist', 0)
+
+    def close(self):
+        """Flush pending matches and close the database"""
+        if self._conn is not None or self._buffer:
+            self.flush()
+            self._conn.close()
+            self._conn = None
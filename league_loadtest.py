@@ -0,0 +1,165 @@
+"""
+league_loadtest.py
+Load generator for the Football Manager league server
+Simulates many concurrent managers and reports request latency
+
+Run against a running server:
+    python league_loadtest.py --port 8765 --clients 300
+or let it start a server in the same process:
+    python league_loadtest.py --local --clients 300
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from league_server import League, LeagueServer
+from utils import percentile
+
+
+# Relative frequency of each manager action
+ACTION_MIX = [
+    ('status', 30),
+    ('squad', 15),
+    ('train', 20),
+    ('rest', 15),
+    ('market', 10),
+    ('standings', 8),
+    ('buy', 2),
+]
+
+
+async def run_client(host, port, client_id, requests, latencies, errors, seed):
+    """
+    One simulated manager: join, then send a random mix of actions
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        client_id (int): Client number (used for the club name)
+        requests (int): Requests to send after joining
+        latencies (list): Request latencies in seconds are appended here
+        errors (list): Failed replies are appended here
+        seed (int): Random seed for the action sequence
+    """
+    rng = random.Random(seed)
+    actions, weights = zip(*ACTION_MIX)
+    reader, writer = await asyncio.open_connection(host, port)
+    club = f"Manager {client_id}"
+
+    async def call(request):
+        request['id'] = rng.randrange(1 << 30)
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if reply.get('id') != request['id']:
+            errors.append({'ok': False, 'error': "Mismatched reply id"})
+        return reply
+
+    try:
+        await call({'action': 'join', 'club': club})
+        squad = [p['player_id'] for p in (await call({'action': 'squad', 'club': club}))['players']]
+        # Market players from the last page this manager looked at
+        seen = []
+        for _ in range(requests):
+            action = rng.choices(actions, weights=weights)[0]
+            request = {'action': action, 'club': club}
+            if action in ('train', 'rest'):
+                request['player'] = rng.choice(squad)
+            elif action == 'market':
+                request['offset'] = rng.randrange(0, 20)
+                request['limit'] = 10
+            elif action == 'buy':
+                if not seen:
+                    continue
+                request['player'] = rng.choice(seen)
+            reply = await call(request)
+            if action == 'market' and reply.get('ok'):
+                seen = [p['player_id'] for p in reply['players']]
+            elif action == 'buy' and reply.get('ok'):
+                squad.append(reply['player'])
+            # Buying can fail for game reasons (budget, squad size, already sold)
+            if not reply.get('ok') and action != 'buy':
+                errors.append(reply)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, requests):
+    """
+    Run all clients concurrently
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        clients (int): Number of concurrent managers
+        requests (int): Requests per manager
+
+    Returns:
+        dict: 'requests', 'errors', 'seconds', 'throughput' (requests/s)
+            and 'p50' / 'p95' / 'p99' / 'max' latency in milliseconds
+    """
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(host, port, i, requests, latencies, errors, seed=i)
+        for i in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.50) * 1000,
+        'p95': percentile(latencies, 0.95) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'max': (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+async def _main(args):
+    """Run the load test, starting a local server if asked"""
+    server = None
+    port = args.port
+    if args.local:
+        server = LeagueServer(League(ai_clubs=args.ai_clubs, market_size=25), tick_seconds=args.tick)
+        port = await server.start(args.host, 0)
+    try:
+        report = await run_load(args.host, port, args.clients, args.requests)
+    finally:
+        if server:
+            await server.stop()
+
+    print(f"Clients: {args.clients}, requests: {report['requests']}, errors: {report['errors']}")
+    print(f"Throughput: {report['throughput']:.0f} requests/s over {report['seconds']:.2f}s")
+    print(f"Latency ms: p50 {report['p50']:.2f} | p95 {report['p95']:.2f} | "
+          f"p99 {report['p99']:.2f} | max {report['max']:.2f}")
+    if args.p99_budget and report['p99'] > args.p99_budget:
+        print(f"❌ p99 latency above budget of {args.p99_budget} ms")
+        return 1
+    return 0 if report['errors'] == 0 else 1
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Football Manager league load generator")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--local', action='store_true', help="start a server in this process")
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=50, help="requests per client")
+    parser.add_argument('--ai-clubs', type=int, default=19)
+    parser.add_argument('--tick', type=float, default=1.0, help="matchday interval for --local")
+    parser.add_argument('--p99-budget', type=float, default=0.0, help="fail if p99 ms exceeds this")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+league_server.py
+Local league server for Football Manager Simulator
+Hosts one shared league for many managers over a line-based JSON protocol
+
+Run the server with:
+    python league_server.py --port 8765
+
+Each request is one JSON object per line, for example:
+    {"id": 1, "action": "join", "club": "Dream FC"}
+and each reply is one JSON object per line with the same "id" and "ok".
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+from itertools import islice
+
+from match import Match
+from registry import PlayerRegistry
+from session import create_team, advance_week, VICTORY_PRIZE, DRAW_PRIZE
+from utils import generate_transfer_market, calculate_transfer_fee
+
+
+logger = logging.getLogger(__name__)
+
+
+class League:
+    """
+    Shared league state: clubs, the transfer market and the week counter
+
+    Manager actions change the state immediately; matches, salaries and
+    recovery for every club are processed together by matchday(). Players
+    are referred to by their stable id, so a request never acts on a
+    different player because a list shifted under it. A club that cannot
+    pay its wages is insolvent: as in session.advance_week its players do
+    not recover that week, and it cannot buy until a later week's wages are
+    paid. It keeps its fixtures, since prize money is its way back.
+
+    Attributes:
+        clubs (dict): Club name -> Team
+        market (dict): Player id -> Player available to buy, in listing order
+        registry (PlayerRegistry): Every player in the league and their club
+        week (int): Current week number
+        results (list): Scores of the most recent matchday
+        insolvent (dict): Club name -> wages it could not pay
+    """
+
+    def __init__(self, ai_clubs=0, market_size=5):
+        """
+        Initialize the league
+
+        Args:
+            ai_clubs (int): Number of computer-controlled clubs to create
+            market_size (int): Market players generated per position
+        """
+        self.clubs = {}
+        self.registry = PlayerRegistry()
+        self.market = {p.player_id: p for p in generate_transfer_market(market_size)}
+        self.registry.register_market(self.market.values())
+        self.week = 1
+        self.results = []
+        self.insolvent = {}
+        for i in range(ai_clubs):
+            self._create_club(f"AI Club {i + 1}")
+
+    def _create_club(self, name):
+        """Create a club with a fresh squad"""
+        team = create_team(name)
+        team.week = self.week
+        self.registry.register_team(team)
+        self.clubs[name] = team
+        return team
+
+    def handle(self, request):
+        """
+        Run one manager request
+
+        Args:
+            request (dict): Request with an 'action' and its arguments
+
+        Returns:
+            dict: Reply data (always has 'ok'; failures have 'error')
+        """
+        action = request.get('action')
+        handler = getattr(self, f"action_{action}", None)
+        if handler is None:
+            return {'ok': False, 'error': f"Unknown action: {action}"}
+        try:
+            return handler(request)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            return {'ok': False, 'error': f"Bad request: {str(e)}"}
+
+    def _club(self, request):
+        """Look up the club named in a request"""
+        return self.clubs[request['club']]
+
+    def action_join(self, request):
+        """Create a club (or rejoin an existing one)"""
+        name = str(request['club']).strip()
+        if not name:
+            return {'ok': False, 'error': "Club name required"}
+        team = self.clubs.get(name) or self._create_club(name)
+        return {'ok': True, 'club': team.name, 'budget': team.budget, 'week': self.week}
+
+    def action_status(self, request):
+        """Club summary"""
+        team = self._club(request)
+        return {
+            'ok': True,
+            'club': team.name,
+            'budget': team.budget,
+            'week': self.week,
+            'record': [team.wins, team.draws, team.losses],
+            'strength': round(team.get_team_strength(), 2),
+            'insolvent': team.name in self.insolvent,
+            'unpaid_wages': self.insolvent.get(team.name, 0),
+        }
+
+    def action_squad(self, request):
+        """List the club's players"""
+        team = self._club(request)
+        return {'ok': True, 'players': [p.to_dict() for p in team.players]}
+
+    def _squad_player(self, request):
+        """Look up a player of the requesting club by id"""
+        team = self._club(request)
+        player_id = int(request['player'])
+        if player_id not in self.registry or self.registry.club_of(player_id) != team.name:
+            raise ValueError(f"player {player_id} is not in your squad")
+        return self.registry.get(player_id)
+
+    def action_train(self, request):
+        """Train one squad player (by player id)"""
+        player = self._squad_player(request)
+        return {'ok': True, 'improvement': player.train(), 'overall': player.overall}
+
+    def action_rest(self, request):
+        """Rest one squad player (by player id)"""
+        player = self._squad_player(request)
+        player.rest()
+        return {'ok': True, 'stamina': player.stamina, 'morale': player.morale}
+
+    def action_market(self, request):
+        """One page of the transfer market (buy players by their player_id)"""
+        offset = int(request.get('offset', 0))
+        limit = min(100, int(request.get('limit', 20)))
+        page = islice(self.market.values(), offset, offset + limit)
+        return {
+            'ok': True,
+            'total': len(self.market),
+            'players': [dict(p.to_dict(), fee=calculate_transfer_fee(p)) for p in page],
+        }
+
+    def action_buy(self, request):
+        """Buy a market player by player id"""
+        team = self._club(request)
+        if team.name in self.insolvent:
+            return {'ok': False, 'error': "Club is insolvent: wages unpaid"}
+        player = self.market.get(int(request['player']))
+        if player is None:
+            return {'ok': False, 'error': "Player no longer on the market"}
+        fee = calculate_transfer_fee(player)
+        if team.budget < fee:
+            return {'ok': False, 'error': "Insufficient budget"}
+        if not team.add_player(player):
+            return {'ok': False, 'error': "Squad full"}
+        team.budget -= fee
+        del self.market[player.player_id]
+        self.registry.move(player.player_id, team.name)
+        return {'ok': True, 'signed': player.name, 'player': player.player_id, 'fee': fee}
+
+    def action_standings(self, request):
+        """League table by points, then wins"""
+        table = sorted(
+            self.clubs.values(),
+            key=lambda t: (3 * t.wins + t.draws, t.wins),
+            reverse=True
+        )
+        limit = int(request.get('limit', 20))
+        return {
+            'ok': True,
+            'week': self.week,
+            'table': [[t.name, 3 * t.wins + t.draws, t.wins, t.draws, t.losses] for t in table[:limit]],
+        }
+
+    def action_results(self, request):
+        """Scores from the most recent matchday"""
+        return {'ok': True, 'week': self.week - 1, 'results': self.results}
+
+    def matchday(self, rng=random):
+        """
+        Play one round for every club, then pay salaries and recover players
+
+        Clubs are paired at random; with an odd number of clubs one sits out.
+
+        Args:
+            rng: Random source for the pairing
+
+        Returns:
+            list: (home, home_score, away_score, away) per match
+        """
+        for _ in self.matchday_steps(rng):
+            pass
+        return self.results
+
+    def matchday_steps(self, rng=random, batch=25):
+        """
+        Play a matchday in batches, yielding between them
+
+        Lets the server answer managers while a large matchday is running.
+
+        Args:
+            rng: Random source for the pairing
+            batch (int): Matches played between yields
+
+        Yields:
+            int: Matches played so far
+        """
+        teams = [t for t in self.clubs.values() if len(t.players) >= 11]
+        rng.shuffle(teams)
+        results = []
+        for home, away in zip(teams[0::2], teams[1::2]):
+            result, home_score, away_score = Match(home, away).simulate()
+            # Match only updates the home side; mirror it for the away club
+            for player in away.players[:11]:
+                player.play_match()
+            if result == "Victory":
+                away.losses += 1
+                home.budget += VICTORY_PRIZE
+            elif result == "Defeat":
+                away.wins += 1
+                away.budget += VICTORY_PRIZE
+            else:
+                away.draws += 1
+                home.budget += DRAW_PRIZE
+                away.budget += DRAW_PRIZE
+            results.append((home.name, home_score, away_score, away.name))
+            if len(results) % batch == 0:
+                yield len(results)
+        self.advance_week()
+        self.results = results
+        yield len(results)
+
+    def advance_week(self):
+        """
+        Pay salaries and recover every club's players (session.advance_week)
+
+        Clubs that cannot pay are marked insolvent and logged; a club that
+        pays again in a later week is solvent again.
+        """
+        self.week += 1
+        for team in self.clubs.values():
+            success, total = advance_week(team)
+            if success:
+                self.insolvent.pop(team.name, None)
+            else:
+                self.insolvent[team.name] = total
+                logger.warning("%s cannot pay wages of %d in week %d (budget %d)",
+                               team.name, total, self.week, team.budget)
+
+
+class LeagueServer:
+    """
+    asyncio TCP server for a League
+
+    Attributes:
+        league (League): Shared league
+        tick_seconds (float): Seconds between matchdays (0 disables them)
+    """
+
+    def __init__(self, league, tick_seconds=10.0):
+        """
+        Initialize the server
+
+        Args:
+            league (League): Shared league
+            tick_seconds (float): Seconds between matchdays (0 disables them)
+        """
+        self.league = league
+        self.tick_seconds = tick_seconds
+        self.server = None
+        self._ticker = None
+
+    async def start(self, host='127.0.0.1', port=8765):
+        """
+        Start listening and, if enabled, the matchday ticker
+
+        Args:
+            host (str): Interface to bind (localhost by default)
+            port (int): TCP port (0 picks a free port)
+
+        Returns:
+            int: Port the server is listening on
+        """
+        self.server = await asyncio.start_server(self._serve_client, host, port)
+        if self.tick_seconds > 0:
+            self._ticker = asyncio.create_task(self._tick_loop())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop the ticker and the server"""
+        if self._ticker:
+            self._ticker.cancel()
+            self._ticker = None
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def _tick_loop(self):
+        """Run a matchday every tick_seconds"""
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            for _ in self.league.matchday_steps():
+                await asyncio.sleep(0)
+
+    async def _serve_client(self, reader, writer):
+        """Answer requests from one connection until it closes"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    reply = self.league.handle(request)
+                    reply['id'] = request.get('id')
+                except (ValueError, AttributeError):
+                    reply = {'ok': False, 'error': "Invalid JSON request"}
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                # Only wait for the socket when its buffer is filling up
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _run(host, port, ai_clubs, tick_seconds):
+    """Run the server until cancelled"""
+    server = LeagueServer(League(ai_clubs=ai_clubs), tick_seconds=tick_seconds)
+    port = await server.start(host, port)
+    print(f"League server listening on {host}:{port} ({ai_clubs} AI clubs, "
+          f"matchday every {tick_seconds}s)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Football Manager league server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--ai-clubs', type=int, default=19)
+    parser.add_argument('--tick', type=float, default=10.0, help="seconds between matchdays")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args.host, args.port, args.ai_clubs, args.tick))
+    except KeyboardInterrupt:
+        print("\nLeague server stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,116 @@ Handles match logic and scoring
 """
 
 import random
+from functools import lru_cache
+from math import comb
+
+
+# Goal model constants (see calibration.py for fitting them to real scorelines)
+HOME_ADVANTAGE = 1.1      # Home team strength multiplier
+STRENGTH_SCALE = 10       # Team strength / STRENGTH_SCALE = attack strength
+CHANCE_CONVERSION = 0.15  # Chance of scoring per chance, per point of attack strength
+MIN_CHANCES = 3           # Scoring chances per team per match: MIN_CHANCES..MAX_CHANCES
+MAX_CHANCES = 8
+GOAL_CAP = 6              # Most goals a team can score
+
+# Position weights for picking who scores and who assists
+SCORER_WEIGHTS = {'FWD': 5, 'MID': 2, 'DEF': 1, 'GK': 0.2}
+ASSIST_WEIGHTS = {'MID': 4, 'FWD': 2, 'DEF': 1}
+
+
+def attack_strength(team_strength, home=False):
+    """
+    Turn a team strength into attack strength for the goal model
+    
+    Args:
+        team_strength (float): Team strength (as Team.get_team_strength)
+        home (bool): Apply home advantage
+        
+    Returns:
+        float: Attack strength
+    """
+    if home:
+        team_strength *= HOME_ADVANTAGE
+    return team_strength / STRENGTH_SCALE
+
+
+def roll_goals(attack_strength, rng=random):
+    """
+    Roll the number of goals a team scores
+    
+    Args:
+        attack_strength (float): Team's attacking power
+        rng: Random source (the random module or a random.Random instance)
+        
+    Returns:
+        int: Number of goals scored
+    """
+    goals = 0
+    # Simulate multiple scoring chances
+    for _ in range(rng.randint(MIN_CHANCES, MAX_CHANCES)):
+        if rng.random() < attack_strength * CHANCE_CONVERSION:
+            goals += 1
+    return min(goals, GOAL_CAP)  # Cap goals for realism
+
+
+def goal_distribution(attack_strength):
+    """
+    Exact goal distribution produced by Match._generate_goals
+    
+    Args:
+        attack_strength (float): Team's attacking power
+        
+    Returns:
+        tuple: Probabilities of scoring 0 to GOAL_CAP goals
+    """
+    return chance_distribution(attack_strength * CHANCE_CONVERSION, MIN_CHANCES, MAX_CHANCES, GOAL_CAP)
+
+
+@lru_cache(maxsize=4096)
+def chance_distribution(p, min_chances, max_chances, cap):
+    """
+    Exact goal distribution for a uniform number of chances, each scored with probability p
+    
+    Args:
+        p (float): Chance of scoring each chance (clamped to 0-1)
+        min_chances (int): Fewest chances
+        max_chances (int): Most chances
+        cap (int): Most goals counted
+        
+    Returns:
+        tuple: Probabilities of scoring 0 to cap goals
+    """
+    p = max(0.0, min(1.0, p))
+    dist = [0.0] * (cap + 1)
+    spread = max_chances - min_chances + 1
+    for chances in range(min_chances, max_chances + 1):
+        for k in range(chances + 1):
+            prob = comb(chances, k) * p ** k * (1 - p) ** (chances - k)
+            dist[min(k, cap)] += prob / spread
+    return tuple(dist)
+
+
+def outcome_probabilities(home_strength, away_strength):
+    """
+    Calculate exact result probabilities for a match between two strengths
+    
+    Args:
+        home_strength (float): Home team strength (before home advantage)
+        away_strength (float): Away team strength
+        
+    Returns:
+        tuple: (win: float, draw: float, loss: float) from home team perspective
+    """
+    home = goal_distribution(attack_strength(home_strength, home=True))
+    away = goal_distribution(attack_strength(away_strength))
+    win = draw = 0.0
+    for h, ph in enumerate(home):
+        for a, pa in enumerate(away):
+            if h > a:
+                win += ph * pa
+            elif h == a:
+                draw += ph * pa
+    return win, draw, max(0.0, 1.0 - win - draw)
 
 
 class Match:
@@ -16,6 +126,7 @@ class Match:
         away_team (Team): Away team
         home_score (int): Home team's score
         away_score (int): Away team's score
+        goal_events (list): (team, scorer, assister) for each credited goal
     """
     
     def __init__(self, home_team, away_team):
@@ -30,6 +141,14 @@ class Match:
         self.away_team = away_team
         self.home_score = 0
         self.away_score = 0
+        # (team, scorer, assister) for every goal credited to a player
+        self.goal_events = []
+        # Live (event-by-event) match state
+        self._pending = None
+        self._on_pitch = {}
+        # Players substituted off in a live match, per team
+        self._taken_off = {}
+        self._result = None
 
     def simulate(self):
         """
@@ -43,12 +162,9 @@ class Match:
         home_strength = self.home_team.get_team_strength()
         away_strength = self.away_team.get_team_strength()
 
-        # 主场优势
-        home_strength *= 1.1
-
-        # 进攻强度
-        home_attack = home_strength / 10
-        away_attack = away_strength / 10
+        # 主场优势 + 进攻强度
+        home_attack = attack_strength(home_strength, home=True)
+        away_attack = attack_strength(away_strength)
 
         # 生成进球数（沿用你原来的“多次机会+概率进球”）
         self.home_score = self._generate_goals(home_attack)
@@ -65,17 +181,219 @@ class Match:
         # self._assign_goals_and_assists(self.away_team, self.away_score)
 
         # 更新比赛结果到战绩
+        result = self._record_result()
+
+        return result, self.home_score, self.away_score
+
+    def _record_result(self):
+        """
+        Add the final score to the home team's record
+        
+        Returns:
+            str: "Victory", "Draw", or "Defeat" from home team perspective
+        """
         if self.home_score > self.away_score:
             self.home_team.wins += 1
-            result = "Victory"
+            return "Victory"
         elif self.home_score < self.away_score:
             self.home_team.losses += 1
-            result = "Defeat"
-        else:
-            self.home_team.draws += 1
-            result = "Draw"
+            return "Defeat"
+        self.home_team.draws += 1
+        return "Draw"
 
-        return result, self.home_score, self.away_score
+    def live(self):
+        """
+        Play the match minute by minute, yielding events as they happen
+        
+        Chances, goal probabilities and the 6-goal cap follow _generate_goals
+        exactly, so final scores have the same distribution as simulate().
+        The team records, stamina and player stats are updated when the
+        full-time event is produced.
+        
+        Yields:
+            dict: Event with 'minute', 'type' ('kickoff', 'chance', 'goal',
+                'fatigue', 'substitution' or 'full_time'), 'team' and
+                'text', plus 'home_score' and 'away_score'
+        """
+        if self._pending is None:
+            self._kickoff()
+        yield self._event(0, 'kickoff', None, f"Kick-off: {self.get_match_summary()}")
+        while self._pending:
+            event = self._next_event()
+            if event:
+                yield event
+        yield self._full_time()
+
+    def fast_forward(self):
+        """
+        Skip the rest of a live match (or a match not yet started) to the result
+        
+        Costs no more than simulate(): no commentary is built for skipped events.
+        
+        Returns:
+            tuple: (result: str, home_score: int, away_score: int)
+        """
+        if self._pending is None:
+            # Nothing streamed yet: the plain simulation is the cheapest path
+            result, home_score, away_score = self.simulate()
+            self._result = result
+            self._pending = []
+            return result, home_score, away_score
+        while self._pending:
+            self._next_event(quiet=True)
+        event = self._full_time()
+        return event['result'], self.home_score, self.away_score
+
+    def _kickoff(self):
+        """Draw every scoring chance and substitution slot for a live match"""
+        home_attack = attack_strength(self.home_team.get_team_strength(), home=True)
+        away_attack = attack_strength(self.away_team.get_team_strength())
+        pending = []
+        for team, attack in ((self.home_team, home_attack), (self.away_team, away_attack)):
+            for _ in range(random.randint(MIN_CHANCES, MAX_CHANCES)):
+                pending.append((random.randint(1, 90), 'chance', team, attack))
+        for minute in (60, 75):
+            pending.append((minute, 'fatigue', self.home_team, None))
+        pending.sort(key=lambda item: item[0], reverse=True)
+        self._pending = pending
+        self._on_pitch = {
+            id(self.home_team): self.home_team.players[:11],
+            id(self.away_team): self.away_team.players[:11],
+        }
+        self._taken_off = {id(self.home_team): [], id(self.away_team): []}
+
+    def _next_event(self, quiet=False):
+        """
+        Resolve the next pending chance or fatigue check
+        
+        Args:
+            quiet (bool): Skip building commentary (fast-forward)
+            
+        Returns:
+            dict: Event, or None if nothing worth reporting happened
+        """
+        minute, kind, team, attack = self._pending.pop()
+        is_home = team is self.home_team
+        if kind == 'fatigue':
+            return None if quiet else self._fatigue_check(minute, team)
+
+        scored = random.random() < attack * CHANCE_CONVERSION
+        goals = self.home_score if is_home else self.away_score
+        if scored and goals < GOAL_CAP:
+            if is_home:
+                self.home_score += 1
+            else:
+                self.away_score += 1
+            starters = self._on_pitch[id(team)]
+            scorer = self._choose_player(team, SCORER_WEIGHTS, starters)
+            assister = None
+            if random.random() < 0.7 and len(team.players) >= 2:
+                assister = self._choose_player(team, ASSIST_WEIGHTS, starters)
+                if assister is scorer:
+                    assister = None
+            # Only the home side keeps individual stats, as in simulate()
+            if is_home:
+                if scorer:
+                    scorer.goals += 1
+                if assister:
+                    assister.assists += 1
+                self.goal_events.append((team, scorer, assister))
+            if quiet:
+                return None
+            text = f"GOAL! {team.name}"
+            if scorer:
+                text += f" - {scorer.name}"
+            if assister:
+                text += f" (assist: {assister.name})"
+            event = self._event(minute, 'goal', team, text)
+            event['scorer'] = scorer
+            event['assister'] = assister
+            return event
+        if quiet:
+            return None
+        return self._event(minute, 'chance', team, f"Chance for {team.name} goes begging")
+
+    def _fatigue_check(self, minute, team):
+        """
+        Report tired starters and replace the most tired one from the bench
+        
+        Args:
+            minute (int): Match minute
+            team (Team): Team to check
+            
+        Returns:
+            dict: Fatigue or substitution event, or None if nobody is tired
+        """
+        starters = self._on_pitch[id(team)]
+        taken_off = self._taken_off[id(team)]
+        # Starters lose 25 stamina over a full match
+        drain = 25 * minute / 90
+        tired = [p for p in starters if p.stamina - drain < 40]
+        if not tired:
+            return None
+        for tired_player in sorted(tired, key=lambda p: p.stamina):
+            # Players taken off cannot come back on
+            bench = [
+                p for p in team.players[11:]
+                if p not in starters and p not in taken_off
+                and p.position == tired_player.position
+                and p.stamina > tired_player.stamina
+            ]
+            if not bench:
+                continue
+            sub = max(bench, key=lambda p: p.stamina)
+            starters[starters.index(tired_player)] = sub
+            taken_off.append(tired_player)
+            event = self._event(minute, 'substitution', team,
+                                f"Substitution {team.name}: {sub.name} on for {tired_player.name}")
+            event['player_on'] = sub
+            event['player_off'] = tired_player
+            return event
+        names = ", ".join(p.name for p in tired)
+        return self._event(minute, 'fatigue', team, f"{team.name} tiring: {names}")
+
+    def _full_time(self):
+        """
+        Settle the match once: stamina, appearances and team record
+        
+        Everyone who played for the home side gets the appearance and the
+        stamina drain: the players on the pitch at full time and those
+        substituted off.
+        
+        Returns:
+            dict: Full-time event including 'result'
+        """
+        if self._result is None:
+            home = id(self.home_team)
+            for player in self._on_pitch[home] + self._taken_off[home]:
+                player.play_match()
+            self._result = self._record_result()
+            self._pending = []
+        event = self._event(90, 'full_time', None, f"Full time: {self.get_match_summary()}")
+        event['result'] = self._result
+        return event
+
+    def _event(self, minute, kind, team, text):
+        """
+        Build an event dictionary with the current score
+        
+        Args:
+            minute (int): Match minute
+            kind (str): Event type
+            team (Team): Team involved (None for match-wide events)
+            text (str): Commentary line
+            
+        Returns:
+            dict: Event data
+        """
+        return {
+            'minute': minute,
+            'type': kind,
+            'team': team,
+            'text': text,
+            'home_score': self.home_score,
+            'away_score': self.away_score,
+        }
 
     def _generate_goals(self, attack_strength):
         """
@@ -87,12 +405,7 @@ class Match:
         Returns:
             int: Number of goals scored
         """
-        goals = 0
-        # Simulate multiple scoring chances
-        for _ in range(random.randint(3, 8)):
-            if random.random() < attack_strength * 0.15:
-                goals += 1
-        return min(goals, 6)  # Cap at 6 goals for realism
+        return roll_goals(attack_strength)
     
     def get_match_summary(self):
         """
@@ -103,9 +416,10 @@ class Match:
         """
         return f"{self.home_team.name} {self.home_score} - {self.away_score} {self.away_team.name}"
 
-    def _choose_player(self, team, pos_weights):
+    def _choose_player(self, team, pos_weights, starters=None):
         """Pick a player from starting 11 with weighted probability by position & form."""
-        starters = team.players[:11]  # 只在首发里分配
+        if starters is None:
+            starters = team.players[:11]  # 只在首发里分配
         if not starters:
             return None
 
@@ -124,14 +438,18 @@ class Match:
         """
         for _ in range(goals):
             # 射手
-            scorer = self._choose_player(team, {'FWD': 5, 'MID': 2, 'DEF': 1, 'GK': 0.2})
+            scorer = self._choose_player(team, SCORER_WEIGHTS)
             if scorer:
                 scorer.goals += 1
             # 助攻（70% 概率有助攻；且不能是同一人）
+            assister = None
             if random.random() < 0.7 and len(team.players) >= 2:
-                assister = self._choose_player(team, {'MID': 4, 'FWD': 2, 'DEF': 1})
-                if assister and assister is not scorer:
+                assister = self._choose_player(team, ASSIST_WEIGHTS)
+                if assister is scorer:
+                    assister = None
+                if assister:
                     assister.assists += 1
+            self.goal_events.append((team, scorer, assister))
 
     def __str__(self):
         """String representation of match"""
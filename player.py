@@ -5,6 +5,14 @@ Handles all player-related attributes and behaviors
 """
 
 import random
+from collections.abc import MutableSequence
+
+
+# Saved player attributes, in column order for bulk (columnar) saves
+PLAYER_FIELDS = (
+    'player_id', 'name', 'position', 'overall', 'age', 'salary', 'stamina',
+    'morale', 'form', 'goals', 'assists', 'matches_played'
+)
 
 
 class Player:
@@ -12,6 +20,7 @@ class Player:
     Player class representing a football player
     
     Attributes:
+        player_id (int): Stable id, unique within the running game
         name (str): Player's full name
         position (str): Player's position (GK, DEF, MID, FWD)
         overall (int): Overall rating (1-99)
@@ -25,6 +34,9 @@ class Player:
         matches_played (int): Total matches played
     """
     
+    # Highest id handed out (or loaded) so far
+    _last_id = 0
+    
     def __init__(self, name, position, overall, age, salary):
         """
         Initialize a new player
@@ -36,6 +48,7 @@ class Player:
             age (int): Player's age
             salary (int): Weekly salary
         """
+        self.player_id = Player.next_id()
         self.name = name
         self.position = position
         self.overall = overall
@@ -79,16 +92,21 @@ class Player:
         self.matches_played += 1
 
     
-    def get_match_rating(self):
+    def get_match_rating(self, stamina=None):
         """
         Calculate player's match performance rating
         
+        Args:
+            stamina (int): Stamina level to rate at (defaults to current stamina)
+            
         Returns:
             float: Performance rating (50-99)
         """
+        if stamina is None:
+            stamina = self.stamina
         base = self.overall
         form_bonus = (self.form - 70) * 0.3
-        stamina_penalty = (100 - self.stamina) * 0.1
+        stamina_penalty = (100 - stamina) * 0.1
         morale_bonus = (self.morale - 50) * 0.15
         return max(50, min(99, base + form_bonus - stamina_penalty + morale_bonus))
     
@@ -100,6 +118,7 @@ class Player:
             dict: Player data as dictionary
         """
         return {
+            'player_id': self.player_id,
             'name': self.name,
             'position': self.position,
             'overall': self.overall,
@@ -118,27 +137,82 @@ class Player:
         """
         Create a player from dictionary data
         
+        Skips __init__, so no random form is drawn only to be overwritten.
+        
         Args:
             data (dict): Player data dictionary
             
         Returns:
             Player: New player object
         """
-        player = Player(
-            data['name'],
-            data['position'],
-            data['overall'],
-            data['age'],
-            data['salary']
-        )
-        player.stamina = data['stamina']
-        player.morale = data['morale']
-        player.form = data['form']
-        player.goals = data['goals']
-        player.assists = data['assists']
-        player.matches_played = data['matches_played']
+        player = Player.__new__(Player)
+        player.__dict__.update({field: data[field] for field in PLAYER_FIELDS[1:]})
+        player.player_id = Player.claim_id(data.get('player_id'))
         return player
     
+    @staticmethod
+    def next_id():
+        """
+        Hand out a new player id
+        
+        Returns:
+            int: Id not used by any player created or loaded so far
+        """
+        Player._last_id += 1
+        return Player._last_id
+    
+    @staticmethod
+    def claim_id(player_id):
+        """
+        Keep a loaded player's id, so new ids never collide with it
+        
+        Args:
+            player_id (int): Saved id (None for saves made before ids existed)
+            
+        Returns:
+            int: The id to use
+        """
+        if player_id is None:
+            return Player.next_id()
+        Player._last_id = max(Player._last_id, player_id)
+        return player_id
+    
+    @staticmethod
+    def to_columns(players):
+        """
+        Convert players to column data (one list per attribute)
+        
+        Args:
+            players (list): Players to convert
+            
+        Returns:
+            dict: Attribute name -> list of values
+        """
+        return {field: [getattr(p, field) for p in players] for field in PLAYER_FIELDS}
+    
+    @staticmethod
+    def from_columns(columns, lazy=False):
+        """
+        Create players in bulk from column data
+        
+        Args:
+            columns (dict): Attribute name -> list of values
+            lazy (bool): Return a LazyPlayerList that builds each player on first access
+            
+        Returns:
+            list: Player objects (LazyPlayerList if lazy)
+        """
+        if lazy:
+            return LazyPlayerList(columns)
+        columns = _with_ids(columns)
+        new = Player.__new__
+        players = []
+        for values in zip(*(columns[field] for field in PLAYER_FIELDS)):
+            player = new(Player)
+            player.__dict__ = dict(zip(PLAYER_FIELDS, values))
+            players.append(player)
+        return players
+    
     def __str__(self):
         """String representation of player"""
         return f"{self.name} ({self.position}) - OVR: {self.overall}"
@@ -146,3 +220,99 @@ class Player:
     def __repr__(self):
         """Detailed representation of player"""
         return f"Player('{self.name}', '{self.position}', {self.overall})"
+
+
+def _with_ids(columns):
+    """
+    Make sure column data has usable player ids
+    
+    Saves made before ids existed get fresh ids; otherwise the saved ids
+    are claimed so new players never reuse them.
+    
+    Args:
+        columns (dict): Attribute name -> list of values
+        
+    Returns:
+        dict: Column data with a 'player_id' column
+    """
+    ids = columns.get('player_id')
+    count = len(columns[PLAYER_FIELDS[1]])
+    if ids is None:
+        start = Player._last_id + 1
+        Player._last_id += count
+        return dict(columns, player_id=list(range(start, start + count)))
+    if ids:
+        Player.claim_id(max(ids))
+    return columns
+
+
+class LazyPlayerList(MutableSequence):
+    """
+    List of players backed by column data, built one player at a time on access
+    
+    Behaves like a list of Player objects. Players that have never been
+    accessed stay as a row number into the columns.
+    """
+    
+    def __init__(self, columns):
+        """
+        Initialize from column data
+        
+        Args:
+            columns (dict): Attribute name -> list of values
+        """
+        columns = _with_ids(columns)
+        self._columns = [columns[field] for field in PLAYER_FIELDS]
+        count = len(self._columns[0]) if self._columns else 0
+        # Each slot is a Player once built, or its row number before that
+        self._slots = list(range(count))
+    
+    def _build(self, index):
+        """Materialize the player in a slot and return it"""
+        slot = self._slots[index]
+        if isinstance(slot, Player):
+            return slot
+        player = Player.__new__(Player)
+        player.__dict__ = {field: column[slot] for field, column in zip(PLAYER_FIELDS, self._columns)}
+        self._slots[index] = player
+        return player
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._build(i) for i in range(*index.indices(len(self._slots)))]
+        return self._build(index)
+    
+    def __setitem__(self, index, player):
+        self._slots[index] = player
+    
+    def __delitem__(self, index):
+        del self._slots[index]
+    
+    def __len__(self):
+        return len(self._slots)
+    
+    def insert(self, index, player):
+        self._slots.insert(index, player)
+    
+    def index(self, player, start=0, stop=None):
+        """Find a player; only players already built can match"""
+        stop = len(self._slots) if stop is None else stop
+        for i in range(start, stop):
+            if self._slots[i] is player:
+                return i
+        raise ValueError(f"{player!r} is not in list")
+    
+    def __contains__(self, player):
+        return any(slot is player for slot in self._slots)
+    
+    def materialized_count(self):
+        """
+        Count players that have been built so far
+        
+        Returns:
+            int: Number of built players
+        """
+        return sum(isinstance(slot, Player) for slot in self._slots)
+    
+    def __repr__(self):
+        return f"LazyPlayerList({len(self)} players, {self.materialized_count()} built)"
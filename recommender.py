@@ -0,0 +1,192 @@
+"""
+recommender.py
+Transfer recommendation module for Football Manager Simulator
+Finds the set of signings that best improves team strength within budget
+"""
+
+from bisect import bisect_left, insort
+
+from team import MAX_SQUAD_SIZE, STARTERS
+from utils import calculate_transfer_fee
+
+
+class TransferRecommender:
+    """
+    Budget-constrained signing recommender over the transfer market
+
+    Team strength is the average match rating of the best 11 players (of
+    everyone, in a squad of fewer than 11), so with a full 11 a signing only
+    helps if it beats the weakest of the current best 11. The
+    market is indexed by rating once; each recommendation then prunes
+    players below that threshold by bisection, drops every player dominated
+    (higher cost, no better rating) by at least as many players as there are
+    free squad places, and solves the remaining knapsack exactly.
+
+    Attributes:
+        market (list): Available players
+        salary_weeks (int): Weeks of wages to cover for signings and the current squad
+    """
+
+    def __init__(self, market, salary_weeks=1):
+        """
+        Initialize the recommender and index the market
+
+        Args:
+            market (list): Available players
+            salary_weeks (int): Weeks of wages to cover for signings and the current squad
+        """
+        self.market = market
+        self.salary_weeks = salary_weeks
+        self._build_index()
+
+    def _build_index(self):
+        """Index market players by match rating (ascending)"""
+        entries = sorted(
+            (p.get_match_rating(), self.signing_cost(p), i)
+            for i, p in enumerate(self.market)
+        )
+        self._ratings = [e[0] for e in entries]
+        self._entries = entries
+
+    def refresh(self):
+        """Rebuild the index after the market has changed"""
+        self._build_index()
+
+    def signing_cost(self, player):
+        """
+        Total cost of signing a player: transfer fee plus future salaries
+
+        Args:
+            player (Player): Market player
+
+        Returns:
+            int: Cost in pounds
+        """
+        return calculate_transfer_fee(player) + player.salary * self.salary_weeks
+
+    def recommend(self, team):
+        """
+        Find the best affordable set of signings for a team
+
+        Args:
+            team (Team): Team looking to buy
+
+        Returns:
+            tuple: (players: list, strength_gain: float, total_fee: int)
+        """
+        slots = MAX_SQUAD_SIZE - len(team.players)
+        wage_bill = sum(p.salary for p in team.players) * self.salary_weeks
+        budget = team.budget - wage_bill
+        if slots <= 0 or budget <= 0:
+            return [], 0.0, 0
+
+        current = sorted((p.get_match_rating() for p in team.players), reverse=True)[:STARTERS]
+        # Empty starting places count as zero-rated players
+        current += [0.0] * (STARTERS - len(current))
+        current.sort()
+        max_signings = min(slots, STARTERS)
+
+        candidates = self._candidates(current[0], budget, max_signings)
+        best_strength, best_set = self._solve(
+            candidates, current, len(team.players), budget, max_signings
+        )
+        if not best_set:
+            return [], 0.0, 0
+
+        players = [self.market[i] for i in best_set]
+        gain = best_strength - team.get_team_strength()
+        total_fee = sum(calculate_transfer_fee(p) for p in players)
+        return players, gain, total_fee
+
+    def _candidates(self, threshold, budget, max_signings):
+        """
+        Select market players worth considering
+
+        Args:
+            threshold (float): Rating a signing must beat to enter the best 11
+            budget (int): Money available for signing costs
+            max_signings (int): Most players that can be signed
+
+        Returns:
+            list: (rating, cost, market_index) tuples, cheapest first
+        """
+        start = bisect_left(self._ratings, threshold)
+        pool = sorted(
+            (e for e in self._entries[start:] if e[0] > threshold and e[1] <= budget),
+            key=lambda e: (e[1], -e[0])
+        )
+        # Keep players beaten on both rating and cost by fewer than
+        # max_signings others: anyone else can always be swapped out.
+        kept = []
+        seen = []
+        for entry in pool:
+            better = len(seen) - bisect_left(seen, entry[0])
+            if better < max_signings:
+                kept.append(entry)
+            insort(seen, entry[0])
+        return kept
+
+    def _solve(self, candidates, current, squad_size, budget, max_signings):
+        """
+        Exact knapsack over candidates using Pareto frontiers per squad count
+
+        With m signings the strength is the best-11 total over
+        min(11, squad_size + m) players, as in Team.get_team_strength. The
+        total assumes the m signings replace the m weakest of the current
+        11; that is exact for any set whose signings all start, and a set
+        with a signing who would not start is beaten by the same set
+        without them.
+
+        Args:
+            candidates (list): (rating, cost, market_index) tuples
+            current (list): Ratings of the current best 11, ascending
+                (zeros for empty places)
+            squad_size (int): Players in the current squad
+            budget (int): Money available for signing costs
+            max_signings (int): Most players that can be signed
+
+        Returns:
+            tuple: (team_strength: float, market_indexes: tuple); the
+                indexes are empty unless some set strictly raises strength
+        """
+        # frontiers[m] holds (cost, rating_sum, indexes) states with m signings
+        frontiers = [[(0, 0.0, ())]] + [[] for _ in range(max_signings)]
+        for rating, cost, index in candidates:
+            for m in range(max_signings - 1, -1, -1):
+                extended = [
+                    (c + cost, r + rating, chosen + (index,))
+                    for c, r, chosen in frontiers[m]
+                    if c + cost <= budget
+                ]
+                if extended:
+                    frontiers[m + 1] = self._pareto(frontiers[m + 1] + extended)
+
+        best_strength = sum(current) / max(1, min(STARTERS, squad_size))
+        best_set = ()
+        for m in range(1, max_signings + 1):
+            kept_total = sum(current[m:])
+            players = min(STARTERS, squad_size + m)
+            for _, rating_sum, chosen in frontiers[m]:
+                strength = (rating_sum + kept_total) / players
+                if strength > best_strength:
+                    best_strength, best_set = strength, chosen
+        return best_strength, best_set
+
+    @staticmethod
+    def _pareto(states):
+        """
+        Drop states that cost more without a higher rating total
+
+        Args:
+            states (list): (cost, rating_sum, indexes) tuples
+
+        Returns:
+            list: Non-dominated states, cheapest first
+        """
+        frontier = []
+        best = float('-inf')
+        for state in sorted(states, key=lambda s: (s[0], -s[1])):
+            if state[1] > best:
+                frontier.append(state)
+                best = state[1]
+        return frontier
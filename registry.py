@@ -0,0 +1,193 @@
+"""
+registry.py
+Player registry module for Football Manager Simulator
+Looks players up by id and tracks which club each one belongs to
+"""
+
+from search import NameIndex
+
+
+# Club key for players on the transfer market
+MARKET = None
+
+# Default for search(): players of every club and the market
+_ANY_CLUB = object()
+
+
+class PlayerRegistry:
+    """
+    World-level index of players by their stable id
+
+    Every registered player belongs to one club, or to the transfer market
+    (MARKET). Lookups, club changes and removals are dict operations, so
+    they cost the same at any world size. A name search index over every
+    registered player is kept up to date as players are registered and
+    removed.
+
+    Attributes:
+        names (NameIndex): Name search index over every registered player
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._players = {}
+        self._club_of = {}
+        # Club -> {player_id: Player}, in registration order
+        self._members = {}
+        self.names = NameIndex()
+
+    def register(self, player, club=MARKET):
+        """
+        Add a player (or update the club of one already registered)
+
+        Ids are never changed here, since traces and match history already
+        refer to them. A different player with a registered id (e.g. one
+        from another save) is an error; clear() the registry before loading
+        another game.
+
+        Args:
+            player (Player): Player to register
+            club (str): Club name, or MARKET
+
+        Returns:
+            int: The player's id
+
+        Raises:
+            ValueError: If a different player already has this id
+        """
+        known = self._players.get(player.player_id)
+        if known is None:
+            self._players[player.player_id] = player
+        elif known is not player:
+            raise ValueError(
+                f"Player id {player.player_id} is already used by {known.name}; "
+                f"cannot register {player.name}"
+            )
+        self.names.add(player)
+        self.move(player.player_id, club)
+        return player.player_id
+
+    def register_team(self, team):
+        """
+        Register every player in a squad under the team's name
+
+        Args:
+            team (Team): Team to register
+        """
+        for player in team.players:
+            self.register(player, team.name)
+
+    def register_market(self, players):
+        """
+        Register transfer market players
+
+        Args:
+            players (list): Market players
+        """
+        for player in players:
+            self.register(player, MARKET)
+
+    def get(self, player_id):
+        """
+        Look up a player
+
+        Args:
+            player_id (int): Player id
+
+        Returns:
+            Player: The player, or None if not registered
+        """
+        return self._players.get(player_id)
+
+    def club_of(self, player_id):
+        """
+        Get the club a player belongs to
+
+        Args:
+            player_id (int): Player id
+
+        Returns:
+            str: Club name, or MARKET
+
+        Raises:
+            KeyError: If the player is not registered
+        """
+        return self._club_of[player_id]
+
+    def members(self, club):
+        """
+        Get a club's players
+
+        Args:
+            club (str): Club name, or MARKET
+
+        Returns:
+            list: Players in registration order
+        """
+        return list(self._members.get(club, {}).values())
+
+    def move(self, player_id, club):
+        """
+        Move a registered player to another club (or the market)
+
+        Args:
+            player_id (int): Player id
+            club (str): New club name, or MARKET
+        """
+        player = self._players[player_id]
+        old = self._club_of.get(player_id, club)
+        if old != club:
+            del self._members[old][player_id]
+        self._members.setdefault(club, {})[player_id] = player
+        self._club_of[player_id] = club
+
+    def remove(self, player_id):
+        """
+        Forget a player (e.g. after retirement)
+
+        Args:
+            player_id (int): Player id
+
+        Returns:
+            bool: True if the player was registered
+        """
+        player = self._players.pop(player_id, None)
+        if player is None:
+            return False
+        club = self._club_of.pop(player_id)
+        del self._members[club][player_id]
+        self.names.remove(player_id)
+        return True
+
+    def clear(self):
+        """Forget every player (e.g. when a different game is loaded)"""
+        self._players.clear()
+        self._club_of.clear()
+        self._members.clear()
+        self.names = NameIndex()
+
+    def search(self, query, club=_ANY_CLUB, limit=20, min_score=0.4):
+        """
+        Find players by (possibly misspelt, partly typed) name
+
+        Args:
+            query (str): Text typed so far
+            club (str): Only players of this club, or MARKET for the market
+                (everyone if omitted)
+            limit (int): Most results to return
+            min_score (float): Lowest score to include (0-1)
+
+        Returns:
+            list: SearchHit list, best first
+        """
+        where = None
+        if club is not _ANY_CLUB:
+            members = self._members.get(club, {})
+            where = members.__contains__
+        return self.names.search(query, limit, min_score, where)
+
+    def __contains__(self, player_id):
+        return player_id in self._players
+
+    def __len__(self):
+        return len(self._players)
@@ -0,0 +1,209 @@
+"""
+rotation.py
+Squad rotation planner for Football Manager Simulator
+Plans starting lineups across a list of fixtures while managing stamina
+"""
+
+from match import outcome_probabilities
+from session import WEEKLY_STAMINA_RECOVERY
+from team import STARTERS
+
+
+# Stamina a match costs (mirrored from Player.play_match); weekly recovery
+# comes from session.advance_week
+MATCH_STAMINA_COST = 25
+
+# How strongly each candidate lineup favours saving legs for later fixtures
+FATIGUE_WEIGHTS = (0.0, 0.5, 1.0, 2.0, 4.0)
+
+
+def stamina_after_match(stamina):
+    """
+    Stamina of a starter once the match and the following week are over
+
+    Args:
+        stamina (int): Stamina before the match
+
+    Returns:
+        int: Stamina at the next fixture
+    """
+    return min(100, max(0, stamina - MATCH_STAMINA_COST) + WEEKLY_STAMINA_RECOVERY)
+
+
+def stamina_after_rest(stamina):
+    """
+    Stamina of a benched player at the next fixture
+
+    Args:
+        stamina (int): Stamina before the match
+
+    Returns:
+        int: Stamina at the next fixture
+    """
+    return min(100, stamina + WEEKLY_STAMINA_RECOVERY)
+
+
+def squad_strength(players, staminas):
+    """
+    Team strength at the given staminas, by the engine's own formula
+
+    Mirrors Team.get_team_strength, which Match uses: the average match
+    rating of the best 11 in the whole squad, whoever starts.
+
+    Args:
+        players (list): Squad players
+        staminas (tuple): Stamina of each player
+
+    Returns:
+        float: Team strength (0 for an empty squad)
+    """
+    ratings = sorted((p.get_match_rating(s) for p, s in zip(players, staminas)), reverse=True)
+    top = ratings[:STARTERS]
+    return sum(top) / len(top) if top else 0
+
+
+def expected_points(lineup_strength, opponent_strength):
+    """
+    Expected league points for a home match
+
+    Args:
+        lineup_strength (float): Team strength (as Team.get_team_strength)
+        opponent_strength (float): Opponent team strength
+
+    Returns:
+        float: Expected points (0-3)
+    """
+    win, draw, _ = outcome_probabilities(lineup_strength, opponent_strength)
+    return 3 * win + draw
+
+
+class RotationPlanner:
+    """
+    Beam search planner choosing a starting 11 for each upcoming fixture
+
+    Each search state is the stamina of every squad player. A fixture is
+    scored the way Match plays it: the team's strength is squad_strength at
+    that state's staminas, and the chosen 11 (players[:11] once the lineup is
+    set) take the match's stamina cost. So the lineup decides how fresh the
+    squad is for later fixtures. For every state a handful of candidate
+    lineups is built by ranking players on their match rating minus a
+    weighted fatigue cost, and only the best states are kept for the next
+    fixture.
+
+    Attributes:
+        team (Team): Team being planned for
+        opponents (list): Opponent strength for each fixture, in order
+        beam_width (int): Number of search states kept per fixture
+    """
+
+    def __init__(self, team, fixtures, beam_width=16):
+        """
+        Initialize the planner
+
+        Args:
+            team (Team): Team to plan for
+            fixtures (list): Upcoming opponents as Team objects or strengths
+            beam_width (int): Number of search states kept per fixture
+        """
+        self.team = team
+        self.opponents = [
+            f.get_team_strength() if hasattr(f, 'get_team_strength') else float(f)
+            for f in fixtures
+        ]
+        self.beam_width = beam_width
+
+    def plan(self):
+        """
+        Plan a starting lineup for every fixture
+
+        Returns:
+            tuple: (lineups: list of lists of Player, expected_points: float)
+        """
+        players = self.team.players
+        if len(players) < STARTERS or not self.opponents:
+            return [], 0.0
+
+        # (staminas, points, lineups so far as index tuples)
+        beam = [(tuple(p.stamina for p in players), 0.0, ())]
+        for week, opponent in enumerate(self.opponents):
+            remaining = len(self.opponents) - week - 1
+            successors = {}
+            for staminas, points, history in beam:
+                gained = expected_points(squad_strength(players, staminas), opponent)
+                for lineup in self._candidate_lineups(staminas):
+                    chosen = set(lineup)
+                    next_staminas = tuple(
+                        stamina_after_match(s) if i in chosen else stamina_after_rest(s)
+                        for i, s in enumerate(staminas)
+                    )
+                    total = points + gained
+                    best = successors.get(next_staminas)
+                    if best is None or total > best[1]:
+                        successors[next_staminas] = (next_staminas, total, history + (lineup,))
+            beam = sorted(
+                successors.values(),
+                key=lambda state: state[1] + self._potential(state[0], remaining),
+                reverse=True
+            )[:self.beam_width]
+
+        _, points, history = beam[0]
+        lineups = [[players[i] for i in lineup] for lineup in history]
+        return lineups, points
+
+    def _candidate_lineups(self, staminas):
+        """
+        Build distinct candidate lineups for one search state
+
+        Args:
+            staminas (tuple): Stamina of every squad player
+
+        Returns:
+            list: Lineups as sorted tuples of player indexes
+        """
+        players = self.team.players
+        ratings = [p.get_match_rating(s) for p, s in zip(players, staminas)]
+        costs = [
+            p.get_match_rating(stamina_after_rest(s)) - p.get_match_rating(stamina_after_match(s))
+            for p, s in zip(players, staminas)
+        ]
+        candidates = []
+        for weight in FATIGUE_WEIGHTS:
+            order = sorted(
+                range(len(players)),
+                key=lambda i: ratings[i] - weight * costs[i],
+                reverse=True
+            )
+            lineup = tuple(sorted(order[:STARTERS]))
+            if lineup not in candidates:
+                candidates.append(lineup)
+        return candidates
+
+    def _potential(self, staminas, remaining):
+        """
+        Optimistic estimate of the points still available from a state
+
+        Args:
+            staminas (tuple): Stamina of every squad player
+            remaining (int): Number of fixtures left after this one
+
+        Returns:
+            float: Estimated points over the remaining fixtures
+        """
+        if remaining == 0:
+            return 0.0
+        upcoming = self.opponents[-remaining:]
+        average_opponent = sum(upcoming) / remaining
+        return remaining * expected_points(squad_strength(self.team.players, staminas), average_opponent)
+
+    def apply_next(self):
+        """
+        Plan the fixtures and set the first planned lineup as the team's starters
+
+        Returns:
+            list: The starting 11 for the next fixture (empty if no plan)
+        """
+        lineups, _ = self.plan()
+        if lineups:
+            self.team.set_starting_lineup(lineups[0])
+            return lineups[0]
+        return []
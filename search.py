@@ -0,0 +1,159 @@
+"""
+search.py
+Player search module for Football Manager Simulator
+Typo-tolerant, as-you-type name search over a trigram index
+"""
+
+from collections import namedtuple
+
+
+# One search result
+SearchHit = namedtuple('SearchHit', ['player_id', 'name', 'score'])
+
+
+def trigrams(text, prefix=False):
+    """
+    Split text into word trigrams
+
+    Each word is padded ("  smith ") so short words and word starts count.
+
+    Args:
+        text (str): Text to split
+        prefix (bool): Leave the end of the last word open, so a partly
+            typed word matches longer ones
+
+    Returns:
+        set: Trigrams
+    """
+    grams = set()
+    words = text.lower().split()
+    for i, word in enumerate(words):
+        open_end = prefix and i == len(words) - 1
+        padded = f"  {word}" if open_end else f"  {word} "
+        for j in range(len(padded) - 2):
+            grams.add(padded[j:j + 3])
+    return grams
+
+
+class NameIndex:
+    """
+    Inverted trigram index over player names
+
+    Generated names repeat a lot, so the index works on distinct names:
+    trigram -> names, and name -> player ids. A query scores each distinct
+    name that shares a trigram with it, then expands the best names into
+    players. Adding and removing players only touches their own name.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._postings = {}
+        self._players = {}
+        self._names = {}
+        # Distinct name -> number of trigrams it has
+        self._sizes = {}
+
+    def add(self, player):
+        """
+        Index a player (re-indexes a renamed player)
+
+        Args:
+            player (Player): Player to add
+        """
+        old = self._names.get(player.player_id)
+        if old == player.name:
+            return
+        if old is not None:
+            self.remove(player.player_id)
+        self._names[player.player_id] = player.name
+        ids = self._players.get(player.name)
+        if ids is None:
+            ids = self._players[player.name] = {}
+            grams = trigrams(player.name)
+            self._sizes[player.name] = len(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(player.name)
+        ids[player.player_id] = None
+
+    def add_many(self, players):
+        """
+        Index many players
+
+        Args:
+            players (list): Players to add
+        """
+        for player in players:
+            self.add(player)
+
+    def remove(self, player_id):
+        """
+        Remove a player (e.g. after retirement)
+
+        Args:
+            player_id (int): Player id
+
+        Returns:
+            bool: True if the player was indexed
+        """
+        name = self._names.pop(player_id, None)
+        if name is None:
+            return False
+        ids = self._players[name]
+        del ids[player_id]
+        if not ids:
+            del self._players[name]
+            del self._sizes[name]
+            for gram in trigrams(name):
+                names = self._postings[gram]
+                names.discard(name)
+                if not names:
+                    del self._postings[gram]
+        return True
+
+    def search(self, query, limit=20, min_score=0.4, where=None):
+        """
+        Find players whose names match a (possibly misspelt, partly typed) query
+
+        A name's score is the share of the query's trigrams it contains;
+        names that are closer in length rank first among equal scores.
+
+        Args:
+            query (str): Text typed so far
+            limit (int): Most results to return
+            min_score (float): Lowest score to include (0-1)
+            where (callable): where(player_id) -> bool, to keep only some players
+
+        Returns:
+            list: SearchHit list, best first
+        """
+        grams = trigrams(query, prefix=True)
+        if not grams:
+            return []
+        counts = {}
+        for gram in grams:
+            for name in self._postings.get(gram, ()):
+                counts[name] = counts.get(name, 0) + 1
+
+        needed = min_score * len(grams)
+        scored = []
+        for name, common in counts.items():
+            if common >= needed:
+                dice = 2 * common / (len(grams) + self._sizes[name])
+                scored.append((common / len(grams), dice, name))
+        scored.sort(key=lambda s: (-s[0], -s[1], s[2]))
+
+        hits = []
+        for score, _, name in scored:
+            for player_id in self._players[name]:
+                if where is not None and not where(player_id):
+                    continue
+                hits.append(SearchHit(player_id, name, score))
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+    def __contains__(self, player_id):
+        return player_id in self._names
+
+    def __len__(self):
+        return len(self._names)
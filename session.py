@@ -0,0 +1,198 @@
+"""
+session.py
+Game session module for Football Manager Simulator
+The manager actions behind the GUI buttons, usable without a window
+"""
+
+import random
+
+from team import Team, MAX_SQUAD_SIZE
+from match import Match
+from registry import PlayerRegistry
+from game_calendar import GameCalendar
+from utils import (
+    generate_initial_squad,
+    generate_transfer_market,
+    calculate_transfer_fee,
+    create_random_player
+)
+
+
+STARTING_BUDGET = 50000000  # £50 million
+VICTORY_PRIZE = 1000000
+DRAW_PRIZE = 300000
+# Weekly recovery: stamina regained and the most form can drift either way
+WEEKLY_STAMINA_RECOVERY = 10
+FORM_DRIFT = 5
+OPPONENT_POSITIONS = ['GK', 'DEF', 'DEF', 'DEF', 'DEF', 'MID', 'MID', 'MID', 'FWD', 'FWD', 'FWD']
+
+
+def create_team(name):
+    """
+    Create a new club with a generated squad
+
+    Args:
+        name (str): Club name
+
+    Returns:
+        Team: New team
+    """
+    team = Team(name, budget=STARTING_BUDGET)
+    for player in generate_initial_squad():
+        team.add_player(player)
+    return team
+
+
+def create_opponent():
+    """
+    Create a random opponent with a starting 11
+
+    Returns:
+        Team: Opponent team
+    """
+    opponent = Team("Opponent FC", 30000000)
+    for pos in OPPONENT_POSITIONS:
+        opponent.add_player(create_random_player(pos, True))
+    return opponent
+
+
+def play_match(team):
+    """
+    Play a match against a random opponent and award prize money
+
+    Args:
+        team (Team): The manager's team (needs at least 11 players)
+
+    Returns:
+        tuple: (match: Match, result: str, prize: int)
+    """
+    match = Match(team, create_opponent())
+    result, _, _ = match.simulate()
+
+    # Prize money
+    if result == "Victory":
+        prize = VICTORY_PRIZE
+        team.budget += prize
+        team.reputation = min(100, team.reputation + 2)
+    elif result == "Draw":
+        prize = DRAW_PRIZE
+        team.budget += prize
+    else:
+        prize = 0
+        team.reputation = max(1, team.reputation - 1)
+    return match, result, prize
+
+
+def advance_week(team, rng=random, calendar=None):
+    """
+    Move to the next week: pay salaries, recover players, then run due events
+
+    Players only recover (and events only run) if the salaries were paid.
+
+    Args:
+        team (Team): The manager's team
+        rng: Random source for form changes
+        calendar (GameCalendar): Calendar whose due events to run (optional)
+
+    Returns:
+        tuple: (success: bool, total_salaries: int)
+    """
+    team.week += 1
+
+    # Pay salaries
+    success, total = team.pay_salaries()
+    if not success:
+        return False, total
+
+    # Recover players
+    for player in team.players:
+        player.stamina = min(100, player.stamina + WEEKLY_STAMINA_RECOVERY)
+        player.form = max(50, min(95, player.form + rng.randint(-FORM_DRIFT, FORM_DRIFT)))
+
+    if calendar is not None:
+        calendar.week = team.week
+        calendar.run_due()
+    return True, total
+
+
+def buy_player(team, market, player, registry=None):
+    """
+    Buy a player from the transfer market
+
+    Args:
+        team (Team): Buying team
+        market (list): Transfer market the player is in
+        player (Player): Player to buy
+        registry (PlayerRegistry): Registry to record the move in (optional)
+
+    Returns:
+        tuple: (success: bool, reason: str, fee: int)
+            reason is "", "budget" or "squad_full"
+    """
+    fee = calculate_transfer_fee(player)
+    if team.budget < fee:
+        return False, "budget", fee
+    if len(team.players) >= MAX_SQUAD_SIZE:
+        return False, "squad_full", fee
+
+    team.budget -= fee
+    team.add_player(player)
+    market.remove(player)
+    if registry is not None:
+        registry.register(player, team.name)
+    return True, "", fee
+
+
+class GameSession:
+    """
+    Headless single-manager game: a team, a transfer market and the actions
+
+    Attributes:
+        team (Team): The manager's team
+        market (list): Transfer market players
+        registry (PlayerRegistry): Index of the team's and market's players
+        calendar (GameCalendar): Scheduled future events
+    """
+
+    def __init__(self, team=None, market=None):
+        """
+        Initialize the session
+
+        Args:
+            team (Team): The manager's team
+            market (list): Transfer market (generated if not given)
+        """
+        self.team = team
+        self.market = market if market is not None else generate_transfer_market()
+        self.registry = PlayerRegistry()
+        self.registry.register_market(self.market)
+        if team is not None:
+            self.registry.register_team(team)
+        self.calendar = GameCalendar(team.week if team is not None else 1)
+
+    def new_game(self, name):
+        """Start a new club"""
+        self.team = create_team(name)
+        self.registry.register_team(self.team)
+        self.calendar = GameCalendar(self.team.week)
+
+    def train(self, player_id):
+        """Train the squad player with this id; returns the improvement"""
+        return self.registry.get(player_id).train()
+
+    def rest(self, player_id):
+        """Rest the squad player with this id"""
+        self.registry.get(player_id).rest()
+
+    def play_match(self):
+        """Play a match; returns (match, result, prize)"""
+        return play_match(self.team)
+
+    def advance_week(self):
+        """Advance a week; returns (success, total_salaries)"""
+        return advance_week(self.team, calendar=self.calendar)
+
+    def buy(self, player_id):
+        """Buy the market player with this id; returns (success, reason, fee)"""
+        player = self.registry.get(player_id)
+        return buy_player(self.team, self.market, player, self.registry)
@@ -0,0 +1,258 @@
+"""
+session_trace.py
+Session trace module for Football Manager Simulator
+Records manager actions with their random seeds and replays them headlessly
+
+Replay recorded traces as a throughput benchmark with:
+    python session_trace.py traces/*.jsonl
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+from player import Player
+from team import Team
+from session import GameSession
+
+
+def state_digest(team, market):
+    """
+    Fingerprint of the full game state
+
+    Args:
+        team (Team): The manager's team
+        market (list): Transfer market players
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    state = {'team': team.to_dict(), 'market': Player.to_columns(market)}
+    # Ids are bookkeeping rather than game state (and older traces lack them)
+    for player in state['team']['players']:
+        del player['player_id']
+    del state['market']['player_id']
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class TraceRecorder:
+    """
+    Writes a session trace as JSON Lines
+
+    The trace starts with a snapshot of the game state. Each action line
+    holds the action, its arguments and the seed the global random module
+    was reset to just before it ran, so a replay draws the same numbers.
+    The last line holds a digest of the final state.
+
+    Each start() writes a new file in the trace directory, named after the
+    time it started, so traces from earlier games in a session are kept.
+
+    Attributes:
+        directory (str): Directory traces are written to
+        path (str): Current trace file path (None before the first start())
+        actions (int): Actions recorded so far
+    """
+
+    def __init__(self, directory):
+        """
+        Initialize the recorder (files are created by start())
+
+        Args:
+            directory (str): Directory traces are written to
+        """
+        self.directory = directory
+        self.path = None
+        self.actions = 0
+        self._file = None
+
+    def _new_path(self):
+        """A trace file path no earlier trace uses: session_<time>[_<n>].jsonl"""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.directory, f"session_{stamp}.jsonl")
+        count = 1
+        while os.path.exists(path):
+            count += 1
+            path = os.path.join(self.directory, f"session_{stamp}_{count}.jsonl")
+        return path
+
+    def start(self, team, market):
+        """
+        Begin a trace in a new file from the current game state (ends any open trace)
+
+        Args:
+            team (Team): The manager's team
+            market (list): Transfer market players
+        """
+        if self._file:
+            self.finish(None, None)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self.path = self._new_path()
+        self._file = open(self.path, 'x', encoding='utf-8')
+        self.actions = 0
+        self._write({
+            'type': 'start',
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'team': team.to_dict(),
+            'market': Player.to_columns(market),
+        })
+
+    def record(self, action, **args):
+        """
+        Record an action and reseed the random module for it
+
+        Call immediately before performing the action.
+
+        Args:
+            action (str): 'train', 'rest', 'play_match', 'advance_week' or 'buy'
+            **args: Action arguments (e.g. player_id=3)
+
+        Returns:
+            int: Seed the random module now uses
+        """
+        seed = random.randrange(2 ** 32)
+        random.seed(seed)
+        if self._file:
+            self._write(dict(type='action', action=action, seed=seed, **args))
+            self.actions += 1
+        return seed
+
+    def finish(self, team, market):
+        """
+        End the trace with a digest of the final state
+
+        Args:
+            team (Team): The manager's team (None to close without a digest)
+            market (list): Transfer market players
+        """
+        if not self._file:
+            return
+        if team is not None:
+            self._write({'type': 'end', 'actions': self.actions, 'digest': state_digest(team, market)})
+        self._file.close()
+        self._file = None
+
+    def _write(self, entry):
+        """Append one JSON line"""
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def load_trace(path):
+    """
+    Read a trace file
+
+    Args:
+        path (str): Trace file path
+
+    Returns:
+        tuple: (start: dict, actions: list, end: dict or None)
+    """
+    start, actions, end = None, [], None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry['type'] == 'start':
+                start = entry
+            elif entry['type'] == 'action':
+                actions.append(entry)
+            elif entry['type'] == 'end':
+                end = entry
+    return start, actions, end
+
+
+def replay(path):
+    """
+    Re-run a trace against the model layer at full speed
+
+    Args:
+        path (str): Trace file path
+
+    Returns:
+        dict: 'actions', 'seconds', 'actions_per_second' and 'verified'
+            (True if the final state matches the recorded digest, None if
+            the trace has no digest)
+    """
+    start, actions, end = load_trace(path)
+    session = GameSession(Team.from_dict(start['team']), Player.from_columns(start['market']))
+
+    # Traces from before player ids refer to players by list position
+    def squad_id(a):
+        return a['player_id'] if 'player_id' in a else session.team.players[a['index']].player_id
+
+    def market_id(a):
+        return a['player_id'] if 'player_id' in a else session.market[a['index']].player_id
+
+    handlers = {
+        'train': lambda a: session.train(squad_id(a)),
+        'rest': lambda a: session.rest(squad_id(a)),
+        'play_match': lambda a: session.play_match(),
+        'advance_week': lambda a: session.advance_week(),
+        'buy': lambda a: session.buy(market_id(a)),
+    }
+
+    began = time.perf_counter()
+    for entry in actions:
+        random.seed(entry['seed'])
+        handlers[entry['action']](entry)
+    seconds = time.perf_counter() - began
+
+    verified = None
+    if end is not None:
+        verified = state_digest(session.team, session.market) == end['digest']
+    return {
+        'actions': len(actions),
+        'seconds': seconds,
+        'actions_per_second': len(actions) / seconds if seconds else 0.0,
+        'verified': verified,
+    }
+
+
+def replay_many(paths):
+    """
+    Replay many traces and sum up throughput
+
+    Args:
+        paths (list): Trace file paths
+
+    Returns:
+        dict: 'traces', 'actions', 'seconds', 'actions_per_second' and
+            'mismatches' (paths whose final state differed)
+    """
+    total_actions = 0
+    total_seconds = 0.0
+    mismatches = []
+    for path in paths:
+        report = replay(path)
+        total_actions += report['actions']
+        total_seconds += report['seconds']
+        if report['verified'] is False:
+            mismatches.append(path)
+    return {
+        'traces': len(paths),
+        'actions': total_actions,
+        'seconds': total_seconds,
+        'actions_per_second': total_actions / total_seconds if total_seconds else 0.0,
+        'mismatches': mismatches,
+    }
+
+
+def main():
+    """Command line entry point: replay the given trace files"""
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python session_trace.py TRACE.jsonl [TRACE.jsonl ...]")
+        return 2
+    report = replay_many(paths)
+    print(f"Replayed {report['traces']} traces, {report['actions']} actions "
+          f"in {report['seconds']:.3f}s ({report['actions_per_second']:.0f} actions/s)")
+    for path in report['mismatches']:
+        print(f"❌ Final state differs: {path}")
+    return 1 if report['mismatches'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
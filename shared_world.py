@@ -0,0 +1,370 @@
+"""
+shared_world.py
+Shared-memory world state module for Football Manager Simulator
+Stores player and club attributes as columns in shared memory so worker
+processes can read and write them without pickling Team or Player objects
+"""
+
+import random
+import threading
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+
+from player import Player
+from session import WEEKLY_STAMINA_RECOVERY, FORM_DRIFT
+from team import Team
+
+
+POSITIONS = ('GK', 'DEF', 'MID', 'FWD')
+NAME_BYTES = 48
+
+# Column name -> array typecode ('i' 32-bit int, 'q' 64-bit int)
+PLAYER_COLUMNS = {
+    'player_id': 'q',
+    'club': 'i',        # Club index, -1 for the transfer market
+    'position': 'i',    # Index into POSITIONS
+    'overall': 'i',
+    'age': 'i',
+    'salary': 'q',
+    'stamina': 'i',
+    'morale': 'i',
+    'form': 'i',
+    'goals': 'i',
+    'assists': 'i',
+    'matches_played': 'i',
+}
+
+CLUB_COLUMNS = {
+    'budget': 'q',
+    'wins': 'i',
+    'draws': 'i',
+    'losses': 'i',
+    'week': 'i',
+    'reputation': 'i',
+}
+
+# Where each club's players sit: create() stores players grouped by club, so
+# a club's rows are first_player .. first_player + player_count - 1
+CLUB_SLICE_COLUMNS = {
+    'first_player': 'q',
+    'player_count': 'i',
+}
+
+ITEM_SIZES = {'i': 4, 'q': 8}
+
+# Serializes attaches that briefly switch off resource tracker registration
+_attach_lock = threading.Lock()
+
+
+def _open_block(name, size=0, create=False):
+    """
+    Create or attach a shared memory block
+
+    Attached blocks are not registered with the resource tracker, so a
+    worker exiting never unlinks memory the parent still owns. Before
+    Python 3.13 attaching always registers, so registration is switched
+    off while the block is opened; unregistering afterwards instead would
+    remove the owner's registration from the tracker forked workers share.
+
+    Args:
+        name (str): Block name
+        size (int): Size in bytes (when creating)
+        create (bool): Create the block instead of attaching
+
+    Returns:
+        SharedMemory: The block
+    """
+    if create:
+        return shared_memory.SharedMemory(name=name, create=True, size=max(1, size))
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track argument
+        pass
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedWorld:
+    """
+    Column-oriented world state in shared memory
+
+    Every attribute is one shared block viewed as a typed array, e.g.
+    world.players['stamina'][i] or world.clubs['budget'][c]. Players are
+    stored grouped by club, with each club's slice recorded in
+    world.clubs['first_player'] / ['player_count'] (see club_rows), and the
+    market last. Club membership is fixed for the life of a world: the
+    'club' column is read-only, so to apply transfers rebuild the teams
+    with to_teams() and create() a new world. Names are fixed-width UTF-8.
+    The creating process owns the blocks and must unlink() them; workers
+    attach() with the picklable spec.
+
+    Attributes:
+        spec (dict): Picklable description used to attach (prefix and sizes)
+        players (dict): Column name -> memoryview over all players
+        clubs (dict): Column name -> memoryview over all clubs
+    """
+
+    def __init__(self, spec, create=False):
+        """
+        Open the blocks described by spec (use create() or attach() instead)
+
+        Args:
+            spec (dict): 'prefix', 'n_players' and 'n_clubs'
+            create (bool): Create the blocks instead of attaching
+        """
+        self.spec = spec
+        self._blocks = []
+        self.players = self._open_columns('p', PLAYER_COLUMNS, spec['n_players'], create)
+        self.clubs = self._open_columns('c', dict(CLUB_COLUMNS, **CLUB_SLICE_COLUMNS), spec['n_clubs'], create)
+        self.player_names = self._open('pname', NAME_BYTES * spec['n_players'], create)
+        self.club_names = self._open('cname', NAME_BYTES * spec['n_clubs'], create)
+        if not create:
+            self._freeze_membership()
+
+    def _freeze_membership(self):
+        """Make the 'club' column read-only (club_rows relies on it not changing)"""
+        self.players['club'] = self.players['club'].toreadonly()
+
+    def _open(self, suffix, size, create):
+        """Open one block and return a byte memoryview over it"""
+        block = _open_block(f"{self.spec['prefix']}_{suffix}", size, create)
+        self._blocks.append(block)
+        return block.buf[:size]
+
+    def _open_columns(self, kind, columns, count, create):
+        """Open a typed memoryview per column"""
+        return {
+            column: self._open(f"{kind}_{column}", ITEM_SIZES[code] * count, create).cast(code)
+            for column, code in columns.items()
+        }
+
+    @classmethod
+    def create(cls, teams, market=()):
+        """
+        Copy teams and market players into new shared blocks
+
+        Args:
+            teams (list): Teams (clubs) in the world
+            market (list): Players without a club
+
+        Returns:
+            SharedWorld: Owner of the new blocks
+        """
+        rows = [(c, p) for c, team in enumerate(teams) for p in team.players]
+        rows += [(-1, p) for p in market]
+        spec = {
+            'prefix': f"fm_{uuid.uuid4().hex[:12]}",
+            'n_players': len(rows),
+            'n_clubs': len(teams),
+        }
+        world = cls(spec, create=True)
+        cols = world.players
+        for i, (club, p) in enumerate(rows):
+            cols['club'][i] = club
+            cols['position'][i] = POSITIONS.index(p.position)
+            for column in PLAYER_COLUMNS:
+                if column not in ('club', 'position'):
+                    cols[column][i] = getattr(p, column)
+            world._set_name(world.player_names, i, p.name)
+        first = 0
+        for c, team in enumerate(teams):
+            for column in CLUB_COLUMNS:
+                world.clubs[column][c] = getattr(team, column)
+            world.clubs['first_player'][c] = first
+            world.clubs['player_count'][c] = len(team.players)
+            first += len(team.players)
+            world._set_name(world.club_names, c, team.name)
+        world._freeze_membership()
+        return world
+
+    @classmethod
+    def attach(cls, spec):
+        """
+        Attach to blocks created by another process
+
+        Args:
+            spec (dict): The creator's world.spec
+
+        Returns:
+            SharedWorld: View of the shared state
+        """
+        return cls(spec)
+
+    @staticmethod
+    def _set_name(view, index, name):
+        """Store a name in its fixed-width slot (truncated if too long)"""
+        data = name.encode('utf-8')[:NAME_BYTES].ljust(NAME_BYTES, b'\0')
+        view[index * NAME_BYTES:(index + 1) * NAME_BYTES] = data
+
+    @staticmethod
+    def _get_name(view, index):
+        """Read a name from its fixed-width slot"""
+        raw = bytes(view[index * NAME_BYTES:(index + 1) * NAME_BYTES])
+        return raw.rstrip(b'\0').decode('utf-8', errors='ignore')
+
+    def club_rows(self, club):
+        """
+        Player rows of a club
+
+        Rows are grouped by club when the world is created, and membership
+        cannot change afterwards, so the slice is exact.
+
+        Args:
+            club (int): Club row
+
+        Returns:
+            range: The club's player rows
+        """
+        first = self.clubs['first_player'][club]
+        return range(first, first + self.clubs['player_count'][club])
+
+    def player_name(self, index):
+        """
+        Get a player's name
+
+        Args:
+            index (int): Player row
+
+        Returns:
+            str: Player name
+        """
+        return self._get_name(self.player_names, index)
+
+    def club_name(self, index):
+        """
+        Get a club's name
+
+        Args:
+            index (int): Club row
+
+        Returns:
+            str: Club name
+        """
+        return self._get_name(self.club_names, index)
+
+    def to_player(self, index):
+        """
+        Build a Player object from a row
+
+        Args:
+            index (int): Player row
+
+        Returns:
+            Player: New player object
+        """
+        data = {column: self.players[column][index] for column in PLAYER_COLUMNS}
+        data['position'] = POSITIONS[data['position']]
+        data['name'] = self.player_name(index)
+        return Player.from_dict(data)
+
+    def to_teams(self):
+        """
+        Rebuild Team objects (with their players) from the shared state
+
+        Returns:
+            tuple: (teams: list, market: list)
+        """
+        teams = []
+        for c in range(self.spec['n_clubs']):
+            team = Team(self.club_name(c), self.clubs['budget'][c])
+            for column in CLUB_COLUMNS:
+                setattr(team, column, self.clubs[column][c])
+            teams.append(team)
+        market = []
+        clubs = self.players['club']
+        for i in range(self.spec['n_players']):
+            player = self.to_player(i)
+            if clubs[i] >= 0:
+                teams[clubs[i]].players.append(player)
+            else:
+                market.append(player)
+        return teams, market
+
+    def close(self):
+        """Release this process's views of the blocks"""
+        for view in list(self.players.values()) + list(self.clubs.values()):
+            view.release()
+        self.player_names.release()
+        self.club_names.release()
+        self.players = {}
+        self.clubs = {}
+        for block in self._blocks:
+            block.close()
+        self._blocks = []
+
+    def unlink(self):
+        """Free the shared blocks (owner only, once workers are done with them)"""
+        for block in self._blocks:
+            block.unlink()
+        self.close()
+
+
+def weekly_recovery(spec, start, stop, seed=None):
+    """
+    Worker task: weekly stamina recovery and form drift for a range of players
+
+    Mirrors the per-player part of session.advance_week (with its
+    recovery constants) for players with a club. Run it in worker
+    processes over disjoint ranges.
+
+    Args:
+        spec (dict): SharedWorld.spec
+        start (int): First player row
+        stop (int): Row after the last player
+        seed (int): Random seed for the form changes
+
+    Returns:
+        int: Number of players updated
+    """
+    world = SharedWorld.attach(spec)
+    try:
+        rng = random.Random(seed)
+        clubs = world.players['club']
+        stamina = world.players['stamina']
+        form = world.players['form']
+        updated = 0
+        for i in range(start, stop):
+            if clubs[i] < 0:
+                continue
+            stamina[i] = min(100, stamina[i] + WEEKLY_STAMINA_RECOVERY)
+            form[i] = max(50, min(95, form[i] + rng.randint(-FORM_DRIFT, FORM_DRIFT)))
+            updated += 1
+        return updated
+    finally:
+        world.close()
+
+
+def club_strength(spec, club):
+    """
+    Worker task: a club's team strength computed straight from the columns
+
+    Same formula as Team.get_team_strength and Player.get_match_rating.
+    Only the club's own slice of rows is read (see SharedWorld.club_rows).
+
+    Args:
+        spec (dict): SharedWorld.spec
+        club (int): Club row
+
+    Returns:
+        float: Average match rating of the club's best 11
+    """
+    world = SharedWorld.attach(spec)
+    try:
+        p = world.players
+        ratings = sorted(
+            (
+                max(50, min(99, p['overall'][i] + (p['form'][i] - 70) * 0.3
+                            - (100 - p['stamina'][i]) * 0.1 + (p['morale'][i] - 50) * 0.15))
+                for i in world.club_rows(club)
+            ),
+            reverse=True
+        )[:11]
+        return sum(ratings) / len(ratings) if ratings else 0
+    finally:
+        world.close()
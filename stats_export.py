@@ -0,0 +1,296 @@
+"""
+stats_export.py
+Statistics export module for Football Manager Simulator
+Streams player, match and season statistics to CSV or JSON Lines
+
+Rows are produced by generators and written one at a time, so exports of
+any size run in constant memory. Examples:
+    python stats_export.py matches --format csv -o matches.csv
+    python stats_export.py seasons --where club="Dream FC" --columns season,points
+    python stats_export.py players --save football_manager_save.json --where position=FWD
+    python stats_export.py players --slot "Dream FC" --columns name,overall
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from itertools import chain
+
+from player import PLAYER_FIELDS
+
+
+# Weeks in a season, for grouping history by season
+SEASON_WEEKS = 38
+
+# Columns of each source, in output order
+MATCH_COLUMNS = ('id', 'season', 'week', 'home', 'away', 'home_score', 'away_score', 'result', 'played_at')
+SEASON_COLUMNS = ('season', 'club', 'played', 'wins', 'draws', 'losses',
+                  'goals_for', 'goals_against', 'points')
+SCORER_COLUMNS = ('season', 'club', 'player_id', 'player', 'goals', 'assists')
+PLAYER_COLUMNS = ('club',) + PLAYER_FIELDS
+
+_SEASON = f"((week - 1) / {SEASON_WEEKS} + 1)"
+
+
+def _query(conn, sql, params=()):
+    """Yield query rows as dicts, fetched lazily from the cursor"""
+    cursor = conn.execute(sql, params)
+    names = [d[0] for d in cursor.description]
+    for row in cursor:
+        yield dict(zip(names, row))
+
+
+def match_rows(conn):
+    """
+    Every recorded fixture, oldest first
+
+    Args:
+        conn (sqlite3.Connection): Match history database
+
+    Yields:
+        dict: One row per match; result is 'H', 'D' or 'A'
+    """
+    return _query(conn, f"""
+        SELECT id, {_SEASON} AS season, week, home, away, home_score, away_score,
+               CASE WHEN home_score > away_score THEN 'H'
+                    WHEN home_score < away_score THEN 'A' ELSE 'D' END AS result,
+               played_at
+        FROM fixtures ORDER BY id
+    """)
+
+
+def season_rows(conn):
+    """
+    Each club's record per season (aggregated inside SQLite)
+
+    Args:
+        conn (sqlite3.Connection): Match history database
+
+    Yields:
+        dict: One row per club and season
+    """
+    return _query(conn, f"""
+        SELECT season, club, COUNT(*) AS played,
+               SUM(scored > conceded) AS wins,
+               SUM(scored = conceded) AS draws,
+               SUM(scored < conceded) AS losses,
+               SUM(scored) AS goals_for,
+               SUM(conceded) AS goals_against,
+               3 * SUM(scored > conceded) + SUM(scored = conceded) AS points
+        FROM (
+            SELECT {_SEASON} AS season, home AS club, home_score AS scored, away_score AS conceded
+            FROM fixtures
+            UNION ALL
+            SELECT {_SEASON}, away, away_score, home_score FROM fixtures
+        )
+        GROUP BY season, club
+        ORDER BY season, points DESC, club
+    """)
+
+
+def scorer_rows(conn):
+    """
+    Goals and assists per player per season from the goal events
+
+    Players are told apart by id (events recorded before ids have a null
+    id and are grouped by name).
+
+    Args:
+        conn (sqlite3.Connection): Match history database
+
+    Yields:
+        dict: One row per player, club and season
+    """
+    return _query(conn, f"""
+        SELECT {_SEASON} AS season, e.team AS club, e.player_id AS player_id, e.player AS player,
+               SUM(e.kind = 'goal') AS goals,
+               SUM(e.kind = 'assist') AS assists
+        FROM goal_events e JOIN fixtures f ON f.id = e.fixture_id
+        GROUP BY season, club, player_id, player
+        ORDER BY season, goals DESC, assists DESC, club, player, player_id
+    """)
+
+
+def player_rows(teams, market=()):
+    """
+    Current attributes of every player in the given squads and market
+
+    Args:
+        teams (list): Teams whose squads to export
+        market (list): Transfer market players (club is empty)
+
+    Yields:
+        dict: One row per player
+    """
+    for team in teams:
+        for player in team.players:
+            row = {'club': team.name}
+            row.update((field, getattr(player, field)) for field in PLAYER_FIELDS)
+            yield row
+    for player in market:
+        row = {'club': ''}
+        row.update((field, getattr(player, field)) for field in PLAYER_FIELDS)
+        yield row
+
+
+def select(rows, columns=None, where=None):
+    """
+    Filter rows and pick columns, lazily
+
+    Args:
+        rows (iterable): Row dicts
+        columns (list): Columns to keep, in order (all if None)
+        where (dict): Column -> required value, or a callable taking the
+            value and returning True to keep the row
+
+    Yields:
+        dict: Selected rows
+    """
+    tests = []
+    for column, wanted in (where or {}).items():
+        if callable(wanted):
+            tests.append((column, wanted))
+        else:
+            tests.append((column, lambda value, wanted=wanted: str(value) == str(wanted)))
+    for row in rows:
+        if all(test(row[column]) for column, test in tests):
+            yield row if columns is None else {c: row[c] for c in columns}
+
+
+def write_csv(rows, out, columns=None):
+    """
+    Write rows as CSV with a header line
+
+    Args:
+        rows (iterable): Row dicts
+        out: Text file object
+        columns (list): Header (taken from the first row if None)
+
+    Returns:
+        int: Rows written
+    """
+    rows = iter(rows)
+    if columns is None:
+        first = next(rows, None)
+        if first is None:
+            return 0
+        columns = list(first)
+        rows = chain([first], rows)
+    writer = csv.DictWriter(out, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows, out):
+    """
+    Write rows as JSON Lines
+
+    Args:
+        rows (iterable): Row dicts
+        out: Text file object
+
+    Returns:
+        int: Rows written
+    """
+    count = 0
+    for row in rows:
+        out.write(json.dumps(row, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def export(rows, out, fmt='csv', columns=None, where=None):
+    """
+    Filter, select and write rows
+
+    Args:
+        rows (iterable): Row dicts from one of the *_rows sources
+        out: Text file object
+        fmt (str): 'csv' or 'jsonl'
+        columns (list): Columns to keep (all if None)
+        where (dict): Filters, as select()
+
+    Returns:
+        int: Rows written
+    """
+    selected = select(rows, columns, where)
+    if fmt == 'csv':
+        return write_csv(selected, out, columns)
+    if fmt == 'jsonl':
+        return write_jsonl(selected, out)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def _parse_where(items):
+    """Turn ['col=value', ...] into a where dict"""
+    where = {}
+    for item in items:
+        column, sep, value = item.partition('=')
+        if not sep:
+            raise SystemExit(f"Bad filter (expected column=value): {item}")
+        where[column.strip()] = value.strip().strip('"')
+    return where
+
+
+def main():
+    """Command line entry point"""
+    from utils import load_game, load_game_from_slot
+
+    parser = argparse.ArgumentParser(description="Export Football Manager statistics")
+    parser.add_argument('source', choices=('matches', 'seasons', 'scorers', 'players'))
+    parser.add_argument('--db', default='football_manager_history.db', help="match history database")
+    game = parser.add_mutually_exclusive_group()
+    game.add_argument('--save', default='football_manager_save.json', help="save file (players)")
+    game.add_argument('--slot', help="named save slot (players; instead of --save)")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+    parser.add_argument('--columns', help="comma-separated columns to keep")
+    parser.add_argument('--where', action='append', default=[], help="column=value filter (repeatable)")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    columns = [c.strip() for c in args.columns.split(',')] if args.columns else None
+    where = _parse_where(args.where)
+    known = {'matches': MATCH_COLUMNS, 'seasons': SEASON_COLUMNS,
+             'scorers': SCORER_COLUMNS, 'players': PLAYER_COLUMNS}[args.source]
+    unknown = [c for c in (columns or []) + list(where) if c not in known]
+    if unknown:
+        parser.error(f"Unknown columns for {args.source}: {', '.join(unknown)}")
+
+    conn = None
+    if args.source == 'players':
+        if args.slot is not None:
+            team, market, _ = load_game_from_slot(args.slot)
+            if team is None:
+                parser.error(f"No saved game in slot '{args.slot}'")
+        else:
+            team, market, _ = load_game(args.save)
+            if team is None:
+                parser.error(f"No saved game in {args.save}")
+        rows = player_rows([team], market)
+    else:
+        # sqlite3 would create a missing database and fail on the first query
+        if not os.path.exists(args.db):
+            parser.error(f"No match history database at {args.db}")
+        conn = sqlite3.connect(args.db)
+        rows = {'matches': match_rows, 'seasons': season_rows, 'scorers': scorer_rows}[args.source](conn)
+
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        count = export(rows, out, args.format, columns, where)
+    finally:
+        if args.output:
+            out.close()
+        if conn is not None:
+            conn.close()
+    print(f"Exported {count} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
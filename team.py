@@ -7,6 +7,12 @@ Manages team data, squad, and finances
 from player import Player
 
 
+# Most players a squad can hold
+MAX_SQUAD_SIZE = 25
+# Players in a starting lineup (team strength averages the best this many)
+STARTERS = 11
+
+
 class Team:
     """
     Team class representing a football club
@@ -49,7 +55,7 @@ class Team:
         Returns:
             bool: True if successful, False if squad is full
         """
-        if len(self.players) < 25:
+        if len(self.players) < MAX_SQUAD_SIZE:
             self.players.append(player)
             return True
         return False
@@ -64,10 +70,22 @@ class Team:
         Returns:
             bool: True if successful, False if player not found
         """
-        if player in self.players:
+        try:
             self.players.remove(player)
-            return True
-        return False
+        except ValueError:
+            return False
+        return True
+    
+    def set_starting_lineup(self, lineup):
+        """
+        Move the given players to the front of the squad so they start
+        
+        Args:
+            lineup (list): Players to start (must belong to this team)
+        """
+        starters = [p for p in lineup if p in self.players]
+        bench = [p for p in self.players if p not in starters]
+        self.players = starters + bench
     
     def get_team_strength(self):
         """
@@ -80,9 +98,9 @@ class Team:
             return 0
         
         # Get ratings of top 11 players
-        top_11 = sorted(self.players, key=lambda p: p.get_match_rating(), reverse=True)[:11]
+        top_11 = sorted(self.players, key=lambda p: p.get_match_rating(), reverse=True)[:STARTERS]
         total = sum(p.get_match_rating() for p in top_11)
-        return total / min(11, len(self.players))
+        return total / min(STARTERS, len(self.players))
     
     def pay_salaries(self):
         """
@@ -0,0 +1,10 @@
+"""
+conftest.py
+Test configuration for Football Manager Simulator
+Makes the game modules at the repository root importable from the tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
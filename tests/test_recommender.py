@@ -0,0 +1,59 @@
+"""
+test_recommender.py
+Transfer recommender tests for Football Manager Simulator
+"""
+
+import random
+from itertools import combinations
+
+import pytest
+
+from recommender import TransferRecommender
+from team import Team, MAX_SQUAD_SIZE
+from utils import create_random_player
+
+
+POSITIONS = ['GK', 'DEF', 'MID', 'FWD']
+
+
+def _strength_with(team, signings):
+    """Team strength after adding signings"""
+    squad = Team(team.name, team.budget)
+    squad.players = team.players + list(signings)
+    return squad.get_team_strength()
+
+
+def _brute_force_gain(team, market, recommender):
+    """Best strength gain over every affordable set of signings"""
+    budget = team.budget - sum(p.salary for p in team.players) * recommender.salary_weeks
+    base = team.get_team_strength()
+    best = 0.0
+    slots = MAX_SQUAD_SIZE - len(team.players)
+    for count in range(1, min(slots, len(market)) + 1):
+        for signings in combinations(market, count):
+            if sum(recommender.signing_cost(p) for p in signings) <= budget:
+                best = max(best, _strength_with(team, signings) - base)
+    return best
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_matches_brute_force_on_small_markets(seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    team = Team("Test FC", 0)
+    team.players = [create_random_player(rng.choice(POSITIONS))
+                    for _ in range(rng.choice([3, 6, 9, 10, 11, 14, 18]))]
+    market = [create_random_player(rng.choice(POSITIONS)) for _ in range(9)]
+    recommender = TransferRecommender(market)
+    team.budget = (sum(p.salary for p in team.players)
+                   + rng.randint(0, 4) * max(recommender.signing_cost(p) for p in market))
+
+    players, gain, _ = recommender.recommend(team)
+
+    expected = _brute_force_gain(team, market, recommender)
+    assert gain == pytest.approx(expected, abs=1e-9)
+    if players:
+        assert gain > 0
+        assert _strength_with(team, players) - team.get_team_strength() == pytest.approx(gain)
+    else:
+        assert gain == 0.0
@@ -0,0 +1,56 @@
+"""
+test_shared_world.py
+Shared-memory world state tests for Football Manager Simulator
+"""
+
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from shared_world import SharedWorld, club_strength
+from session import create_team
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Creates a world, runs club_strength on a process pool and unlinks it
+POOL_SCRIPT = """
+import random
+from concurrent.futures import ProcessPoolExecutor
+from shared_world import SharedWorld, club_strength
+from session import create_team
+
+random.seed(0)
+teams = [create_team(f"Club {i}") for i in range(8)]
+world = SharedWorld.create(teams)
+with ProcessPoolExecutor(max_workers=2) as pool:
+    strengths = list(pool.map(club_strength, [world.spec] * len(teams), range(len(teams))))
+world.unlink()
+assert strengths == [team.get_team_strength() for team in teams]
+print("ok")
+"""
+
+
+def test_pool_workers_leave_resource_tracker_clean():
+    result = subprocess.run(
+        [sys.executable, '-c', POOL_SCRIPT],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
+    assert result.stderr == ""
+
+
+def test_club_membership_is_read_only():
+    random.seed(1)
+    teams = [create_team("A"), create_team("B")]
+    world = SharedWorld.create(teams)
+    try:
+        assert club_strength(world.spec, 1) == teams[1].get_team_strength()
+        with pytest.raises(TypeError):
+            world.players['club'][0] = 1
+    finally:
+        world.unlink()
@@ -0,0 +1,41 @@
+"""
+test_transfer_engine.py
+Transfer engine tests for Football Manager Simulator
+"""
+
+import random
+
+import transfer_engine
+from transfer_engine import Ask, Bid, OrderBook, MIN_SQUAD_SIZE, run_window
+from session import create_team
+from utils import generate_transfer_market, create_random_player
+
+
+def test_default_world_trades():
+    random.seed(0)
+    clubs = [create_team(f"AI Club {i}") for i in range(20)]
+    market = generate_transfer_market()
+    market_size = len(market)
+
+    trades = run_window(clubs, market, random.Random(1))
+
+    assert trades
+    assert len(market) == market_size - sum(1 for t in trades if t.seller is None)
+    for club in clubs:
+        assert MIN_SQUAD_SIZE <= len(club.players) <= transfer_engine.MAX_SQUAD_SIZE
+        assert club.budget >= 0
+    for trade in trades:
+        assert trade.player in trade.buyer.players
+
+
+def test_blocked_ask_stays_listed():
+    random.seed(0)
+    seller = create_team("Seller")
+    player = create_random_player('MID')
+    player.overall = 70
+    ask = Ask(1000000, player, seller)
+    book = OrderBook([ask])
+    bid = Bid(None, 'MID', 2000000, 65)
+
+    assert book.best_ask(bid, lambda a: False, lambda a: False) is None
+    assert book.best_ask(bid, lambda a: False, lambda a: True) is ask
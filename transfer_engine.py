@@ -0,0 +1,304 @@
+"""
+transfer_engine.py
+Multi-club transfer engine for Football Manager Simulator
+AI clubs post bids and asks each window and an order book clears them
+"""
+
+import heapq
+import random
+from collections import namedtuple, Counter
+from itertools import count
+
+from team import MAX_SQUAD_SIZE
+from utils import calculate_transfer_fee
+from valuation import default_valuation, reputation_factor, FEE_PER_OVERALL, NEUTRAL_REPUTATION
+
+
+MIN_SQUAD_SIZE = 16
+POSITIONS = ('GK', 'DEF', 'MID', 'FWD')
+
+# Players a club wants per position (same shape as the initial squad)
+SQUAD_NEEDS = {'GK': 2, 'DEF': 6, 'MID': 6, 'FWD': 4}
+
+# Weeks of wages a club keeps back from transfer spending
+WAGE_RESERVE_WEEKS = 1
+
+# Bids offer the going rate for the overall wanted times a random premium in this range
+BID_PREMIUM = (1.0, 1.3)
+
+# A club lists its weakest player at a position this far below the position's best
+QUALITY_GAP = 10
+
+# A club wants to buy a player of this position, of at least this overall, up to max_price
+Bid = namedtuple('Bid', ['club', 'position', 'max_price', 'min_overall'])
+
+# A player for sale at a price (seller is None for free-market players)
+Ask = namedtuple('Ask', ['price', 'player', 'seller'])
+
+# A completed transfer
+Trade = namedtuple('Trade', ['buyer', 'seller', 'player', 'price'])
+
+
+def reference_price(overall, reputation=NEUTRAL_REPUTATION):
+    """
+    Going market price of a player of a given overall
+
+    This is the valuation model with every player-specific factor neutral,
+    so it is what a typical player of that level is listed at.
+
+    Args:
+        overall (int): Overall rating
+        reputation (int): Selling club's reputation
+
+    Returns:
+        int: Price in pounds
+    """
+    return int(overall * FEE_PER_OVERALL * reputation_factor(reputation))
+
+
+def spare_budget(club):
+    """
+    Budget a club can spend on fees while keeping its wage reserve
+
+    Args:
+        club (Team): Club
+
+    Returns:
+        int: Spendable pounds (0 if none)
+    """
+    wages = sum(p.salary for p in club.players)
+    return max(0, club.budget - wages * WAGE_RESERVE_WEEKS)
+
+
+def club_orders(club, rng=random):
+    """
+    Generate one AI club's orders for this window
+
+    Bids are priced from the going rate for the overall wanted
+    (reference_price, with a premium) and capped at the club's spare budget:
+    a club short of a position bids for it, and every club bids to replace
+    its weakest player. A club lists players beyond its needs at a position,
+    and also its weakest player at a position where that player is
+    QUALITY_GAP or more below the position's best, priced with the club's
+    reputation.
+
+    Args:
+        club (Team): AI club
+        rng: Random source
+
+    Returns:
+        tuple: (bids: list of Bid, asks: list of Ask)
+    """
+    bids = []
+    asks = []
+    spare = spare_budget(club)
+    by_position = {pos: [] for pos in POSITIONS}
+    for p in club.players:
+        by_position.setdefault(p.position, []).append(p)
+    for players in by_position.values():
+        players.sort(key=lambda p: (p.overall, p.player_id))
+
+    def bid(pos, min_overall):
+        price = int(reference_price(min_overall) * rng.uniform(*BID_PREMIUM))
+        if spare > 0:
+            bids.append(Bid(club, pos, min(spare, price), min_overall))
+
+    for pos, needed in SQUAD_NEEDS.items():
+        players = by_position[pos]
+        if len(players) < needed:
+            bid(pos, players[0].overall if players else 60)
+        surplus = players[:max(0, len(players) - needed)]
+        if not surplus and len(players) > 1 and players[-1].overall - players[0].overall >= QUALITY_GAP:
+            surplus = players[:1]
+        for player in surplus:
+            price = int(calculate_transfer_fee(player, club.reputation) * rng.uniform(0.9, 1.1))
+            asks.append(Ask(price, player, club))
+
+    # Replace the weakest player in the squad with a slightly better one
+    pos = min(POSITIONS, key=lambda q: by_position[q][0].overall if by_position[q] else 0)
+    weakest = by_position[pos][0].overall if by_position[pos] else 60
+    bid(pos, weakest + rng.randint(1, 3))
+    return bids, asks
+
+
+def ai_orders(clubs, market=(), rng=random):
+    """
+    Generate this window's orders for AI clubs and the free market
+
+    Each club's orders come from club_orders. Free-market players are
+    listed at calculate_transfer_fee.
+
+    Args:
+        clubs (list): AI clubs (Team objects)
+        market (list): Free-market players
+        rng: Random source
+
+    Returns:
+        tuple: (bids: list of Bid, asks: list of Ask)
+    """
+    bids = []
+    asks = [Ask(fee, p, None) for p, fee in zip(market, default_valuation.value_many(market))]
+    for club in clubs:
+        club_bids, club_asks = club_orders(club, rng)
+        bids.extend(club_bids)
+        asks.extend(club_asks)
+    return bids, asks
+
+
+class OrderBook:
+    """
+    Asks indexed by (position, overall), each bucket a price-ordered heap
+
+    A bid only has to look at the cheapest ask in each qualifying overall
+    bucket, so clearing costs O(buckets * log n) per bid regardless of the
+    number of listings.
+    """
+
+    def __init__(self, asks):
+        """
+        Build the book
+
+        Args:
+            asks (list): Ask orders
+        """
+        self._tiebreak = count()
+        self._buckets = {}
+        for ask in asks:
+            key = (ask.player.position, ask.player.overall)
+            self._buckets.setdefault(key, []).append((ask.price, next(self._tiebreak), ask))
+        for heap in self._buckets.values():
+            heapq.heapify(heap)
+        self._overalls = {}
+        for pos, overall in self._buckets:
+            self._overalls.setdefault(pos, []).append(overall)
+        for overalls in self._overalls.values():
+            overalls.sort()
+
+    def best_ask(self, bid, is_sold, can_sell):
+        """
+        Find and remove the cheapest available ask for a bid
+
+        Asks for players already sold are dropped from the book for good.
+        Asks that cannot be filled right now (e.g. the seller is at its
+        minimum squad size) are skipped but stay listed, since a later
+        trade can make them fillable again.
+
+        Args:
+            bid (Bid): Bid to fill
+            is_sold (callable): is_sold(ask) -> bool, True once the player is gone
+            can_sell (callable): can_sell(ask) -> bool, False while the ask is blocked
+
+        Returns:
+            Ask: Cheapest matching ask, or None
+        """
+        best_heap = None
+        best_price = None
+        for overall in self._overalls.get(bid.position, ()):
+            if overall < bid.min_overall:
+                continue
+            heap = self._buckets[(bid.position, overall)]
+            blocked = []
+            while heap and heap[0][0] <= bid.max_price:
+                if is_sold(heap[0][2]):
+                    heapq.heappop(heap)
+                elif not can_sell(heap[0][2]):
+                    blocked.append(heapq.heappop(heap))
+                else:
+                    if best_price is None or heap[0][0] < best_price:
+                        best_heap, best_price = heap, heap[0][0]
+                    break
+            for entry in blocked:
+                heapq.heappush(heap, entry)
+        if best_heap is None:
+            return None
+        return heapq.heappop(best_heap)[2]
+
+    def relist(self, ask):
+        """
+        Put an ask taken by best_ask back in the book
+
+        Args:
+            ask (Ask): Ask to relist
+        """
+        key = (ask.player.position, ask.player.overall)
+        heapq.heappush(self._buckets[key], (ask.price, next(self._tiebreak), ask))
+
+
+def clear_orders(bids, asks, market=None):
+    """
+    Match bids against asks and carry out the transfers
+
+    Bids are filled highest price first, each with the cheapest qualifying
+    ask, at the ask price. A trade needs the buyer to afford it from its
+    spare budget (keeping its wage reserve) and have a free squad place
+    (25-player cap), and the seller to keep at least MIN_SQUAD_SIZE players.
+
+    Args:
+        bids (list): Bid orders
+        asks (list): Ask orders
+        market (list): Free-market list; sold free-market players are removed
+
+    Returns:
+        list: Trade for every completed transfer
+    """
+    book = OrderBook(asks)
+    squad_sizes = Counter()
+    for bid in bids:
+        squad_sizes[id(bid.club)] = len(bid.club.players)
+    for ask in asks:
+        if ask.seller is not None:
+            squad_sizes[id(ask.seller)] = len(ask.seller.players)
+    sold = set()
+
+    def is_sold(ask):
+        return id(ask.player) in sold
+
+    def can_sell(ask):
+        return ask.seller is None or squad_sizes[id(ask.seller)] > MIN_SQUAD_SIZE
+
+    trades = []
+    for bid in sorted(bids, key=lambda b: b.max_price, reverse=True):
+        buyer = bid.club
+        if squad_sizes[id(buyer)] >= MAX_SQUAD_SIZE:
+            continue
+        bid = bid._replace(max_price=min(bid.max_price, spare_budget(buyer)))
+        # Never buy your own player: set such asks aside and relist them after
+        own = []
+        ask = book.best_ask(bid, is_sold, can_sell)
+        while ask is not None and ask.seller is buyer:
+            own.append(ask)
+            ask = book.best_ask(bid, is_sold, can_sell)
+        for own_ask in own:
+            book.relist(own_ask)
+        if ask is None:
+            continue
+
+        buyer.budget -= ask.price
+        buyer.add_player(ask.player)
+        squad_sizes[id(buyer)] += 1
+        if ask.seller is not None:
+            ask.seller.budget += ask.price
+            ask.seller.remove_player(ask.player)
+            squad_sizes[id(ask.seller)] -= 1
+        sold.add(id(ask.player))
+        trades.append(Trade(buyer, ask.seller, ask.player, ask.price))
+
+    if market is not None and sold:
+        market[:] = [p for p in market if id(p) not in sold]
+    return trades
+
+
+def run_window(clubs, market, rng=random):
+    """
+    Run one transfer window for AI clubs
+
+    Args:
+        clubs (list): AI clubs
+        market (list): Free-market players (sold players are removed)
+        rng: Random source
+
+    Returns:
+        list: Completed trades
+    """
+    bids, asks = ai_orders(clubs, market, rng)
+    return clear_orders(bids, asks, market)
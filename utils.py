@@ -5,10 +5,17 @@ Helper functions for player generation, file operations, etc.
 """
 
 import random
+import hashlib
 import json
+import os
+import re
+import tempfile
+import uuid
 from datetime import datetime
 from player import Player
 from team import Team
+from game_calendar import GameCalendar
+from valuation import default_valuation, NEUTRAL_REPUTATION
 
 
 # Player name pools for generation
@@ -24,6 +31,10 @@ LAST_NAMES = [
     'Taylor', 'Anderson', 'Thomas', 'Jackson', 'White', 'Harris'
 ]
 
+# Named save slots live in SAVE_DIR, listed in its SAVE_INDEX file
+SAVE_DIR = 'saves'
+SAVE_INDEX = 'index.json'
+
 
 def generate_player_name():
     """
@@ -95,20 +106,25 @@ def generate_transfer_market(players_per_position=5):
     return market
 
 
-def calculate_transfer_fee(player):
+def calculate_transfer_fee(player, reputation=NEUTRAL_REPUTATION):
     """
     Calculate transfer fee for a player
     
+    Priced by valuation.player_value from overall, age, form, goal
+    contributions, wage and the seller's reputation; cached until one of
+    those changes.
+    
     Args:
         player (Player): The player
+        reputation (int): Selling club's reputation (neutral for the free market)
         
     Returns:
         int: Transfer fee in pounds
     """
-    return player.overall * 500000
+    return default_valuation.value(player, reputation)
 
 
-def save_game(team, available_players, filename='football_manager_save.json'):
+def save_game(team, available_players, filename='football_manager_save.json', calendar=None):
     """
     Save game state to JSON file
     
@@ -116,6 +132,7 @@ def save_game(team, available_players, filename='football_manager_save.json'):
         team (Team): Current team
         available_players (list): List of available players in market
         filename (str): Save file name
+        calendar (GameCalendar): Scheduled events to save (optional)
         
     Returns:
         bool: True if successful, False otherwise
@@ -123,12 +140,13 @@ def save_game(team, available_players, filename='football_manager_save.json'):
     try:
         save_data = {
             'team': team.to_dict(),
-            'available_players': [p.to_dict() for p in available_players],
+            'available_players_columns': Player.to_columns(available_players),
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+        if calendar is not None:
+            save_data['calendar'] = calendar.to_dict()
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, indent=2, ensure_ascii=False)
+        _write_json_atomic(filename, save_data, indent=2)
         
         return True
     except Exception as e:
@@ -136,28 +154,214 @@ def save_game(team, available_players, filename='football_manager_save.json'):
         return False
 
 
-def load_game(filename='football_manager_save.json'):
+def load_game(filename='football_manager_save.json', lazy_market=False, with_calendar=False):
     """
     Load game state from JSON file
     
     Args:
         filename (str): Save file name
+        lazy_market (bool): Build market players only when first accessed
+        with_calendar (bool): Also return the saved calendar (saves without
+            one get an empty calendar at the team's week)
         
     Returns:
-        tuple: (team, available_players, timestamp) or (None, None, None) if failed
+        tuple: (team, available_players, timestamp), plus the calendar if
+            with_calendar is set; all None if failed
     """
     try:
         with open(filename, 'r', encoding='utf-8') as f:
             save_data = json.load(f)
         
         team = Team.from_dict(save_data['team'])
-        available_players = [Player.from_dict(p) for p in save_data['available_players']]
+        if 'available_players_columns' in save_data:
+            available_players = Player.from_columns(save_data['available_players_columns'], lazy_market)
+        else:
+            # Saves from older versions store one dictionary per player
+            available_players = [Player.from_dict(p) for p in save_data['available_players']]
         timestamp = save_data.get('timestamp', 'Unknown')
         
+        if with_calendar:
+            if 'calendar' in save_data:
+                calendar = GameCalendar.from_dict(save_data['calendar'])
+            else:
+                calendar = GameCalendar(team.week)
+            return team, available_players, timestamp, calendar
         return team, available_players, timestamp
     except Exception as e:
         print(f"Load error: {str(e)}")
-        return None, None, None
+        return (None,) * (4 if with_calendar else 3)
+
+
+def _write_json_atomic(filename, data, indent=None):
+    """
+    Write JSON to a temporary file and move it into place
+    
+    Readers never see a half-written file: the rename is atomic.
+    
+    Args:
+        filename (str): Destination file name
+        data: JSON-serialisable data
+        indent (int): JSON indentation (None for compact)
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def slot_filename(slot, save_dir=SAVE_DIR, index=None):
+    """
+    Get the save file path for a named slot
+    
+    A slot keeps the file recorded in its index entry. A new slot gets a
+    readable name plus a hash of the exact slot name, so names that only
+    differ in punctuation or non-ASCII characters never share a file. A
+    file that another index entry points to is never reused.
+    
+    Args:
+        slot (str): Slot name
+        save_dir (str): Directory holding save slots
+        index (dict): Slot index (read from save_dir if None)
+        
+    Returns:
+        str: Save file path
+    """
+    if index is None:
+        index = read_save_index(save_dir)
+    taken = {entry.get('file') for name, entry in index.items() if name != slot}
+    entry = index.get(slot)
+    if entry and entry.get('file') and entry['file'] not in taken:
+        return os.path.join(save_dir, entry['file'])
+    
+    safe = re.sub(r'[^A-Za-z0-9_-]+', '_', slot.strip())[:40].strip('_') or 'slot'
+    digest = hashlib.sha1(slot.encode('utf-8')).hexdigest()[:10]
+    filename = f"{safe}-{digest}.json"
+    while filename in taken:
+        filename = f"{safe}-{uuid.uuid4().hex[:10]}.json"
+    return os.path.join(save_dir, filename)
+
+
+def read_save_index(save_dir=SAVE_DIR):
+    """
+    Read the save slot index without opening any save file
+    
+    Args:
+        save_dir (str): Directory holding save slots
+        
+    Returns:
+        dict: Slot name -> metadata (club, week, record, budget, timestamp, file)
+    """
+    try:
+        with open(os.path.join(save_dir, SAVE_INDEX), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def list_save_slots(save_dir=SAVE_DIR):
+    """
+    List save slots from the index, most recent first
+    
+    Args:
+        save_dir (str): Directory holding save slots
+        
+    Returns:
+        list: (slot: str, metadata: dict) tuples
+    """
+    index = read_save_index(save_dir)
+    return sorted(index.items(), key=lambda item: item[1].get('timestamp', ''), reverse=True)
+
+
+def save_game_to_slot(team, available_players, slot, save_dir=SAVE_DIR, calendar=None):
+    """
+    Save game state to a named slot and update the slot index
+    
+    The save file is written before the index, and both are replaced
+    atomically, so the index never points at a missing or partial save.
+    
+    Args:
+        team (Team): Current team
+        available_players (list): List of available players in market
+        slot (str): Slot name
+        save_dir (str): Directory holding save slots
+        calendar (GameCalendar): Scheduled events to save (optional)
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        os.makedirs(save_dir, exist_ok=True)
+        index = read_save_index(save_dir)
+        filename = slot_filename(slot, save_dir, index)
+        if not save_game(team, available_players, filename, calendar):
+            return False
+        
+        index[slot] = {
+            'club': team.name,
+            'week': team.week,
+            'record': f"{team.wins}W {team.draws}D {team.losses}L",
+            'budget': team.budget,
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'file': os.path.basename(filename)
+        }
+        _write_json_atomic(os.path.join(save_dir, SAVE_INDEX), index, indent=2)
+        return True
+    except Exception as e:
+        print(f"Save error: {str(e)}")
+        return False
+
+
+def load_game_from_slot(slot, save_dir=SAVE_DIR, lazy_market=False, with_calendar=False):
+    """
+    Load game state from a named slot
+    
+    Args:
+        slot (str): Slot name
+        save_dir (str): Directory holding save slots
+        lazy_market (bool): Build market players only when first accessed
+        with_calendar (bool): Also return the saved calendar (see load_game)
+        
+    Returns:
+        tuple: As load_game
+    """
+    entry = read_save_index(save_dir).get(slot)
+    if entry is None:
+        return (None,) * (4 if with_calendar else 3)
+    return load_game(os.path.join(save_dir, entry['file']), lazy_market, with_calendar)
+
+
+def delete_save_slot(slot, save_dir=SAVE_DIR):
+    """
+    Delete a save slot and its index entry
+    
+    The save file is kept if another index entry still points to it
+    (slots saved before file names were unique may share one).
+    
+    Args:
+        slot (str): Slot name
+        save_dir (str): Directory holding save slots
+        
+    Returns:
+        bool: True if the slot existed
+    """
+    index = read_save_index(save_dir)
+    entry = index.pop(slot, None)
+    if entry is None:
+        return False
+    # Drop the index entry first so a listed slot always has its file
+    _write_json_atomic(os.path.join(save_dir, SAVE_INDEX), index, indent=2)
+    if any(other.get('file') == entry['file'] for other in index.values()):
+        return True
+    try:
+        os.remove(os.path.join(save_dir, entry['file']))
+    except OSError:
+        pass
+    return True
 
 
 def format_currency(amount):
@@ -190,3 +394,20 @@ def get_position_name(position_code):
         'FWD': 'Forward'
     }
     return position_names.get(position_code, position_code)
+
+
+def percentile(sorted_values, fraction):
+    """
+    Get a percentile from sorted values
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): Percentile as a fraction (0.99 for p99)
+
+    Returns:
+        float: The percentile value (0 if there are no values)
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
@@ -0,0 +1,235 @@
+"""
+valuation.py
+Player valuation module for Football Manager Simulator
+Transfer fees from a player's full attributes, cached per player version
+"""
+
+from collections import OrderedDict
+
+
+# Fee per overall point before adjustments (the old flat rate)
+FEE_PER_OVERALL = 500000
+
+# Reputation of a club-less (free market) seller
+NEUTRAL_REPUTATION = 50
+
+# Fees are rounded to this many pounds
+FEE_ROUNDING = 10000
+
+# Most players whose prices are cached (least recently priced are dropped)
+CACHE_SIZE = 250000
+
+
+def age_factor(age):
+    """
+    Value multiplier for age: young players carry potential, value fades after 28
+
+    Args:
+        age (int): Player age
+
+    Returns:
+        float: Multiplier
+    """
+    if age <= 21:
+        return 1.2
+    if age <= 23:
+        return 1.1
+    if age <= 28:
+        return 1.0
+    return max(0.5, 1.0 - (age - 28) * 0.06)
+
+
+def form_factor(form):
+    """
+    Value multiplier for current form (70 is neutral)
+
+    Args:
+        form (int): Player form (50-95)
+
+    Returns:
+        float: Multiplier
+    """
+    return 1.0 + (form - 70) * 0.01
+
+
+def performance_factor(goals, assists, matches_played):
+    """
+    Value multiplier for goal contributions per match, capped at +30%
+
+    Args:
+        goals (int): Career goals
+        assists (int): Career assists
+        matches_played (int): Career matches
+
+    Returns:
+        float: Multiplier
+    """
+    if matches_played == 0:
+        return 1.0
+    return 1.0 + min(0.3, (goals + 0.5 * assists) / matches_played * 0.5)
+
+
+def contract_factor(overall, salary):
+    """
+    Value multiplier for the wage: players paid above their level cost less to prise away
+
+    Args:
+        overall (int): Overall rating
+        salary (int): Weekly salary
+
+    Returns:
+        float: Multiplier between 0.8 and 1.2
+    """
+    expected = overall * 10000 + 12500
+    return max(0.8, min(1.2, 1.0 - (salary / expected - 1.0) * 0.5))
+
+
+def reputation_factor(reputation):
+    """
+    Value multiplier for the selling club's reputation
+
+    Args:
+        reputation (int): Club reputation (1-100)
+
+    Returns:
+        float: Multiplier
+    """
+    return 1.0 + (reputation - NEUTRAL_REPUTATION) * 0.004
+
+
+# Lookup tables for the integer-valued factors
+_AGE_FACTORS = [age_factor(age) for age in range(61)]
+_FORM_FACTORS = [form_factor(form) for form in range(101)]
+_REPUTATION_FACTORS = [reputation_factor(rep) for rep in range(101)]
+
+
+def player_value(player, reputation=NEUTRAL_REPUTATION):
+    """
+    Price a player (uncached)
+
+    Args:
+        player (Player): Player to price
+        reputation (int): Selling club's reputation
+
+    Returns:
+        int: Transfer fee in pounds
+    """
+    age = player.age
+    form = player.form
+    value = (
+        player.overall * FEE_PER_OVERALL
+        * (_AGE_FACTORS[age] if 0 <= age < len(_AGE_FACTORS) else age_factor(age))
+        * (_FORM_FACTORS[form] if 0 <= form < len(_FORM_FACTORS) else form_factor(form))
+        * performance_factor(player.goals, player.assists, player.matches_played)
+        * contract_factor(player.overall, player.salary)
+        * (_REPUTATION_FACTORS[reputation] if 0 <= reputation < len(_REPUTATION_FACTORS)
+           else reputation_factor(reputation))
+    )
+    return max(FEE_ROUNDING, int(round(value / FEE_ROUNDING)) * FEE_ROUNDING)
+
+
+class PlayerValuation:
+    """
+    Cached player prices
+
+    Each price is stored with the inputs it was computed from (the player's
+    version). A player is only priced again once one of those inputs has
+    changed, so re-pricing a mostly unchanged market is a pass of cheap
+    comparisons. The cache holds at most max_entries players; the least
+    recently priced are dropped first, so players who have left the market
+    do not pile up.
+
+    Attributes:
+        max_entries (int): Most players cached
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_entries (int): Most players cached
+        """
+        self.max_entries = max_entries
+        # player_id -> (inputs, fee), least recently priced first
+        self._cache = OrderedDict()
+
+    def _trim(self):
+        """Drop the least recently priced players beyond max_entries"""
+        cache = self._cache
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    def value(self, player, reputation=NEUTRAL_REPUTATION):
+        """
+        Price one player
+
+        Args:
+            player (Player): Player to price
+            reputation (int): Selling club's reputation
+
+        Returns:
+            int: Transfer fee in pounds
+        """
+        version = (player.overall, player.age, player.form, player.goals, player.assists,
+                   player.matches_played, player.salary, reputation)
+        cached = self._cache.get(player.player_id)
+        if cached is not None and cached[0] == version:
+            self._cache.move_to_end(player.player_id)
+            return cached[1]
+        fee = player_value(player, reputation)
+        self._cache[player.player_id] = (version, fee)
+        self._cache.move_to_end(player.player_id)
+        self._trim()
+        return fee
+
+    def value_many(self, players, reputation=NEUTRAL_REPUTATION):
+        """
+        Price many players (e.g. a whole market)
+
+        Args:
+            players (list): Players to price
+            reputation (int): Selling club's reputation
+
+        Returns:
+            list: Fee for each player, in order
+        """
+        cache = self._cache
+        get = cache.get
+        to_end = cache.move_to_end
+        fees = []
+        append = fees.append
+        for player in players:
+            version = (player.overall, player.age, player.form, player.goals, player.assists,
+                       player.matches_played, player.salary, reputation)
+            cached = get(player.player_id)
+            if cached is not None and cached[0] == version:
+                to_end(player.player_id)
+                append(cached[1])
+                continue
+            fee = player_value(player, reputation)
+            cache[player.player_id] = (version, fee)
+            to_end(player.player_id)
+            append(fee)
+        self._trim()
+        return fees
+
+    def forget(self, player_id):
+        """
+        Drop a player's cached price (e.g. after retirement)
+
+        Args:
+            player_id (int): Player id
+        """
+        self._cache.pop(player_id, None)
+
+    def clear(self):
+        """Drop every cached price"""
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+# Shared cache used by utils.calculate_transfer_fee
+default_valuation = PlayerValuation()
@@ -0,0 +1,173 @@
+"""
+whatif.py
+What-if simulation module for Football Manager Simulator
+Side-effect-free match simulation on immutable team snapshots
+"""
+
+import random
+from collections import namedtuple
+
+from match import roll_goals, attack_strength, SCORER_WEIGHTS, ASSIST_WEIGHTS
+
+
+# Immutable view of a team: everything a match needs, nothing it can change
+TeamSnapshot = namedtuple('TeamSnapshot', [
+    'name',            # Team name
+    'strength',        # Team strength (as Team.get_team_strength)
+    'starter_count',   # Number of starters (players[:11])
+    'squad_size',      # Number of players in the squad
+    'scorer_weights',  # Scoring weight of each starter
+    'assist_weights',  # Assisting weight of each starter
+])
+
+# Result of one simulated match, to be applied to the home team later
+MatchDelta = namedtuple('MatchDelta', [
+    'home_score',
+    'away_score',
+    'result',     # "Victory", "Draw" or "Defeat" for the home team
+    'scorers',    # Starter index of each home goal scorer
+    'assisters',  # Starter index of each assister (None when unassisted)
+])
+
+
+def _pick_weights(starters, pos_weights):
+    """
+    Selection weights by position and form, as Match._choose_player
+
+    Args:
+        starters (list): Starting players
+        pos_weights (dict): Position -> base weight
+
+    Returns:
+        tuple: Weight of each starter
+    """
+    return tuple(
+        pos_weights.get(p.position, 1.0) * max(0.5, (p.form - 50) / 50)
+        for p in starters
+    )
+
+
+def snapshot_team(team, lineup=None, strength=None):
+    """
+    Take an immutable snapshot of a team for what-if simulation
+
+    Args:
+        team (Team): Team to snapshot
+        lineup (list): Starting players to use instead of team.players[:11]
+        strength (float): Override the team strength (e.g. after a signing)
+
+    Returns:
+        TeamSnapshot: Snapshot of the team
+    """
+    starters = list(lineup) if lineup is not None else team.players[:11]
+    return TeamSnapshot(
+        name=team.name,
+        strength=team.get_team_strength() if strength is None else strength,
+        starter_count=len(starters),
+        squad_size=len(team.players),
+        scorer_weights=_pick_weights(starters, SCORER_WEIGHTS),
+        assist_weights=_pick_weights(starters, ASSIST_WEIGHTS),
+    )
+
+
+def simulate(home, away, rng=None):
+    """
+    Simulate a match between two snapshots without changing anything
+
+    Uses the same goal model and scorer/assister choice as Match.simulate.
+
+    Args:
+        home (TeamSnapshot): Home team
+        away (TeamSnapshot): Away team
+        rng (random.Random): Random source (a private one per thread keeps
+            runs reproducible)
+
+    Returns:
+        MatchDelta: Score, result and home goal credits
+    """
+    if rng is None:
+        rng = random.Random()
+    home_score = roll_goals(attack_strength(home.strength, home=True), rng)
+    away_score = roll_goals(attack_strength(away.strength), rng)
+
+    scorers = []
+    assisters = []
+    indexes = range(home.starter_count)
+    for _ in range(home_score):
+        scorer = rng.choices(indexes, weights=home.scorer_weights)[0] if home.starter_count else None
+        assister = None
+        if rng.random() < 0.7 and home.squad_size >= 2 and home.starter_count:
+            assister = rng.choices(indexes, weights=home.assist_weights)[0]
+            if assister == scorer:
+                assister = None
+        scorers.append(scorer)
+        assisters.append(assister)
+
+    if home_score > away_score:
+        result = "Victory"
+    elif home_score < away_score:
+        result = "Defeat"
+    else:
+        result = "Draw"
+    return MatchDelta(home_score, away_score, result, tuple(scorers), tuple(assisters))
+
+
+def apply(team, delta, lineup=None):
+    """
+    Apply a simulated match to the real home team
+
+    Args:
+        team (Team): Home team the delta was simulated for
+        delta (MatchDelta): Simulated match
+        lineup (list): Starting players used for the snapshot
+            (defaults to team.players[:11])
+    """
+    starters = list(lineup) if lineup is not None else team.players[:11]
+    for player in starters:
+        player.play_match()
+    for scorer, assister in zip(delta.scorers, delta.assisters):
+        if scorer is not None:
+            starters[scorer].goals += 1
+        if assister is not None:
+            starters[assister].assists += 1
+    if delta.result == "Victory":
+        team.wins += 1
+    elif delta.result == "Defeat":
+        team.losses += 1
+    else:
+        team.draws += 1
+
+
+def evaluate(home, away, runs=1000, seed=None):
+    """
+    Estimate result odds for a what-if matchup
+
+    Args:
+        home (TeamSnapshot): Home team
+        away (TeamSnapshot): Away team
+        runs (int): Number of simulated matches
+        seed (int): Random seed for reproducible estimates
+
+    Returns:
+        dict: 'win', 'draw', 'loss' rates, 'expected_points' and average
+            'goals_for' / 'goals_against'
+    """
+    rng = random.Random(seed)
+    wins = draws = goals_for = goals_against = 0
+    for _ in range(runs):
+        home_score = roll_goals(attack_strength(home.strength, home=True), rng)
+        away_score = roll_goals(attack_strength(away.strength), rng)
+        goals_for += home_score
+        goals_against += away_score
+        if home_score > away_score:
+            wins += 1
+        elif home_score == away_score:
+            draws += 1
+    return {
+        'win': wins / runs,
+        'draw': draws / runs,
+        'loss': (runs - wins - draws) / runs,
+        'expected_points': (3 * wins + draws) / runs,
+        'goals_for': goals_for / runs,
+        'goals_against': goals_against / runs,
+    }